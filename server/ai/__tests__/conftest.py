@@ -0,0 +1,13 @@
+"""
+VibhoHCM AI tests - shared pytest setup
+The AI scripts import each other as top-level modules, so server/ai is put
+on sys.path the same way running a script from that directory does
+"""
+
+import os
+import sys
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if AI_DIR not in sys.path:
+    sys.path.insert(0, AI_DIR)
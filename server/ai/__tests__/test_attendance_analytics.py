@@ -0,0 +1,119 @@
+"""Tests for columnar attendance analytics and the vectorized timestamp parser"""
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+import benchmark
+from attendance_analytics import _parse_timestamps_slow, analyze_attendance, detect_patterns, parse_timestamps
+
+VALID = [
+    "2024-01-01",
+    "2024-02-29",
+    "2024-01-01T09:00:00",
+    "2024-01-01T09:00:00Z",
+    "2024-01-01T09:00:00+05:30",
+    "2024-01-01T23:59:59-08:00",
+    "2024-01-01T09:00:00.5",
+    "2024-01-01T09:00:00.123456Z",
+    "2024-01-01T09:00:00.250+05:30",
+    # Outside the bulk grammar, parsed by the fallback
+    "2024-01-01T09:00:00+0530",
+    "2024-01-01T09:00:00+05",
+    "2024-01-01 09:00:00",
+    "2024-01-01T09:00"
+]
+
+INVALID = [
+    "2024-02-30",
+    "2023-02-29",
+    "2024-04-31",
+    "0000-01-01",
+    "2024-13-01",
+    "2024-01-01T24:00:00",
+    "2024-01-01T09:60:00",
+    "2024-01-01T09:00:60",
+    "2024-01-01T09:00:00.",
+    "2024-01-01T09:00:00.12a",
+    "2024-01-01T09:00:00+5:30",
+    "2024-01-01T09:00:00+05:3x",
+    "2024-01-01T09:00:00 junk"
+]
+
+
+def assert_same_parse(values):
+    local, offset = parse_timestamps(values)
+    expected_local, expected_offset = _parse_timestamps_slow(values)
+    assert local.tolist() == expected_local.tolist()
+    assert offset.tolist() == expected_offset.tolist()
+
+
+@pytest.mark.parametrize("value", VALID)
+def test_fast_parse_matches_fromisoformat(value):
+    assert_same_parse([value, None, "2024-06-15T08:30:00Z", ""])
+
+
+@pytest.mark.parametrize("value", INVALID)
+def test_invalid_timestamps_are_rejected_like_fromisoformat(value):
+    with pytest.raises(ValueError):
+        _parse_timestamps_slow([value])
+    with pytest.raises(ValueError):
+        parse_timestamps(["2024-06-15T08:30:00Z", value])
+
+
+def test_random_timestamps_match_fromisoformat():
+    rng = random.Random(0)
+    values = []
+    for _ in range(5000):
+        value = f"{rng.randint(1, 9999):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        if rng.random() < 0.8:
+            value += f"T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+            if rng.random() < 0.3:
+                value += "." + "".join(rng.choice("0123456789") for _ in range(rng.randint(1, 6)))
+            value += rng.choice(["", "Z", f"{rng.choice('+-')}{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"])
+        values.append(value if rng.random() < 0.95 else None)
+    assert_same_parse(values)
+
+
+def test_missing_and_non_ascii_values():
+    local, offset = parse_timestamps([None, ""])
+    assert np.isnat(local).all() and offset.tolist() == [0, 0]
+    assert parse_timestamps([])[0].size == 0
+    # Non-ASCII digits are left to fromisoformat, which rejects them
+    with pytest.raises(ValueError):
+        parse_timestamps(["2024-01-01", "\uff12\uff10\uff12\uff14-01-01"])
+
+
+@pytest.mark.parametrize("check_out", ["2024-01-01T18:00:00 ", "2024-01-01T18:00:00z", "18:00", "not a time"])
+def test_check_outs_without_a_check_in_are_not_parsed(check_out):
+    records = [
+        {"date": "2024-01-01", "status": "absent", "checkOut": check_out},
+        {"date": "2024-01-02", "status": "present", "checkIn": "2024-01-02T09:00:00Z", "checkOut": "2024-01-02T13:00:00Z"}
+    ]
+    assert detect_patterns(records)["earlyDepartures"] == 1
+    json.dumps(analyze_attendance(records), allow_nan=False)
+    # Next to a check-in the same value is still an error, as before
+    records[0]["checkIn"] = "2024-01-01T09:00:00Z"
+    with pytest.raises(ValueError):
+        detect_patterns(records)
+
+
+def test_null_overtime_counts_as_none():
+    records = [
+        {"date": "2024-01-01", "status": "present", "overtime": 2.5},
+        {"date": "2024-01-02", "status": "present", "overtime": None},
+        {"date": "2024-01-03", "status": "late"}
+    ]
+    assert detect_patterns(records)["overtimeHours"] == 2.5
+    # NaN would make the reply invalid JSON
+    json.dumps(analyze_attendance(records), allow_nan=False)
+
+
+def test_patterns_on_synthetic_records():
+    records = benchmark.synthetic_attendance(random.Random(0), 400)
+    patterns = detect_patterns(records)
+    assert patterns["lateArrivals"] == sum(record["status"] == "late" for record in records)
+    assert patterns["absenteeism"] == sum(record["status"] == "absent" for record in records)
+    assert patterns["overtimeHours"] == pytest.approx(sum(record.get("overtime") or 0 for record in records))
@@ -0,0 +1,103 @@
+"""Tests for org-wide attendance analytics across many employees"""
+
+import json
+import multiprocessing
+import random
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import attendance_analytics
+import benchmark
+from attendance_analytics import analyze_attendance, analyze_organization, employee_groups
+
+
+@pytest.fixture
+def no_randomness(monkeypatch):
+    """Pick the first fallback anomaly and no forecast jitter"""
+    monkeypatch.setattr(attendance_analytics, "random", SimpleNamespace(choice=lambda options: options[0], uniform=lambda a, b: 0.0))
+
+
+def organization_records(seed, employees):
+    """Interleaved records of several employees, each employee's in date order"""
+    rng = random.Random(seed)
+    per_employee = {}
+    for number in range(employees):
+        employee_id = f"E{number}"
+        per_employee[employee_id] = [dict(record, employeeId=employee_id) for record in benchmark.synthetic_attendance(rng, rng.randint(1, 60))]
+    queues = [list(records) for records in per_employee.values()]
+    records = []
+    while queues:
+        queue = rng.choice(queues)
+        records.append(queue.pop(0))
+        if not queue:
+            queues.remove(queue)
+    return records, per_employee
+
+
+def test_employee_groups_sort_ids_stably():
+    records = [{"employeeId": "9"}, {"employeeId": "10"}, {}, {"employeeId": "9"}, {"employeeId": None}, {"employeeId": "10"}]
+    order, starts = employee_groups(records)
+    assert order.tolist() == [2, 4, 1, 5, 0, 3]
+    assert starts.tolist() == [0, 2, 4]
+    order, starts = employee_groups([])
+    assert (order.size, starts.size) == (0, 0)
+
+
+def test_each_employee_matches_a_single_employee_analysis(no_randomness):
+    records, per_employee = organization_records(0, 25)
+    result = analyze_organization(records, workers=1)
+    assert result["summary"] == {"employees": 25, "records": len(records)}
+    assert [employee["employeeId"] for employee in result["employees"]] == sorted(per_employee)
+    for employee in result["employees"]:
+        expected = analyze_attendance(per_employee[employee["employeeId"]])
+        assert employee["patterns"] == pytest.approx(expected["patterns"])
+        assert employee["anomalies"] == expected["anomalies"]
+        assert employee["predictions"] == expected["predictions"]
+
+
+def test_late_runs_do_not_span_employees(no_randomness):
+    records = [
+        {"employeeId": "A", "date": "2024-01-01", "status": "present"},
+        {"employeeId": "A", "date": "2024-01-02", "status": "late"},
+        {"employeeId": "B", "date": "2024-01-01", "status": "late"},
+        {"employeeId": "B", "date": "2024-01-02", "status": "present"}
+    ]
+    employees = analyze_organization(records, workers=1)["employees"]
+    assert not any("consecutive" in anomaly for employee in employees for anomaly in employee["anomalies"])
+
+
+def test_sharded_analysis_matches_in_process(no_randomness, monkeypatch):
+    records, _ = organization_records(1, 40)
+    monkeypatch.setattr(attendance_analytics, "ORG_SHARD_EMPLOYEES", 10)
+    sharded = analyze_organization(records, workers=2)
+    assert "shards" in sharded["timings"]["stages"]
+    assert sharded["employees"] == analyze_organization(records, workers=1)["employees"]
+
+
+def test_pool_workers_analyze_in_process(no_randomness, monkeypatch):
+    records, _ = organization_records(1, 40)
+    monkeypatch.setattr(attendance_analytics, "ORG_SHARD_EMPLOYEES", 10)
+    # Daemonic pool workers are not allowed to start processes of their own
+    with multiprocessing.get_context("fork").Pool(1) as pool:
+        result = pool.apply(analyze_organization, (records, 2))
+    assert "shards" not in result["timings"]["stages"]
+    assert result["employees"] == analyze_organization(records, workers=1)["employees"]
+
+
+def test_organization_requests_and_command(tmp_path):
+    records, _ = organization_records(2, 5)
+    result = attendance_analytics.handle_request({"records": records, "byEmployee": True, "workers": 1})
+    assert result["summary"]["employees"] == 5
+
+    path = tmp_path / "records.json"
+    path.write_text(json.dumps(records))
+    completed = subprocess.run(
+        [sys.executable, attendance_analytics.__file__, f"@{path}", "--by-employee", "--workers", "1"],
+        capture_output=True, text=True, check=True
+    )
+    output = json.loads(completed.stdout)
+    assert [employee["employeeId"] for employee in output["employees"]] == [f"E{number}" for number in range(5)]
+    assert [employee["patterns"] for employee in output["employees"]] == [employee["patterns"] for employee in result["employees"]]
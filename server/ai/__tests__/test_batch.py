@@ -0,0 +1,73 @@
+"""Tests for the JSONL batch runner shared by the AI scripts"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from batch import batch_source, run_batch
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = [
+    "attendance_analytics.py",
+    "chatbot.py",
+    "document_processor.py",
+    "insights_generator.py",
+    "payroll_prediction.py",
+    "resume_parser.py"
+]
+
+
+def double(request):
+    if request.get("fail"):
+        raise RuntimeError("handler failed")
+    return request["value"] * 2
+
+
+def test_results_carry_ids_and_failures_do_not_stop_the_batch(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"id": "a", "value": 1}),
+        "",
+        json.dumps({"value": 2}),
+        "[1, 2]",
+        "{not json",
+        json.dumps({"id": "b", "fail": True}),
+        json.dumps({"id": "c", "value": 3})
+    ]) + "\n")
+    output = io.StringIO()
+    assert run_batch(double, str(path), output) == {"processed": 6, "failed": 3}
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [(line["id"], line["success"]) for line in lines] == [
+        ("a", True), (3, True), (4, False), (5, False), ("b", False), ("c", True)
+    ]
+    assert lines[0]["result"] == 2 and lines[1]["result"] == 4
+    assert lines[2]["message"] == "Request must be a JSON object"
+    assert lines[4]["message"] == "handler failed"
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (["script.py", "--batch"], "-"),
+    (["script.py", "--batch", "requests.jsonl"], "requests.jsonl"),
+    (["script.py", "{}"], False),
+    (["script.py"], False)
+])
+def test_batch_source(argv, expected):
+    assert batch_source(argv) == expected
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_every_script_runs_in_batch_mode(script):
+    completed = subprocess.run(
+        [sys.executable, os.path.join(AI_DIR, script), "--batch", "-"],
+        input='\n"not an object"\n', capture_output=True, text=True, timeout=60, cwd=AI_DIR
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert [json.loads(line) for line in completed.stdout.splitlines()] == [
+        {"id": 2, "success": False, "message": "Request must be a JSON object"}
+    ]
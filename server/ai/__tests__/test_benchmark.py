@@ -0,0 +1,44 @@
+"""Tests for the benchmark suite's case construction"""
+
+import json
+import random
+
+import benchmark
+
+
+def test_cases_build_no_data_until_loaded(monkeypatch):
+    built = []
+    original = benchmark.synthetic_document
+    monkeypatch.setattr(benchmark, "synthetic_document", lambda rng, size: built.append(size) or original(rng, size))
+
+    cases = benchmark.build_cases(42, "full")
+    assert built == []
+
+    name, label, func, load = next(case for case in cases if case[0] == "document_processor.classify_document")
+    args, units = load()
+    assert built == [1024]
+    assert units == len(args[0])
+
+
+def test_case_data_does_not_depend_on_other_cases():
+    def payroll(cases):
+        return next(case for case in cases if case[0].startswith("payroll"))[3]()
+
+    cases = benchmark.build_cases(7, "quick")
+    for case in cases:
+        case[3]()
+    assert payroll(cases) == payroll(benchmark.build_cases(7, "quick"))
+    assert payroll(cases) != payroll(benchmark.build_cases(8, "quick"))
+
+
+def test_shared_inputs_are_built_once():
+    cases = [case for case in benchmark.build_cases(42, "quick") if case[1] == "30rec"]
+    patterns, anomalies, insights = (case[3]()[0][0] for case in cases)
+    assert patterns is anomalies is insights["attendanceRecords"]
+
+
+def test_performance_data_is_reproducible():
+    first = benchmark.synthetic_performance_data(random.Random(1))
+    second = benchmark.synthetic_performance_data(random.Random(1))
+    assert json.dumps(first) == json.dumps(second)
+    assert all(goal["targetDate"].startswith("2024-") for goal in first["goals"])
@@ -0,0 +1,79 @@
+"""Tests for parallel bulk ingestion with checkpointed resume"""
+
+import io
+import json
+import os
+
+import pytest
+
+from bulk_ingest import ingest_arguments, iter_paths, load_checkpoint, run_ingest
+
+
+def word_count(path):
+    with open(path, "r", encoding="utf-8") as file:
+        text = file.read()
+    if "corrupt" in text:
+        raise ValueError("cannot parse")
+    return len(text.split())
+
+
+def make_tree(root, files):
+    for relative, text in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+def test_directories_are_walked_in_a_stable_order(tmp_path):
+    make_tree(tmp_path, {"b/two.txt": "", "a/one.TXT": "", "a/skip.png": "", "zero.txt": ""})
+    paths = list(iter_paths(str(tmp_path), [".txt"]))
+    assert [os.path.relpath(path, tmp_path) for path in paths] == ["zero.txt", "a/one.TXT", "b/two.txt"]
+
+
+def test_manifests_resolve_relative_paths(tmp_path):
+    manifest = tmp_path / "lists" / "manifest.txt"
+    manifest.parent.mkdir()
+    manifest.write_text("# resumes\n\none.pdf\n" + json.dumps({"path": "../two.pdf"}) + "\n/abs/three.pdf\n")
+    assert list(iter_paths(str(manifest))) == [
+        str(tmp_path / "lists" / "one.pdf"), str(tmp_path / "two.pdf"), "/abs/three.pdf"
+    ]
+
+
+@pytest.mark.parametrize("workers, in_flight", [(1, 1), (2, None)])
+def test_every_file_is_reported_once(tmp_path, workers, in_flight):
+    files = {f"resume{number:02d}.txt": "word " * number for number in range(12)}
+    files["resume05.txt"] = "corrupt"
+    make_tree(tmp_path / "inbox", files)
+    output = io.StringIO()
+    summary = run_ingest(word_count, str(tmp_path / "inbox"), output=output, workers=workers, max_in_flight=in_flight)
+    assert summary == {"processed": 12, "failed": 1, "skipped": 0}
+
+    results = {os.path.basename(line["id"]): line for line in map(json.loads, output.getvalue().splitlines())}
+    assert len(results) == 12
+    assert results["resume07.txt"] == {"id": str(tmp_path / "inbox" / "resume07.txt"), "success": True, "result": 7}
+    assert results["resume05.txt"]["success"] is False and results["resume05.txt"]["message"] == "cannot parse"
+
+
+def test_a_resumed_run_skips_done_files_and_retries_failures(tmp_path):
+    inbox = make_tree(tmp_path / "inbox", {"a.txt": "one two", "b.txt": "corrupt", "c.txt": "three"})
+    checkpoint = str(tmp_path / "progress.checkpoint")
+    first = run_ingest(word_count, str(inbox), output=io.StringIO(), checkpoint=checkpoint, workers=1)
+    assert first == {"processed": 3, "failed": 1, "skipped": 0}
+    assert load_checkpoint(checkpoint) == {str(inbox / "a.txt"), str(inbox / "c.txt")}
+
+    (inbox / "b.txt").write_text("fixed now")
+    # A torn line left by an interrupted run is ignored
+    with open(checkpoint, "a") as file:
+        file.write('{"path": "torn')
+    output = io.StringIO()
+    second = run_ingest(word_count, str(inbox), output=output, checkpoint=checkpoint, workers=1)
+    assert second == {"processed": 1, "failed": 0, "skipped": 2}
+    assert json.loads(output.getvalue())["result"] == 2
+
+
+def test_ingest_arguments():
+    assert ingest_arguments(["resume_parser.py", "{}"]) is None
+    args = ingest_arguments(["resume_parser.py", "--ingest", "inbox", "--output", "out.jsonl", "--workers", "3"])
+    assert (args.source, args.output, args.checkpoint, args.workers) == ("inbox", "out.jsonl", "out.jsonl.checkpoint", 3)
+    assert ingest_arguments(["resume_parser.py", "--ingest", "inbox"]).checkpoint is None
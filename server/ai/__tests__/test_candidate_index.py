@@ -0,0 +1,157 @@
+"""Tests for the segmented BM25 candidate index"""
+
+import random
+import zipfile
+
+import pytest
+
+import candidate_index
+from candidate_index import CandidateIndex, bm25_idf, document_terms, skill_term, text_terms
+
+WORDS = ["python", "java", "payments", "platform", "react", "design", "sql", "cloud", "lead", "mentor",
+         "banking", "retail", "kubernetes", "analytics", "mobile", "security"]
+SKILLS = ["Python", "Java", "SQL", "React", "AWS", "Docker"]
+
+
+def synthetic_records(seed, count, prefix="C"):
+    rng = random.Random(seed)
+    return [
+        {
+            "candidateId": f"{prefix}{index}",
+            "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 60))),
+            "skills": rng.sample(SKILLS, rng.randint(0, 3)),
+            "education": ["Bachelor of Science"] if rng.random() < 0.5 else []
+        }
+        for index in range(count)
+    ]
+
+
+def brute_force(records, query_text, skills):
+    """BM25 computed directly over the records"""
+    query = {}
+    for term in text_terms(query_text):
+        query[term] = query.get(term, 0.0) + 1.0
+    for skill in skills:
+        query[skill_term(skill)] = query.get(skill_term(skill), 0.0) + candidate_index.SKILL_WEIGHT
+
+    documents = [document_terms(record) for record in records]
+    lengths = [sum(terms.values()) for terms in documents]
+    avg_length = max(1.0, sum(lengths) / len(documents))
+    scores = {}
+    for record, terms, length in zip(records, documents, lengths):
+        score = 0.0
+        for term, weight in query.items():
+            doc_freq = sum(term in other for other in documents)
+            tf = terms.get(term, 0)
+            if tf:
+                norm = candidate_index.K1 * (1 - candidate_index.B + candidate_index.B * length / avg_length)
+                score += bm25_idf(len(documents), doc_freq) * weight * tf * (candidate_index.K1 + 1) / (tf + norm)
+        if score > 0:
+            scores[record["candidateId"]] = score
+    return scores
+
+
+@pytest.mark.parametrize("query_text, skills", [
+    ("python payments platform", []),
+    ("", ["SQL", "Docker"]),
+    ("cloud security lead", ["Python"])
+])
+def test_scores_match_bm25_across_segments(tmp_path, query_text, skills):
+    records = synthetic_records(0, 120)
+    index = CandidateIndex(str(tmp_path / "index"))
+    for start in range(0, len(records), 50):
+        for record in records[start:start + 50]:
+            index.add(record)
+        index.flush()
+    assert index.stats()["segments"] == 3
+
+    expected = brute_force(records, query_text, skills)
+    results = index.search(query_text, skills, top=len(records))
+    assert {result["candidateId"]: result["score"] for result in results} == pytest.approx(expected, rel=1e-4, abs=1e-4)
+    assert [result["score"] for result in results] == sorted((result["score"] for result in results), reverse=True)
+    # The top-k cut keeps the best scores
+    assert [result["score"] for result in index.search(query_text, skills, top=5)] == [result["score"] for result in results[:5]]
+
+
+def test_readded_candidates_replace_their_old_document(tmp_path):
+    index = CandidateIndex(str(tmp_path / "index"))
+    index.add({"candidateId": "A", "text": "java banking"})
+    index.add({"candidateId": "B", "text": "java retail"})
+    index.flush()
+    index.add({"candidateId": "A", "text": "python analytics"})
+    index.flush()
+
+    assert [result["candidateId"] for result in index.search("banking")] == []
+    assert [result["candidateId"] for result in index.search("python")] == ["A"]
+    assert index.stats()["candidates"] == 2
+
+
+def test_candidates_updated_many_times_are_still_found(tmp_path):
+    index = CandidateIndex(str(tmp_path / "index"))
+    others = synthetic_records(4, 10)
+    for record in others:
+        index.add(record)
+    for version in range(5):
+        index.add({"candidateId": "A", "text": f"python developer release {version}"})
+        index.flush()
+
+    live = others + [{"candidateId": "A", "text": "python developer release 4"}]
+    results = index.search("python developer", top=20)
+    assert "A" in [result["candidateId"] for result in results]
+    expected = brute_force(live, "python developer", [])
+    assert {result["candidateId"]: result["score"] for result in results} == pytest.approx(expected, rel=1e-4, abs=1e-4)
+
+
+def test_optimize_merges_segments_and_drops_replaced_documents(tmp_path):
+    records = synthetic_records(1, 80)
+    index = CandidateIndex(str(tmp_path / "index"))
+    for record in records:
+        index.add(record)
+    index.flush()
+    replacements = synthetic_records(2, 20)
+    for record in replacements:
+        index.add(record)
+    index.flush()
+    index.optimize()
+
+    live = replacements + records[20:]
+    stats = index.stats()
+    assert (stats["candidates"], stats["documents"], stats["segments"]) == (80, 80, 1)
+    expected = brute_force(live, "react mobile design", ["React"])
+    results = index.search("react mobile design", ["React"], top=100)
+    assert {result["candidateId"]: result["score"] for result in results} == pytest.approx(expected, rel=1e-4, abs=1e-4)
+
+
+def test_index_reopens_from_disk(tmp_path):
+    directory = str(tmp_path / "index")
+    index = CandidateIndex(directory)
+    for record in synthetic_records(3, 30):
+        index.add(record)
+    index.flush()
+    reopened = candidate_index.open_index(directory)
+    assert reopened.search("python sql", ["Java"]) == index.search("python sql", ["Java"])
+
+
+def test_duplicates_and_records_without_ids(tmp_path):
+    index = CandidateIndex(str(tmp_path / "index"))
+    assert index.add({"candidateId": "A", "text": "python", "duplicateOf": "B"}) is False
+    with pytest.raises(ValueError):
+        index.add({"text": "python"})
+    index.flush()
+    assert index.search("python") == []
+
+
+def test_resume_files_are_extracted_before_indexing(tmp_path):
+    path = tmp_path / "resume.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+            '<w:p><w:r><w:t>Kubernetes platform engineer</w:t></w:r></w:p></w:body></w:document>'
+        ))
+    record = candidate_index.record_from_payload({"candidateId": "D", "path": str(path), "skills": ["Go"]})
+    assert record["text"] == "Kubernetes platform engineer\n"
+
+    index = CandidateIndex(str(tmp_path / "index"))
+    index.add(record)
+    index.flush()
+    assert [result["candidateId"] for result in index.search("kubernetes")] == ["D"]
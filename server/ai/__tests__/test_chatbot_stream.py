@@ -0,0 +1,100 @@
+"""Tests for the chatbot's incrementally built replies"""
+
+import pytest
+
+import chatbot
+import session_store
+from chatbot import answer_chunks, iter_response, process_message
+
+CONTEXT = {"name": "Asha", "employeeId": "E1"}
+
+
+@pytest.fixture(autouse=True)
+def private_sessions(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHATBOT_SESSION_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setattr(session_store, "_store", None)
+
+
+@pytest.mark.parametrize("answer", [
+    "",
+    "Hello.",
+    "You have 12 days left. Anything else? Just ask!",
+    "Version 1.5 is out.\nSee notes.  Thanks",
+    "No trailing break"
+])
+def test_answer_chunks_join_back_to_the_answer(answer):
+    chunks = answer_chunks(answer)
+    assert "".join(chunks) == answer
+    assert all(chunks)
+
+
+def test_answers_are_split_into_sentences():
+    assert answer_chunks("One. Two? Three! Four") == ["One. ", "Two? ", "Three! ", "Four"]
+
+
+@pytest.mark.parametrize("message", [
+    "How many leave days do I have?",
+    "download my payslip",
+    "hello there",
+    "What is the remote work policy?"
+])
+def test_events_are_an_envelope_chunks_then_done(message):
+    events = list(iter_response(message, CONTEXT))
+    assert [event["type"] for event in events[:1] + events[-1:]] == ["envelope", "done"]
+    assert all(event["type"] == "chunk" for event in events[1:-1])
+
+    envelope = {key: value for key, value in events[0].items() if key != "type"}
+    result = events[-1]["result"]
+    assert {key: result[key] for key in envelope} == envelope
+    assert "".join(event["text"] for event in events[1:-1]) == result["answer"]
+
+
+def test_envelope_is_sent_before_the_answer_is_generated(monkeypatch):
+    generated = []
+    monkeypatch.setattr(chatbot, "generate_response", lambda *args: generated.append(args) or "First. Second.")
+    events = iter_response("download my payslip", CONTEXT)
+    envelope = next(events)
+    assert envelope["type"] == "envelope" and envelope["nlpIntent"] == "payroll.download"
+    assert generated == []
+    assert [event.get("text") for event in events][:2] == ["First. ", "Second."]
+    assert len(generated) == 1
+
+
+def test_process_message_returns_the_done_result():
+    streamed = list(iter_response("How many leave days do I have?", CONTEXT))[-1]["result"]
+    collected = process_message("How many leave days do I have?", CONTEXT)
+    drop_timings = lambda result: {key: value for key, value in result.items() if key != "timings"}
+    assert drop_timings(collected) == drop_timings(streamed)
+
+
+def test_session_turns_are_numbered_in_the_envelope():
+    first = list(iter_response("How many leave days do I have?", CONTEXT, "S1"))[0]
+    second = list(iter_response("and after that?", {}, "S1"))[0]
+    assert (first["sessionId"], first["turn"]) == ("S1", 1)
+    assert (second["sessionId"], second["turn"], second["intent"]) == ("S1", 2, "leave_inquiry")
+
+
+def test_process_message_closes_the_events_when_it_returns(monkeypatch):
+    closed = []
+
+    def events(*args, **kwargs):
+        try:
+            yield {"type": "done", "result": {"answer": "Hi."}}
+            yield {"type": "chunk", "text": "never sent"}
+        finally:
+            closed.append(True)
+
+    # Keeping the generator referenced stops refcounting from closing it for us
+    created = []
+    monkeypatch.setattr(chatbot, "iter_response", lambda *args, **kwargs: created.append(events()) or created[-1])
+    assert process_message("hello", CONTEXT) == {"answer": "Hi."}
+    assert closed == [True]
+
+
+def test_only_streamed_replies_prefetch_facts(monkeypatch):
+    prefetched = []
+    monkeypatch.setattr(chatbot, "prefetch_facts", lambda intent, context: prefetched.append(intent))
+    process_message("How many leave days do I have?", CONTEXT, "S1")
+    assert prefetched == []
+    list(iter_response("How many leave days do I have?", CONTEXT, "S1"))
+    assert prefetched == ["leave_inquiry"]
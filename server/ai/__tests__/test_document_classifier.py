@@ -0,0 +1,135 @@
+"""Tests for the hashed-feature Naive Bayes document classifier"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import document_classifier
+import document_processor
+from document_classifier import hash_batch, load_model, train
+from text_features import count_terms
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VOCABULARY = {
+    "Resume": ["experience", "skills", "education", "python", "engineer", "university", "projects"],
+    "Invoice": ["invoice", "amount", "payment", "due", "total", "tax", "billing"],
+    "Contract": ["agreement", "parties", "clause", "terms", "obligations", "termination", "hereby"]
+}
+FILLER = ["the", "and", "of", "for", "with", "a", "to", "in"]
+
+
+def labelled_texts(seed, per_class):
+    rng = random.Random(seed)
+    return [
+        (" ".join(rng.choice(words + FILLER) for _ in range(rng.randint(20, 80))), category)
+        for _ in range(per_class)
+        for category, words in VOCABULARY.items()
+    ]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return train(((count_terms(text), category) for text, category in labelled_texts(0, 30)), features=4096)
+
+
+def test_held_out_documents_are_classified(model):
+    held_out = labelled_texts(1, 20)
+    predictions = model.classify_batch([count_terms(text) for text, _ in held_out])
+    assert [prediction["category"] for prediction in predictions] == [category for _, category in held_out]
+    assert all(0 < prediction["confidence"] <= 1 for prediction in predictions)
+
+
+def test_batched_scores_match_a_dense_computation(model):
+    terms = [count_terms(text) for text, _ in labelled_texts(2, 5)] + [count_terms("")]
+    rows, columns, values = hash_batch(terms, model.features)
+    dense = np.zeros((len(terms), model.features), dtype=np.float64)
+    np.add.at(dense, (rows, columns), values)
+    expected = dense @ model.log_prob.T.astype(np.float64) + model.log_prior
+    assert np.allclose(model.scores(terms), expected, rtol=1e-4, atol=1e-3)
+
+
+def test_results_do_not_depend_on_batch_size(model, monkeypatch):
+    terms = [count_terms(text) for text, _ in labelled_texts(3, 10)]
+    whole = model.classify_batch(terms)
+    monkeypatch.setattr(document_classifier, "BATCH_SIZE", 7)
+    assert model.classify_batch(terms) == whole
+    assert [model.classify_batch([one])[0] for one in terms] == whole
+
+
+def test_training_needs_two_categories():
+    with pytest.raises(ValueError):
+        train([(count_terms("invoice total"), "Invoice")])
+
+
+def test_saved_model_round_trips(model, tmp_path):
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = load_model(path)
+    assert (loaded.classes, loaded.version, loaded.features) == (model.classes, model.version, model.features)
+    terms = [count_terms(text) for text, _ in labelled_texts(4, 5)]
+    assert [p["category"] for p in loaded.classify_batch(terms)] == [p["category"] for p in model.classify_batch(terms)]
+    assert load_model(path) is loaded
+
+
+def test_changed_model_files_are_reloaded(model, tmp_path):
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    first = load_model(path)
+    other = train([(count_terms("invoice total"), "Invoice"), (count_terms("clause terms"), "Contract")], features=64)
+    other.save(path)
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+    assert load_model(path) is not first
+    assert load_model(path).classes == ["Invoice", "Contract"]
+
+
+def test_unknown_model_format_is_rejected(model, tmp_path, monkeypatch):
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    monkeypatch.setattr(document_classifier, "MODEL_FORMAT", document_classifier.MODEL_FORMAT + 1)
+    with pytest.raises(ValueError):
+        load_model(path)
+
+
+def test_worker_requests_classify_texts_and_paths(model, tmp_path, monkeypatch):
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    monkeypatch.setenv("DOCUMENT_CLASSIFIER_MODEL", path)
+    (tmp_path / "invoice.txt").write_text("invoice amount due total tax payment")
+    results = document_classifier.handle_request({
+        "texts": ["agreement between the parties with termination clause"],
+        "paths": [str(tmp_path / "invoice.txt")]
+    })
+    assert [result["category"] for result in results] == ["Contract", "Invoice"]
+    with pytest.raises(ValueError):
+        document_classifier.handle_request({})
+
+
+def test_document_processor_uses_the_trained_model(model, tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCUMENT_CLASSIFIER_MODEL", str(tmp_path / "missing.npz"))
+    assert document_processor.trained_classifier() is None
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    monkeypatch.setenv("DOCUMENT_CLASSIFIER_MODEL", path)
+    result = document_processor.classify_document("billing invoice with tax and total amount")
+    assert result["category"] == "Invoice"
+
+
+def test_train_and_evaluate_commands(tmp_path):
+    data = tmp_path / "train.jsonl"
+    data.write_text("".join(json.dumps({"text": text, "category": category}) + "\n" for text, category in labelled_texts(5, 10)))
+    model_path = str(tmp_path / "cli.npz")
+
+    def run(*args):
+        completed = subprocess.run([sys.executable, os.path.join(AI_DIR, "document_classifier.py"), *args],
+                                   capture_output=True, text=True, check=True)
+        return json.loads(completed.stdout)
+
+    trained = run("train", str(data), "--model", model_path, "--features", "1024")
+    assert trained["success"] is True and sorted(trained["classes"]) == sorted(VOCABULARY)
+    assert run("evaluate", str(data), "--model", model_path) == {"documents": 30, "accuracy": 1.0}
@@ -0,0 +1,154 @@
+"""Tests for deduplicated, capped and paginated entity records"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+import benchmark
+import document_processor
+from document_processor import ENTITY_TYPES, extract_entities, iter_entity_records, parse_entity_cursor
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def keyword_classifier(monkeypatch):
+    monkeypatch.setattr(document_processor, "trained_classifier", lambda: None)
+
+
+def document(seed=0, size=40000):
+    return benchmark.synthetic_document(random.Random(seed), size)
+
+
+def chunked(text, size=1500):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def first_occurrences(text, cap=None):
+    """Each distinct entity at its first occurrence, at most cap per type"""
+    seen = set()
+    emitted = {}
+    records = []
+    for entity in extract_entities(text, ENTITY_TYPES):
+        key = (entity["type"], entity["entity"])
+        if key in seen or (cap is not None and emitted.get(entity["type"], 0) >= cap):
+            continue
+        seen.add(key)
+        emitted[entity["type"]] = emitted.get(entity["type"], 0) + 1
+        records.append(entity)
+    return records
+
+
+def pages(text, limit, cap=10000):
+    cursor = None
+    while True:
+        records = list(iter_entity_records(chunked(text), cap=cap, limit=limit, cursor=cursor))
+        summary = records.pop()
+        yield records, summary
+        cursor = summary["nextCursor"]
+        if cursor is None:
+            return
+
+
+def test_entities_are_emitted_once_at_their_first_occurrence():
+    text = document()
+    records = list(iter_entity_records(chunked(text), cap=10000))
+    summary = records.pop()
+    assert records == first_occurrences(text)
+    assert summary["nextCursor"] is None
+    assert summary["textLength"] == len(text)
+    assert summary["category"] == document_processor.classify_document(text)["category"]
+
+    everything = extract_entities(text, ENTITY_TYPES)
+    for entity_type in ENTITY_TYPES:
+        assert summary["counts"][entity_type]["occurrences"] == sum(entity["type"] == entity_type for entity in everything)
+        assert summary["counts"][entity_type]["truncated"] is False
+    repeats = {(repeat["type"], repeat["entity"]): repeat["count"] for repeat in summary["repeats"]}
+    for (entity_type, entity), count in repeats.items():
+        assert count == sum(1 for other in everything if (other["type"], other["entity"]) == (entity_type, entity)) > 1
+
+
+def test_cap_bounds_each_type():
+    text = document(1)
+    records = list(iter_entity_records(chunked(text), cap=3))
+    summary = records.pop()
+    assert records == first_occurrences(text, cap=3)
+    for entity_type in ENTITY_TYPES:
+        counts = summary["counts"][entity_type]
+        assert counts["emitted"] == sum(record["type"] == entity_type for record in records) <= 3
+        assert counts["truncated"] == (len({(e["type"], e["entity"]) for e in extract_entities(text, [entity_type])}) > 3)
+
+
+@pytest.mark.parametrize("limit, cap", [(25, 10000), (1, 10000), (2, 3)])
+def test_pages_together_equal_the_unpaged_output(limit, cap):
+    text = document(2)
+    unpaged = list(iter_entity_records(chunked(text), cap=cap))
+    collected = []
+    page_count = 0
+    for records, summary in pages(text, limit=limit, cap=cap):
+        page_count += 1
+        assert len(records) <= limit
+        collected.extend(records)
+    assert page_count > 2
+    # Entities emitted by earlier pages are not repeated and the cap spans pages
+    assert collected == unpaged[:-1] == first_occurrences(text, cap=cap)
+    assert summary == unpaged[-1]
+
+
+def test_a_full_page_stops_reading_the_document():
+    text = document(3)
+    chunks = chunked(text)
+    consumed = []
+
+    def tracked():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    records = list(iter_entity_records(tracked(), limit=5))
+    summary = records.pop()
+    assert len(records) == 5 and summary["nextCursor"] is not None
+    assert "category" not in summary
+    assert len(consumed) < len(chunks)
+
+
+@pytest.mark.parametrize("cursor, offset", [(None, 0), ("", 0), ("0", 0), ("1234", 1234)])
+def test_parse_entity_cursor(cursor, offset):
+    assert parse_entity_cursor(cursor) == offset
+
+
+@pytest.mark.parametrize("cursor", ["-1", "abc", "1.5"])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        parse_entity_cursor(cursor)
+
+
+def test_worker_requests_return_one_page(tmp_path):
+    path = tmp_path / "contract.txt"
+    path.write_text(document(4, 20000))
+    page = document_processor.handle_request({"path": str(path), "entities": {"types": ["MONEY"], "limit": 4}})
+    assert len(page["entities"]) == 4 and {entity["type"] for entity in page["entities"]} == {"MONEY"}
+    assert set(page["counts"]) == {"MONEY"}
+    assert "summary" not in page and "timings" in page
+
+    following = document_processor.handle_request({
+        "path": str(path), "entities": {"types": ["MONEY"], "limit": 4, "cursor": page["nextCursor"]}
+    })
+    assert following["entities"][0]["start"] == int(page["nextCursor"])
+
+
+def test_entities_command_writes_jsonl(tmp_path):
+    path = tmp_path / "contract.txt"
+    text = document(5, 20000)
+    path.write_text(text)
+    completed = subprocess.run(
+        [sys.executable, os.path.join(AI_DIR, "document_processor.py"), str(path), "--entities", "--cap", "2"],
+        capture_output=True, text=True, check=True
+    )
+    lines = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert lines[-1]["summary"] is True
+    assert lines[:-1] == first_occurrences(text, cap=2)
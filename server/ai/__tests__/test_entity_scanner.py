@@ -0,0 +1,68 @@
+"""Tests for the single-pass entity scanner and its chunked stream"""
+
+import random
+
+import pytest
+
+import benchmark
+from entity_scanner import EntityScanner, extract_entities, get_scanner
+
+TITLE_WORDS = ["Alpha", "Beta", "Gamma", "Delta", "Kappa", "Sigma", "Omega", "Theta"]
+
+
+def chunked(text, size):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def title_case_text(seed=0, words=400):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(TITLE_WORDS) for _ in range(words))
+
+
+def mixed_text(seed=0, size=20000):
+    return benchmark.synthetic_document(random.Random(seed), size)
+
+
+def test_scan_finds_each_type():
+    text = "Mail jane.doe@example.com by 12/05/2024 about $1,250.50 for Acme Widgets Inc and John Smith."
+    assert [(entity["type"], entity["entity"]) for entity in extract_entities(text)] == [
+        ("EMAIL", "jane.doe@example.com"),
+        ("DATE", "12/05/2024"),
+        ("MONEY", "$1,250.50"),
+        ("ORGANIZATION", "Acme Widgets Inc"),
+        ("PERSON", "John Smith")
+    ]
+    # Without ORGANIZATION, the company name reads as a person's name
+    assert [entity["entity"] for entity in extract_entities(text, ["DATE", "PERSON"])] == [
+        "12/05/2024", "Acme Widgets", "John Smith"
+    ]
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(ValueError):
+        EntityScanner(["PERSON", "PLANET"])
+
+
+@pytest.mark.parametrize("size", [1, 7, 97, 255, 256, 257, 500, 1000, 1333])
+def test_chained_title_case_matches_stay_in_step(size):
+    # Every match consumes two words, so a scan that restarts in the
+    # wrong place pairs the words differently from a single pass
+    text = title_case_text()
+    single = get_scanner().scan(text)
+    assert len(single) == 200
+    assert list(get_scanner().scan_chunks(chunked(text, size), overlap=256)) == single
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("size", [64, 300, 4096])
+@pytest.mark.parametrize("types", [None, ("PERSON",), ("DATE", "MONEY", "ORGANIZATION")])
+def test_chunked_scan_equals_single_pass(seed, size, types):
+    text = mixed_text(seed)
+    scanner = get_scanner(types)
+    assert list(scanner.scan_chunks(chunked(text, size))) == scanner.scan(text)
+
+
+def test_stream_offsets_are_text_wide():
+    text = mixed_text(3, 5000)
+    for entity in get_scanner().scan_chunks(chunked(text, 333)):
+        assert text[entity["start"]:entity["end"]] == entity["entity"]
@@ -0,0 +1,72 @@
+"""Tests for the memoized, batched HR data layer"""
+
+import json
+import threading
+
+import pytest
+
+import hr_data
+from hr_data import HRData, HRDataProvider, LocalHRDataProvider
+
+
+class Recorder(HRDataProvider):
+    def __init__(self, gate=None):
+        self.requests = []
+        self.gate = gate
+
+    def fetch(self, employee_id, groups):
+        self.requests.append((employee_id, sorted(groups)))
+        if self.gate is not None:
+            self.gate.wait(5)
+        return {group: {"employee": employee_id, "group": group} for group in groups}
+
+
+def test_a_provider_without_fetch_cannot_be_instantiated():
+    class Incomplete(HRDataProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    with pytest.raises(TypeError):
+        HRDataProvider()
+
+
+def test_missing_groups_are_fetched_in_one_call_and_memoized():
+    provider = Recorder()
+    data = HRData(provider)
+    assert data.get("E1", ["leave"]) == {"leave": {"employee": "E1", "group": "leave"}}
+    assert set(data.get("E1", ["leave", "payroll", "attendance"])) == {"leave", "payroll", "attendance"}
+    data.get("E1", ["payroll", "attendance"])
+    assert provider.requests == [("E1", ["leave"]), ("E1", ["attendance", "payroll"])]
+
+
+def test_expired_and_invalidated_groups_are_fetched_again(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(hr_data.time, "monotonic", lambda: clock[0])
+    provider = Recorder()
+    data = HRData(provider, ttls={"leave": 10, "payroll": 1000})
+    data.get("E1", ["leave", "payroll"])
+    clock[0] += 11
+    data.get("E1", ["leave", "payroll"])
+    data.invalidate("E1", ["payroll"])
+    data.get("E1", ["leave", "payroll"])
+    assert provider.requests == [("E1", ["leave", "payroll"]), ("E1", ["leave"]), ("E1", ["payroll"])]
+
+
+def test_get_waits_for_a_prefetch_instead_of_fetching_again():
+    gate = threading.Event()
+    provider = Recorder(gate)
+    data = HRData(provider)
+    data.prefetch("E1", ["leave", "documents"])
+    threading.Timer(0.05, gate.set).start()
+    assert set(data.get("E1", ["leave", "documents"])) == {"leave", "documents"}
+    assert provider.requests == [("E1", ["documents", "leave"])]
+
+
+def test_local_provider_overrides_sample_figures(tmp_path):
+    path = tmp_path / "hr.json"
+    path.write_text(json.dumps({"E7": {"leave": {"annualRemaining": 3}}}))
+    provider = LocalHRDataProvider(str(path))
+    assert provider.fetch("E7", ["leave"])["leave"]["annualRemaining"] == 3
+    assert provider.fetch("E8", ["leave"])["leave"]["annualRemaining"] == 15
+    assert provider.fetch(None, ["payroll"]) == {"payroll": LocalHRDataProvider.SAMPLE["payroll"]}
@@ -0,0 +1,32 @@
+"""Cold-start budget: every AI entry script imports within its budget
+
+Wall-clock budgets depend on the machine, so they only run with
+AI_IMPORT_BUDGETS=1 (CI runs check_import_time.py instead);
+AI_IMPORT_BUDGET_SCALE multiplies them on slow machines. The lazy-import
+rule does not depend on timing and always runs.
+"""
+
+import os
+
+import pytest
+
+import check_import_time
+
+SCALE = float(os.environ.get("AI_IMPORT_BUDGET_SCALE", "1"))
+
+import_budgets = pytest.mark.skipif(
+    os.environ.get("AI_IMPORT_BUDGETS") != "1", reason="set AI_IMPORT_BUDGETS=1 to check import-time budgets"
+)
+
+
+@pytest.mark.parametrize("module", sorted(check_import_time.IMPORT_BUDGETS_MS))
+def test_entry_script_defers_heavy_imports(module):
+    result = check_import_time.check_module(module, runs=1)
+    assert not result["eagerHeavyImports"], f"{module} imports {result['eagerHeavyImports']} at load time"
+
+
+@import_budgets
+@pytest.mark.parametrize("module", sorted(check_import_time.IMPORT_BUDGETS_MS))
+def test_entry_script_imports_within_budget(module):
+    result = check_import_time.check_module(module, runs=5, scale=SCALE)
+    assert result["importMs"] <= result["budgetMs"], f"{module} took {result['importMs']} ms (budget {result['budgetMs']} ms)"
@@ -0,0 +1,129 @@
+"""Tests for the process-pool inference server's admission control"""
+
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import inference_server
+import worker
+
+
+class Sleeper:
+    """Stand-in model that holds a pool process for payload["seconds"]"""
+
+    @staticmethod
+    def handle_request(payload):
+        time.sleep(payload.get("seconds", 0))
+        return {"slept": payload.get("seconds", 0)}
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    # Patched before the pool forks, so the worker processes see it too
+    for model in inference_server.HEAVY_MODELS + ["attendance_analytics"]:
+        monkeypatch.setitem(worker.MODELS, model, Sleeper)
+    schedulers = []
+
+    def create(workers):
+        created = inference_server.ModelScheduler(workers, inference_server.default_limits(workers))
+        schedulers.append(created)
+        return created
+
+    yield create
+    for created in schedulers:
+        created.close()
+
+
+def test_heavy_models_leave_a_worker_free():
+    assert inference_server.heavy_limit(1) == 1
+    assert inference_server.heavy_limit(2) == 1
+    assert inference_server.heavy_limit(8) == 7
+
+
+def test_batch_and_org_wide_requests_are_heavy():
+    for model in ["job_matcher", "document_classifier", "candidate_index"]:
+        assert inference_server.is_heavy(model, {})
+        assert inference_server.default_limits(4)[model] == 2
+    assert inference_server.is_heavy("attendance_analytics", {"records": [], "byEmployee": True})
+    assert not inference_server.is_heavy("attendance_analytics", {"records": []})
+    assert not inference_server.is_heavy("chatbot", {"message": "hello"})
+
+
+def test_chatbot_is_served_while_heavy_models_are_busy(scheduler):
+    pool = scheduler(2)
+    heavy = [
+        threading.Thread(target=pool.run, args=(model, {"seconds": 0.8}))
+        for model in inference_server.HEAVY_MODELS
+    ]
+    for thread in heavy:
+        thread.start()
+    time.sleep(0.2)
+
+    started = time.perf_counter()
+    result, _ = pool.run("chatbot", {"message": "hello"})
+    assert result["answer"]
+    assert time.perf_counter() - started < 0.5
+
+    for thread in heavy:
+        thread.join()
+
+
+def test_org_wide_attendance_waits_for_the_heavy_slot(scheduler):
+    pool = scheduler(2)
+    heavy = threading.Thread(target=pool.run, args=("job_matcher", {"seconds": 0.6}))
+    heavy.start()
+    time.sleep(0.2)
+    organization = threading.Thread(target=pool.run, args=("attendance_analytics", {"byEmployee": True}))
+    organization.start()
+    time.sleep(0.1)
+    assert pool.snapshot()["models"]["attendance_analytics"]["queued"] == 1
+
+    started = time.perf_counter()
+    pool.run("attendance_analytics", {"seconds": 0})
+    assert time.perf_counter() - started < 0.3
+
+    heavy.join()
+    organization.join()
+    assert pool.snapshot()["models"]["attendance_analytics"]["completed"] == 2
+
+
+def test_timed_out_requests_keep_their_slot_until_done(scheduler):
+    pool = scheduler(2)
+    with pytest.raises(multiprocessing.TimeoutError):
+        pool.run("document_processor", {"seconds": 0.6}, timeout=0.1)
+
+    models = pool.snapshot()["models"]
+    assert models["document_processor"]["running"] == 1
+    assert models["document_processor"]["failed"] == 1
+
+    deadline = time.time() + 5
+    while pool.snapshot()["models"]["document_processor"]["running"] and time.time() < deadline:
+        time.sleep(0.05)
+    assert pool.snapshot()["models"]["document_processor"]["running"] == 0
+
+
+@pytest.fixture
+def server():
+    args = argparse.Namespace(socket=None, host="127.0.0.1", port=0, verbose=False)
+    # Requests rejected before scheduling never reach a scheduler
+    http = inference_server.create_server(args, scheduler=None)
+    thread = threading.Thread(target=http.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{http.server_address[1]}"
+    http.shutdown()
+    http.server_close()
+
+
+@pytest.mark.parametrize("body", [[1], "x", 3, {"model": "chatbot", "payload": [1]}])
+def test_non_object_requests_are_rejected(server, body):
+    request = urllib.request.Request(server + "/infer", data=json.dumps(body).encode("utf-8"), method="POST")
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request)
+    assert error.value.code == 400
+    assert json.loads(error.value.read())["success"] is False
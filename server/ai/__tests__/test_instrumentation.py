@@ -0,0 +1,88 @@
+"""Tests for per-stage timings and the Prometheus metrics export"""
+
+import threading
+import time
+
+import instrumentation
+from instrumentation import MetricsRegistry, stage, track
+
+
+def test_stages_record_real_wall_and_cpu_time():
+    with track("test_model") as tracker:
+        with stage("sleep"):
+            time.sleep(0.02)
+        with stage("spin"):
+            deadline = time.process_time() + 0.02
+            while time.process_time() < deadline:
+                pass
+        with stage("sleep"):
+            time.sleep(0.01)
+
+    timings = tracker.timings()
+    assert timings["stages"]["sleep"]["wall"] >= 0.03
+    assert timings["stages"]["sleep"]["cpu"] < timings["stages"]["sleep"]["wall"]
+    assert timings["stages"]["spin"]["cpu"] >= 0.02
+    assert timings["total"]["wall"] >= 0.05
+    # A finished request reports its final duration
+    assert abs(tracker.elapsed() - timings["total"]["wall"]) < 1e-6
+
+
+def test_nested_tracks_join_the_outer_request():
+    with track("outer") as outer:
+        with track("inner") as inner:
+            with stage("work"):
+                pass
+    assert inner is outer
+    assert list(outer.timings()["stages"]) == ["work"]
+
+
+def test_stage_without_a_request_is_a_no_op():
+    with stage("orphan"):
+        pass
+
+
+def test_threads_do_not_share_a_request():
+    seen = []
+    with track("main"):
+        thread = threading.Thread(target=lambda: seen.append(instrumentation._current.get()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
+
+
+def test_profile_and_memory_reports_are_opt_in():
+    with track("plain") as plain:
+        pass
+    assert "profile" not in plain.timings() and "memory" not in plain.timings()
+
+    with track("profiled", profile=True, trace_memory=True) as profiled:
+        data = [str(number) for number in range(20000)]
+    report = profiled.timings()
+    assert report["profile"] and {"function", "calls", "total", "cumulative"} <= set(report["profile"][0])
+    assert report["memory"]["peakBytes"] > 0
+    assert len(data) == 20000
+
+
+def test_registry_exports_prometheus_text():
+    registry = MetricsRegistry()
+    timings = {
+        "stages": {"parse": {"wall": 0.25, "cpu": 0.2}},
+        "total": {"wall": 0.5, "cpu": 0.4}
+    }
+    registry.observe("resume_parser", timings)
+    registry.observe("resume_parser", timings)
+
+    lines = registry.export_prometheus().splitlines()
+    assert 'vibhohcm_ai_request_seconds_sum{model="resume_parser"} 1.000000' in lines
+    assert 'vibhohcm_ai_request_seconds_count{model="resume_parser"} 2' in lines
+    assert 'vibhohcm_ai_request_cpu_seconds_total{model="resume_parser"} 0.800000' in lines
+    assert 'vibhohcm_ai_stage_seconds_sum{model="resume_parser",stage="parse"} 0.500000' in lines
+    assert 'vibhohcm_ai_stage_cpu_seconds_total{model="resume_parser",stage="parse"} 0.400000' in lines
+    assert "# TYPE vibhohcm_ai_stage_seconds summary" in lines
+
+
+def test_finished_requests_are_observed_globally():
+    before = dict(instrumentation.REGISTRY.requests).get("observed_model", [0])[0]
+    with track("observed_model"):
+        pass
+    assert instrumentation.REGISTRY.requests["observed_model"][0] == before + 1
@@ -0,0 +1,103 @@
+"""Tests for chatbot intents compiled from model.nlp"""
+
+import json
+import os
+
+import pytest
+
+import chatbot
+import intent_index
+from intent_index import IntentIndex, get_intent_index, stem, stems
+
+# Reference outputs of the Snowball English (Porter2) stemmer
+SNOWBALL = {
+    "consigned": "consign", "consignment": "consign", "consistency": "consist", "knackeries": "knackeri",
+    "knaves": "knave", "generously": "generous", "generate": "generat", "communication": "communic",
+    "arsenal": "arsenal", "skies": "sky", "dying": "die", "news": "news", "cried": "cri", "ties": "tie",
+    "happily": "happili", "hopping": "hop", "hoped": "hope", "caresses": "caress", "ponies": "poni",
+    "succeeded": "succeed", "leave": "leav", "apply": "appli", "vacation": "vacat", "many": "mani",
+    "attendance": "attend", "regularize": "regular"
+}
+
+
+def model(stem_dict=None, features=None):
+    """A minimal model.nlp document"""
+    return {
+        "settings": {"threshold": 0.5},
+        "nluManager": {"domainManagers": {"en": {
+            "stemDict": stem_dict or {},
+            "domains": {"default": {"intentFeatures": features or {}}}
+        }}}
+    }
+
+
+@pytest.mark.parametrize("word, expected", sorted(SNOWBALL.items()))
+def test_stemmer_matches_snowball(word, expected):
+    assert stem(word) == expected
+
+
+def test_stems_lowercase_and_split_words():
+    assert stems("How MANY leave-days?") == ["how", "mani", "leav", "day"]
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("How many leave days do I have?", "leave.balance"),
+    ("what is the status of my leave request", "leave.status"),
+    ("download my payslip", "payroll.download"),
+    ("explain my salary breakdown", "payroll.breakdown"),
+    ("I forgot to mark my attendance yesterday", "attendance.regularize")
+])
+def test_shipped_model_intents(message, intent):
+    assert get_intent_index().classify(message)["intent"] == intent
+
+
+@pytest.mark.parametrize("message", ["xyzzy plugh", "what is the", "tell me a joke about cats", ""])
+def test_messages_the_model_does_not_cover(message):
+    assert get_intent_index().classify(message) is None
+
+
+def test_training_utterances_match_exactly():
+    index = IntentIndex(model({"balanc,leav,my": {"intent": "leave.balance"}}))
+    assert index.classify("my leave balance") == {"intent": "leave.balance", "confidence": 1.0}
+    assert index.classify("Balance, my LEAVE!") == {"intent": "leave.balance", "confidence": 1.0}
+
+
+def test_shared_and_stopword_features_carry_no_weight():
+    index = IntentIndex(model(features={
+        "leave.apply": ["leav", "appli", "my"],
+        "leave.balance": ["leav", "balanc", "my"],
+        "payroll.date": ["salari", "date", "my"]
+    }))
+    assert index.weights["my"] == 0
+    assert index.weights["leav"] < index.weights["appli"]
+    assert "my" not in index.postings
+    assert index.classify("apply for my leave")["intent"] == "leave.apply"
+    # Unknown words dilute the confidence below the threshold
+    assert index.classify("salary") is not None
+    assert index.classify("salary question regarding something unrelated") is None
+
+
+def test_index_is_loaded_once_and_reloaded_on_change(tmp_path, monkeypatch):
+    path = tmp_path / "model.nlp"
+    monkeypatch.setenv("CHATBOT_NLP_MODEL", str(path))
+    assert get_intent_index() is None
+
+    path.write_text(json.dumps(model({"balanc,leav": {"intent": "leave.balance"}})))
+    first = get_intent_index()
+    assert first is get_intent_index()
+    assert first.classify("leave balance")["intent"] == "leave.balance"
+
+    path.write_text(json.dumps(model({"balanc,leav": {"intent": "leave.status"}})))
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+    assert get_intent_index().classify("leave balance")["intent"] == "leave.status"
+    assert intent_index.model_path() == str(path)
+
+
+def test_chatbot_maps_model_intents_and_falls_back_to_keywords():
+    assert chatbot.classify_intent("download my payslip", {}) == ("payroll_inquiry", 1.0, "payroll.download")
+    assert chatbot.classify_intent("I need help", {}) == ("help_request", 0.90, None)
+    results = chatbot.classify_intents(["How many leave days do I have?", "hello there"])
+    assert results == [
+        {"intent": "leave_inquiry", "confidence": 1.0, "nlpIntent": "leave.balance"},
+        {"intent": "general_inquiry", "confidence": 0.60, "nlpIntent": None}
+    ]
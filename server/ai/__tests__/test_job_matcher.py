@@ -0,0 +1,76 @@
+"""Tests for the bitset candidate x opening match matrix"""
+
+import random
+
+import numpy as np
+import pytest
+
+import job_matcher
+from resume_parser import score_against_requirements
+
+
+def synthetic(seed, vocabulary, candidates, openings):
+    rng = random.Random(seed)
+    skills = [f"Skill{index}" for index in range(vocabulary)]
+    return (
+        [
+            {"candidateId": f"C{index}", "skills": rng.sample(skills, rng.randint(0, min(12, vocabulary))),
+             "experience": rng.randint(0, 10)}
+            for index in range(candidates)
+        ],
+        [
+            {"jobId": f"J{index}", "skills": rng.sample(skills, rng.randint(0, min(6, vocabulary))),
+             "minExperience": rng.randint(0, 5)}
+            for index in range(openings)
+        ]
+    )
+
+
+def test_bitsets_hold_one_bit_per_skill():
+    records = [{"skills": ["A", "b", "a"]}, {"skills": []}, {"skills": ["Z"]}]
+    vocabulary = {f"skill{index}": index for index in range(131)}
+    vocabulary.update({"a": 0, "b": 1, "z": 130})
+    bitsets = job_matcher.encode_skills(records, vocabulary)
+    assert bitsets.dtype == np.uint64 and bitsets.shape == (3, 3)
+    assert bitsets[0].tolist() == [0b11, 0, 0]
+    assert bitsets[1].tolist() == [0, 0, 0]
+    assert bitsets[2].tolist() == [0, 0, 1 << 2]
+
+
+def test_popcount_fallback_matches(monkeypatch):
+    words = np.array([[0, 1, 2 ** 64 - 1, 0xF0F0]], dtype=np.uint64)
+    expected = [[0, 1, 64, 8]]
+    assert job_matcher.popcount(words).tolist() == expected
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    assert job_matcher.popcount(words).tolist() == expected
+
+
+@pytest.mark.parametrize("vocabulary", [3, 64, 65, 200])
+def test_scores_match_the_resume_parser_formula(vocabulary, monkeypatch):
+    # Small blocks exercise the running top-k merge and the overlap chunking
+    monkeypatch.setattr(job_matcher, "BLOCK_SIZE", 7)
+    monkeypatch.setattr(job_matcher, "OVERLAP_WORDS", 16)
+    candidates, openings = synthetic(vocabulary, vocabulary, 40, 9)
+    result = job_matcher.match_pipeline(candidates, openings, top=3)
+
+    expected = [
+        [score_against_requirements(candidate["skills"], candidate["experience"], opening) for opening in openings]
+        for candidate in candidates
+    ]
+    # Which of several tied matches makes the cut is unspecified, so
+    # compare scores, and check each reported match against the formula
+    jobs = {opening["jobId"]: index for index, opening in enumerate(openings)}
+    for row, entry in enumerate(result["byCandidate"]):
+        assert [match["score"] for match in entry["matches"]] == sorted(expected[row], reverse=True)[:3]
+        assert all(match["score"] == expected[row][jobs[match["jobId"]]] for match in entry["matches"])
+
+    rows = {candidate["candidateId"]: index for index, candidate in enumerate(candidates)}
+    for job, entry in enumerate(result["byOpening"]):
+        assert [match["score"] for match in entry["matches"]] == sorted((scores[job] for scores in expected), reverse=True)[:3]
+        assert all(match["score"] == expected[rows[match["candidateId"]]][job] for match in entry["matches"])
+
+
+def test_empty_inputs():
+    assert job_matcher.match_pipeline([], [])["byCandidate"] == []
+    result = job_matcher.match_pipeline([{"candidateId": 1, "skills": ["a"]}], [])
+    assert result["byCandidate"] == [{"candidateId": 1, "matches": []}]
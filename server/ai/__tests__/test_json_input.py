@@ -0,0 +1,66 @@
+"""Tests for streaming JSON record input"""
+
+import io
+import json
+
+import pytest
+
+from json_input import iter_json_records, read_json_records
+
+RECORDS = [
+    {"date": "2024-05-06T09:00:00Z", "status": "present", "overtime": 1.25},
+    {"date": "2024-05-07", "status": "late", "note": "train [delayed], \"again\""},
+    12345678901234567890,
+    -0.5e-3,
+    "text",
+    None,
+    [1, [2, 3]],
+    {}
+]
+
+
+def records(text, chunk_size=64 * 1024):
+    return list(iter_json_records(io.StringIO(text), chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 16, 1024])
+def test_array_matches_json_loads_across_chunk_boundaries(chunk_size):
+    text = json.dumps(RECORDS, indent=1)
+    assert records(text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_jsonl_stream(chunk_size):
+    text = "\n".join(json.dumps(record) for record in RECORDS) + "\n"
+    assert records(text, chunk_size) == RECORDS
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] ", "[\n]\n"])
+def test_empty_arrays(text):
+    assert records(text) == []
+
+
+@pytest.mark.parametrize("text", [
+    "[1 2]",
+    "[1,,2]",
+    "[,1]",
+    "[1,]",
+    "[1,2",
+    "[{} {}]",
+    "[1] 2",
+    "[1]]",
+    '["a" "b"]'
+])
+@pytest.mark.parametrize("chunk_size", [1, 1024])
+def test_malformed_arrays_are_rejected(text, chunk_size):
+    with pytest.raises(ValueError):
+        records(text, chunk_size)
+
+
+def test_read_json_records_keeps_only_requested_fields(tmp_path):
+    path = tmp_path / "records.json"
+    path.write_text(json.dumps(RECORDS[:2]), encoding="utf-8")
+    assert read_json_records("@" + str(path), ["date", "status"]) == [
+        {"date": "2024-05-06T09:00:00Z", "status": "present"},
+        {"date": "2024-05-07", "status": "late"}
+    ]
@@ -0,0 +1,84 @@
+"""Tests for MinHash/LSH near-duplicate detection"""
+
+import multiprocessing
+import os
+
+import pytest
+
+import near_duplicates
+from near_duplicates import NearDuplicateIndex, minhash, similarity
+
+RESUME = " ".join(
+    f"Senior engineer number {index} delivered payment platform projects with Python and SQL for customers"
+    for index in range(30)
+)
+
+
+def test_similar_documents_have_similar_signatures():
+    edited = RESUME.replace("number 3 ", "number three ")
+    assert similarity(minhash(RESUME), minhash(edited)) >= near_duplicates.THRESHOLD
+    assert similarity(minhash(RESUME), minhash("An entirely different cover letter about gardening")) < 0.2
+
+
+def test_documents_without_words_have_no_signature(tmp_path):
+    assert minhash("") is None
+    assert minhash("  \n\t .,;  ") is None
+
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite"))
+    assert index.find_or_add("empty-1", minhash("")) is None
+    assert index.find_or_add("empty-2", minhash("")) is None
+    assert len(index) == 0
+
+
+def test_find_or_add_reports_the_original(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite"))
+    assert index.find_or_add("original", minhash(RESUME), "digest-1") is None
+    match = index.find_or_add("copy", minhash(RESUME + " Updated"), "digest-2")
+    assert match["id"] == "original" and match["digest"] == "digest-1"
+    # Re-submitting the original does not match itself
+    assert index.find_or_add("original", minhash(RESUME)) is None
+    assert len(index) == 1
+
+
+def _ingest(path, document_id, barrier, results):
+    index = NearDuplicateIndex(path)
+    signature = minhash(RESUME)
+    barrier.wait()
+    match = index.find_or_add(document_id, signature)
+    results.put((document_id, match and match["id"]))
+
+
+def test_concurrent_ingests_index_a_document_once(tmp_path):
+    path = str(tmp_path / "index.sqlite")
+    NearDuplicateIndex(path)
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(4)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_ingest, args=(path, f"copy-{number}", barrier, results))
+        for number in range(4)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = dict(results.get(timeout=30) for _ in processes)
+    for process in processes:
+        process.join()
+
+    originals = [document_id for document_id, match in outcomes.items() if match is None]
+    assert len(originals) == 1
+    assert all(match == originals[0] for document_id, match in outcomes.items() if match is not None)
+    assert len(NearDuplicateIndex(path)) == 1
+
+
+def test_index_directory_must_be_private(tmp_path, monkeypatch):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        NearDuplicateIndex(str(shared / "index.sqlite"))
+
+    monkeypatch.setattr(near_duplicates, "_indexes", {})
+    monkeypatch.setenv("AI_DEDUP_DIR", str(tmp_path / "dedup"))
+    index = near_duplicates.get_index("resume")
+    assert os.stat(tmp_path / "dedup").st_mode & 0o777 == 0o700
+    assert os.stat(os.path.dirname(index.path)).st_mode & 0o777 == 0o700
@@ -0,0 +1,119 @@
+"""Tests for the BM25 policy passage index and the chatbot's policy answers"""
+
+import random
+
+import pytest
+
+import benchmark
+import chatbot
+from policy_index import PolicyIndex, build_index, iter_passages, open_index
+
+POLICIES = {
+    "Remote Work Policy": (
+        "Employees may work remotely up to three days per week with their manager's approval. "
+        "Remote work requires a reliable internet connection and availability during core hours "
+        "from 10am to 4pm. Equipment such as laptops and monitors is provided by the IT department, "
+        "and employees working from home must follow the information security guidelines."
+    ),
+    "Leave Policy": (
+        "Full-time employees accrue 20 days of annual leave per year. Sick leave of up to 10 days is "
+        "available with a medical certificate for absences longer than two days. Leave requests must "
+        "be submitted through the HR portal at least two weeks in advance, except for emergencies."
+    ),
+    "Travel and Expense Policy": (
+        "Business travel must be approved in advance. Employees are reimbursed for economy airfare, "
+        "hotel stays up to the city limit and meals up to 50 dollars per day. Expense claims with "
+        "receipts must be filed within 30 days of the trip through the finance portal."
+    ),
+    "Code of Conduct": (
+        "All employees are expected to treat colleagues with respect. Harassment, discrimination and "
+        "retaliation are not tolerated. Concerns can be reported confidentially to HR or through the "
+        "ethics hotline, and every report is investigated promptly."
+    )
+}
+
+ANSWERED = [
+    ("What is the remote work policy?", "Remote Work Policy"),
+    ("Can I work from home?", "Remote Work Policy"),
+    ("How do I file an expense claim?", "Travel and Expense Policy")
+]
+UNANSWERED = ["tell me about the policy", "Can I bring my dog to the office?"]
+
+
+def write_policies(directory, filler_documents=0):
+    directory.mkdir()
+    for title, text in POLICIES.items():
+        (directory / f"{title}.txt").write_text(f"{title}\n\n{text}\n")
+    rng = random.Random(0)
+    for number in range(filler_documents):
+        passages = [benchmark.synthetic_document(rng, 800) for _ in range(10)]
+        (directory / f"filler{number}.txt").write_text("\n\n".join(passages))
+    return directory
+
+
+@pytest.fixture(scope="module", params=[0, 60], ids=["small", "large"])
+def index_directory(request, tmp_path_factory):
+    root = tmp_path_factory.mktemp("corpus")
+    sources = write_policies(root / "policies", request.param)
+    build_index(str(root / "index"), [str(sources)])
+    return str(root / "index")
+
+
+@pytest.mark.parametrize("question, title", ANSWERED)
+def test_relevant_passages_are_answered(index_directory, question, title, monkeypatch):
+    best = PolicyIndex(index_directory).search(question, 1)[0]
+    assert best["title"] == title
+    assert best["relevance"] >= chatbot.POLICY_MIN_RELEVANCE
+
+    monkeypatch.setenv("POLICY_INDEX_DIR", index_directory)
+    assert chatbot.policy_answer(question).startswith(f"According to {title}:")
+
+
+@pytest.mark.parametrize("question", UNANSWERED)
+def test_unrelated_questions_fall_back(index_directory, question, monkeypatch):
+    monkeypatch.setenv("POLICY_INDEX_DIR", index_directory)
+    assert chatbot.policy_answer(question) is None
+
+
+def test_small_corpora_score_low_but_stay_relevant(tmp_path):
+    # The raw BM25 score of the right passage in a four-document corpus is
+    # below the old fixed cutoff of 5; its relevance is not
+    build_index(str(tmp_path / "index"), [str(write_policies(tmp_path / "policies"))])
+    best = PolicyIndex(str(tmp_path / "index")).search("What is the remote work policy?", 1)[0]
+    assert best["score"] < 5.0
+    assert best["relevance"] >= chatbot.POLICY_MIN_RELEVANCE
+
+
+def test_search_ranks_by_score(index_directory):
+    results = PolicyIndex(index_directory).search("sick leave days", 3)
+    assert results[0]["title"] == "Leave Policy"
+    assert [result["score"] for result in results] == sorted((result["score"] for result in results), reverse=True)
+    assert PolicyIndex(index_directory).search("the and of", 3) == []
+
+
+def test_passages_close_at_paragraph_breaks(tmp_path):
+    path = tmp_path / "policy.txt"
+    first = " ".join(f"alpha{number}" for number in range(50))
+    second = " ".join(f"beta{number}" for number in range(10))
+    path.write_text(f"{first}\n\n{second}\n\n" + " ".join(["gamma"] * 400))
+    passages = list(iter_passages(str(path)))
+    assert passages[0] == first
+    assert all(len(passage.split()) <= 160 for passage in passages)
+    assert " ".join(passages) == " ".join(path.read_text().split())
+
+
+def test_rebuilt_index_is_reopened(tmp_path):
+    sources = write_policies(tmp_path / "policies")
+    directory = str(tmp_path / "index")
+    build_index(directory, [str(sources)])
+    before = open_index(directory)
+    assert open_index(directory) is before
+
+    (sources / "Parking Policy.txt").write_text("Parking permits are issued by facilities for the staff garage.")
+    build_index(directory, [str(sources)])
+    after = open_index(directory)
+    assert after.search("parking permit", 1)[0]["title"] == "Parking Policy"
+    # An index opened before the rebuild keeps reading its own passages
+    assert after is not before
+    assert [passage["title"] for passage in before.search("expense claim receipts", 1)] == ["Travel and Expense Policy"]
+    assert before.search("parking permit") == []
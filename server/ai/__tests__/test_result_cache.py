@@ -0,0 +1,120 @@
+"""Tests for the content-addressed two-tier result cache"""
+
+import os
+
+import pytest
+
+import result_cache
+from result_cache import ResultCache, file_digest, text_digest, version_digest
+
+KEY = text_digest("resume text")
+
+
+def test_digests_are_content_addressed(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("resume text")
+    assert file_digest(str(path)) == KEY
+    assert text_digest("resume text ") != KEY
+    assert version_digest(1, {"b": 2, "a": 1}) == version_digest(1, {"a": 1, "b": 2})
+    assert version_digest(1) != version_digest(2)
+
+
+def test_results_survive_a_new_process_through_the_disk_tier(tmp_path):
+    ResultCache("parser", "v1", str(tmp_path)).put(KEY, {"skills": ["Python"]})
+    fresh = ResultCache("parser", "v1", str(tmp_path))
+    assert fresh.memory == {}
+    assert fresh.get(KEY) == {"skills": ["Python"]}
+    assert KEY in fresh.memory
+    assert fresh.get(text_digest("other")) is None
+
+
+def test_a_new_version_discards_old_entries(tmp_path):
+    ResultCache("parser", "v1", str(tmp_path)).put(KEY, {"skills": []})
+    assert ResultCache("parser", "v2", str(tmp_path)).get(KEY) is None
+    assert "v1" not in os.listdir(tmp_path / "parser")
+
+
+def test_memory_tier_is_a_bounded_lru(tmp_path):
+    cache = ResultCache("parser", "v1", str(tmp_path), max_entries=2)
+    for key in ("a1", "b1", "c1"):
+        cache.put(key, key)
+    assert list(cache.memory) == ["b1", "c1"]
+    # Still on disk
+    assert cache.get("a1") == "a1"
+    assert list(cache.memory) == ["c1", "a1"]
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = ResultCache("parser", "v1", str(tmp_path), max_bytes=2500)
+    for number in range(5):
+        key = f"{number:02d}" + "0" * 62
+        cache.put(key, "x" * 1000)
+        os.utime(cache._path(key), (number, number))
+    cache.put("99" + "0" * 62, "x" * 1000)
+    remaining = sorted(os.path.basename(path)[:2] for _, _, path in cache._scan())
+    assert remaining == ["04", "99"]
+
+
+def test_corrupt_entries_are_misses(tmp_path):
+    cache = ResultCache("parser", "v1", str(tmp_path))
+    path = cache._path(KEY)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "w") as file:
+        file.write("{truncated")
+    assert cache.get(KEY) is None
+
+
+def test_get_cache_follows_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "_caches", {})
+    monkeypatch.setenv("AI_CACHE_DIR", str(tmp_path))
+    cache = result_cache.get_cache("parser", "v1")
+    assert cache is result_cache.get_cache("parser", "v1")
+    assert cache.directory == os.path.join(str(tmp_path), "parser", "v1")
+    assert result_cache.get_cache("parser", "v2").version == "v2"
+    monkeypatch.setenv("AI_CACHE_DISABLED", "1")
+    assert result_cache.get_cache("parser", "v1") is None
+
+
+def test_resume_analysis_is_served_from_the_cache(tmp_path, monkeypatch):
+    import resume_parser
+
+    monkeypatch.setattr(result_cache, "_caches", {})
+    monkeypatch.setenv("AI_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("AI_DEDUP_DISABLED", "1")
+    text = "Jane Doe\njane@example.com\nSenior engineer with 7 years of experience in Python and SQL.\nBachelor of Science"
+    first = resume_parser.analyze_resume(text)
+    second = resume_parser.analyze_resume(text)
+    assert first["cached"] is False and second["cached"] is True
+    strip = lambda result: {key: value for key, value in result.items() if key not in ("cached", "timings")}
+    assert strip(second) == strip(first)
+
+
+def test_cache_directory_is_private_to_this_user(tmp_path):
+    assert str(os.getuid()) in os.path.basename(result_cache.DEFAULT_DIRECTORY)
+    ResultCache("parser", "v1", str(tmp_path / "cache")).put(KEY, {})
+    assert os.stat(tmp_path / "cache").st_mode & 0o777 == 0o700
+
+    # A directory another user could have planted results in is refused
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        ResultCache("parser", "v1", str(shared))
+
+
+def test_document_results_are_cached_without_request_fields(tmp_path, monkeypatch):
+    import document_processor
+
+    monkeypatch.setattr(result_cache, "_caches", {})
+    monkeypatch.setenv("AI_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "offer.txt"
+    path.write_text("Offer letter for Jane Doe, salary $5,000 from 01/02/2024.")
+    first = document_processor.process_document(str(path))
+    second = document_processor.process_document(str(path))
+    assert first["cached"] is False and second["cached"] is True
+
+    cache = result_cache.get_cache("document_processor", document_processor.model_version())
+    key = next(iter(cache.memory))
+    disk = ResultCache("document_processor", cache.version, str(tmp_path / "cache")).get(key)
+    assert cache.memory[key] == disk
+    assert "timings" not in disk and "processingTime" not in disk
@@ -0,0 +1,141 @@
+"""Tests for the shared, per-session locked conversation store"""
+
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+import session_store
+from session_store import SessionStore
+
+
+def take_turns(store, session_id, turns, pause=0.001):
+    for number in range(turns):
+        with store.lock(session_id):
+            session = store.get(session_id)
+            # Widen the window between load and save that a race would hit
+            time.sleep(pause)
+            session.add_turn(f"message {number}", "leave_request", [])
+            store.update(session)
+
+
+def test_stores_sharing_a_directory_share_sessions(tmp_path):
+    # Two pool workers open their own store on the same directory
+    first = SessionStore(str(tmp_path / "sessions"))
+    second = SessionStore(str(tmp_path / "sessions"))
+
+    session = first.get("abc")
+    session.profile.update({"name": "Priya"})
+    session.add_turn("How many leave days do I have?", "leave_balance", [{"type": "DATE", "entity": "12/05/2024"}])
+    first.update(session)
+
+    resumed = second.get("abc")
+    assert resumed.turn_count == 1
+    assert resumed.last_intent() == "leave_balance"
+    assert resumed.profile == {"name": "Priya"}
+    assert resumed.entities == {"DATE": "12/05/2024"}
+
+    assert second.drop("abc") is True
+    assert first.get("abc", create=False) is None
+
+
+def test_idle_sessions_expire(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: clock[0])
+    store = SessionStore(str(tmp_path / "sessions"), ttl=60)
+    store.update(store.get("old"))
+    clock[0] += 61
+    store.update(store.get("new"))
+    assert store.get("old", create=False) is None
+    assert store.get("new", create=False) is not None
+
+
+def test_least_recently_used_are_evicted(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: clock[0])
+    store = SessionStore(str(tmp_path / "sessions"), max_sessions=2)
+    for session_id in ("a", "b", "c"):
+        clock[0] += 1
+        store.update(store.get(session_id))
+        if session_id == "b":
+            clock[0] += 1
+            store.get("a")
+    assert store.get("b", create=False) is None
+    assert store.stats()["sessions"] == 2
+    assert store.stats()["evictions"] == 1
+
+
+def test_byte_cap_keeps_the_session_just_saved(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"), max_bytes=10)
+    store.update(store.get("a"))
+    store.update(store.get("b"))
+    assert store.get("a", create=False) is None
+    assert store.get("b", create=False) is not None
+
+
+def test_shared_directory_must_be_private(tmp_path):
+    directory = tmp_path / "sessions"
+    directory.mkdir(mode=0o755)
+    os.chmod(directory, 0o755)
+    with pytest.raises(PermissionError):
+        SessionStore(str(directory))
+
+
+def test_concurrent_turns_in_threads_are_serialized(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    threads = [threading.Thread(target=take_turns, args=(store, "shared", 10)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.get("shared").turn_count == 40
+
+
+def _worker(directory, barrier):
+    store = SessionStore(directory)
+    barrier.wait()
+    take_turns(store, "shared", 10)
+
+
+def test_concurrent_turns_in_processes_are_serialized(tmp_path):
+    directory = str(tmp_path / "sessions")
+    store = SessionStore(directory)
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(4)
+    processes = [context.Process(target=_worker, args=(directory, barrier)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+    session = store.get("shared")
+    assert session.turn_count == 40
+    assert len(session.turns) == session_store.MAX_TURNS
+
+
+def test_a_store_inherited_across_fork_reopens(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions"))
+    store.update(store.get("before"))
+    context = multiprocessing.get_context("fork")
+    process = context.Process(target=take_turns, args=(store, "after", 3))
+    process.start()
+    process.join(timeout=60)
+    assert process.exitcode == 0
+    assert store.get("after").turn_count == 3
+
+
+def test_follow_up_served_by_another_worker_keeps_its_intent(tmp_path, monkeypatch):
+    import chatbot
+
+    monkeypatch.setenv("CHATBOT_SESSION_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setattr(session_store, "_store", None)
+    first = chatbot.process_message("I want to apply for leave next week", {"name": "Asha"}, "s1")
+
+    # A fresh store stands in for the next turn landing on another worker
+    monkeypatch.setattr(session_store, "_store", None)
+    second = chatbot.process_message("and what about friday?", {}, "s1")
+    assert second["turn"] == 2
+    assert second["intent"] == first["intent"] == "leave_inquiry"
+    assert second["confidence"] == chatbot.FOLLOW_UP_CONFIDENCE
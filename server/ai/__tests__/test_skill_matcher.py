@@ -0,0 +1,81 @@
+"""Tests for the Aho-Corasick skills matcher and its on-disk cache"""
+
+import json
+import os
+import pickle
+
+import pytest
+
+import skill_matcher
+from skill_matcher import SkillMatcher, load_matcher, normalize_taxonomy
+
+ENTRIES = normalize_taxonomy({
+    "Python": ["py"],
+    "Go": ["golang"],
+    "Machine Learning": ["ML", "machine-learning"],
+    "Node.js": ["node", "nodejs"],
+    "Learning": []
+})
+
+
+def test_matches_whole_tokens_only():
+    matcher = SkillMatcher(ENTRIES)
+    assert matcher.find("Worked at Google on Python and golang services") == ["Python", "Go"]
+    assert matcher.find("Applied machine learning with Node.js") == ["Machine Learning", "Node.js", "Learning"]
+    assert matcher.find("nothing relevant") == []
+
+
+def test_serialized_matcher_round_trips(tmp_path):
+    built = load_matcher(ENTRIES, str(tmp_path))
+    path = skill_matcher._automaton_path(str(tmp_path), built.version)
+    assert path.endswith(".json")
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    loaded = SkillMatcher.from_dict(data)
+    text = "py, ML, nodejs and Go"
+    assert loaded.find(text) == built.find(text) == ["Python", "Go", "Machine Learning", "Node.js"]
+    assert load_matcher(ENTRIES, str(tmp_path)).goto == built.goto
+
+
+def test_planted_pickle_is_never_loaded(tmp_path):
+    version = SkillMatcher(ENTRIES).version
+    path = skill_matcher._automaton_path(str(tmp_path), version)
+    os.makedirs(os.path.dirname(path))
+
+    class Exploit:
+        def __reduce__(self):
+            return (os.mkdir, (str(tmp_path / "pwned"),))
+
+    for planted in (path, path[:-len(".json")] + ".pickle"):
+        with open(planted, "wb") as file:
+            pickle.dump(Exploit(), file)
+
+    matcher = load_matcher(ENTRIES, str(tmp_path))
+    assert not (tmp_path / "pwned").exists()
+    assert matcher.find("python") == ["Python"]
+
+
+def test_shared_cache_directories_are_refused(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        load_matcher(ENTRIES, str(shared))
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda data: data["fail"].append(0),
+    lambda data: data["goto"][0].update({"x": 10 ** 6}),
+    lambda data: data["outputs"][-1].append(99),
+    lambda data: data.pop("skills")
+])
+def test_inconsistent_cache_files_are_rebuilt(tmp_path, tamper):
+    built = load_matcher(ENTRIES, str(tmp_path))
+    path = skill_matcher._automaton_path(str(tmp_path), built.version)
+    data = built.to_dict()
+    tamper(data)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+    assert load_matcher(ENTRIES, str(tmp_path)).find("py and golang") == ["Python", "Go"]
@@ -0,0 +1,92 @@
+"""Tests for streaming TXT, PDF and DOCX text extraction"""
+
+import zipfile
+import zlib
+
+import text_extraction
+from text_extraction import content_stream_text, iter_docx_paragraphs, iter_pdf_pages, iter_text_chunks
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def write_pdf(path, streams):
+    """A minimal PDF: one object per (dictionary, raw stream bytes)"""
+    parts = [b"%PDF-1.4\n"]
+    for number, (dictionary, data) in enumerate(streams, 1):
+        parts.append(b"%d 0 obj\n<< %s /Length %d >>\nstream\n%s\nendstream\nendobj\n" % (number, dictionary, len(data), data))
+    parts.append(b"trailer\n<< >>\n%%EOF\n")
+    path.write_bytes(b"".join(parts))
+    return str(path)
+
+
+def write_docx(path, body):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document {W}><w:body>{body}</w:body></w:document>')
+    return str(path)
+
+
+def test_content_stream_operators():
+    content = (
+        b"BT /F1 12 Tf 72 712 Td (Jane \\(J.\\) Doe) Tj 0 -14 Td "
+        b"[(Senior)-250(Engi)20(neer)] TJ T* <0050007900740068006F006E> Tj "
+        b"(caf\\351) ' ET"
+    )
+    assert content_stream_text(content) == "Jane (J.) Doe\nSenior Engineer\nPython\ncafé"
+
+
+def test_pdf_pages_are_decoded_one_stream_at_a_time(tmp_path):
+    path = write_pdf(tmp_path / "resume.pdf", [
+        (b"/Filter /FlateDecode", zlib.compress(b"BT (Page one) Tj ET")),
+        (b"/Subtype /Type1C", b"BT (font program, not text) Tj ET"),
+        (b"", b"BT [(Page)-300(two)] TJ ET"),
+        (b"/Filter [/ASCIIHexDecode /FlateDecode]", b"skipped"),
+        (b"", b"q 1 0 0 1 0 0 cm Q")
+    ])
+    assert list(iter_pdf_pages(path)) == ["Page one\n", "Page two\n"]
+    assert "".join(iter_text_chunks(path)) == "Page one\nPage two\n"
+
+
+def test_oversized_streams_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_extraction, "MAX_STREAM_BYTES", 1024)
+    bomb = b"BT (" + b"A" * 10000 + b") Tj ET"
+    path = write_pdf(tmp_path / "bomb.pdf", [
+        (b"/Filter /FlateDecode", zlib.compress(bomb)),
+        (b"/Filter /FlateDecode", zlib.compress(b"BT (Small) Tj ET"))
+    ])
+    assert list(iter_pdf_pages(path)) == ["Small\n"]
+
+
+def test_empty_pdf(tmp_path):
+    (tmp_path / "empty.pdf").write_bytes(b"")
+    assert list(iter_pdf_pages(str(tmp_path / "empty.pdf"))) == []
+
+
+def test_docx_paragraphs(tmp_path):
+    path = write_docx(tmp_path / "resume.docx", (
+        "<w:p><w:r><w:t>Jane</w:t></w:r><w:r><w:t xml:space=\"preserve\"> Doe</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>Skills:</w:t><w:tab/><w:t>Python</w:t><w:br/><w:t>SQL</w:t></w:r></w:p>"
+        "<w:p/>"
+    ))
+    assert list(iter_docx_paragraphs(path)) == ["Jane Doe\n", "Skills:\tPython\nSQL\n", "\n"]
+
+
+def test_chunks_are_bounded_and_lossless(tmp_path):
+    text = "".join(f"line {number}\n" for number in range(5000))
+    (tmp_path / "resume.txt").write_text(text)
+    chunks = list(iter_text_chunks(str(tmp_path / "resume.txt"), chunk_size=1000))
+    assert "".join(chunks) == text
+    assert max(len(chunk) for chunk in chunks) == 1000
+
+    paragraphs = "".join(f"<w:p><w:r><w:t>paragraph {number}</w:t></w:r></w:p>" for number in range(2000))
+    path = write_docx(tmp_path / "long.docx", paragraphs)
+    chunks = list(iter_text_chunks(path, chunk_size=1000))
+    assert len(chunks) > 10
+    assert "".join(chunks) == "".join(f"paragraph {number}\n" for number in range(2000))
+    assert max(len(chunk) for chunk in chunks) < 1000 + len("paragraph 1999\n")
+
+
+def test_other_formats(tmp_path):
+    assert list(iter_text_chunks(str(tmp_path / "scan.png"))) == [
+        "This is OCR text from a .png image. In production, we would use OCR libraries."
+    ]
+    assert list(iter_text_chunks(str(tmp_path / "notes.xyz"))) == ["Unsupported file format"]
@@ -0,0 +1,63 @@
+"""Tests for tokenize-once term counts and the analyzers that read them"""
+
+import random
+
+import pytest
+
+import benchmark
+import document_processor
+from text_features import TermCounts, count_terms
+
+EMAIL = "From: Jane Doe\nTo: HR\nSubject: Agreement renewal\n\nWe agree to the terms. Great_work, from the team!"
+
+
+def chunked_counts(text, sizes):
+    counts = TermCounts()
+    position = 0
+    for size in sizes:
+        counts.update(text[position:position + size])
+        position += size
+    counts.update(text[position:])
+    return counts.close()
+
+
+def test_counts_are_lowercased_words_with_header_terms():
+    terms = count_terms(EMAIL)
+    assert terms["subject:"] == 1 and terms["subject"] == 1
+    assert terms["from:"] == 1 and terms["from"] == 2
+    assert terms["agreement"] == 1 and terms["agree"] == 1
+    assert terms["great_work"] == 1 and terms["great"] == 0
+    assert "jane" in terms and "Jane" not in terms
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_chunked_counts_equal_whole_text_counts(seed):
+    rng = random.Random(seed)
+    text = EMAIL + "\n" + benchmark.synthetic_document(rng, 20000)
+    sizes = [rng.randint(1, 300) for _ in range(200)]
+    assert chunked_counts(text, sizes).counts == count_terms(text).counts
+
+
+def test_present_iterates_either_side():
+    terms = count_terms("good good bad")
+    assert terms.present({"good"}) == {"good"}
+    assert terms.present(frozenset(f"word{number}" for number in range(100)) | {"bad"}) == {"bad"}
+
+
+def test_keywords_match_whole_words_only(monkeypatch):
+    monkeypatch.setattr(document_processor, "trained_classifier", lambda: None)
+    # "agree" inside "agreement" and "cv" inside other words do not count
+    assert document_processor.analyze_sentiment("The agreement was signed")["sentiment"] == "neutral"
+    assert document_processor.classify_document("See the cvs attached")["category"] == "Other"
+    assert document_processor.classify_document(EMAIL)["category"] == "Email"
+
+
+def test_streamed_analysis_matches_whole_text(monkeypatch):
+    monkeypatch.setattr(document_processor, "trained_classifier", lambda: None)
+    text = EMAIL + "\n" + benchmark.synthetic_document(random.Random(7), 30000)
+    chunks = [text[start:start + 997] for start in range(0, len(text), 997)]
+    streamed = document_processor.analyze_text_stream(chunks)
+    assert streamed["classification"] == document_processor.classify_document(text)
+    assert streamed["sentiment"] == document_processor.analyze_sentiment(text)
+    assert streamed["entities"] == document_processor.extract_entities(text)
+    assert streamed["textLength"] == len(text)
@@ -0,0 +1,91 @@
+"""Tests for the long-lived AI worker's line protocol"""
+
+import io
+import json
+
+import pytest
+
+import worker
+
+
+def serve(*requests):
+    reader = io.StringIO("".join(
+        (request if isinstance(request, str) else json.dumps(request)) + "\n" for request in requests
+    ))
+    writer = io.StringIO()
+    worker.serve_stream(reader, writer)
+    return [json.loads(line) for line in writer.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize("line", ['[1]', '"x"', '42', 'null', '{broken'])
+def test_invalid_request_lines_get_an_error_response(line):
+    response = worker.handle_line(line)
+    assert response["success"] is False
+    assert response["id"] is None
+    assert response["message"].startswith("Invalid request")
+
+
+def test_worker_keeps_serving_after_invalid_lines():
+    responses = serve('[1]', '"x"', {"id": 3, "command": "models"})
+    assert [response["success"] for response in responses] == [False, False, True]
+    assert responses[-1]["id"] == 3
+    assert "chatbot" in responses[-1]["result"]
+
+
+def test_unknown_model_is_reported_with_the_request_id():
+    response = worker.handle_line(json.dumps({"id": 7, "model": "nope", "payload": {}}))
+    assert response == {"id": 7, "success": False, "message": "Unknown model: nope"}
+
+
+def test_dispatch_returns_result_and_timings():
+    response = worker.handle_line(json.dumps({
+        "id": 1,
+        "model": "attendance_analytics",
+        "payload": {"records": [{"date": "2024-05-06", "status": "present"}]}
+    }))
+    assert response["success"] is True
+    assert response["result"]["patterns"]["lateArrivals"] == 0
+    assert "total" in response["timings"]
+
+
+def test_streamed_requests_send_events_before_the_response():
+    responses = serve({"id": 5, "model": "chatbot", "stream": True, "payload": {"message": "How many leave days do I have?"}})
+    events = [response["event"] for response in responses[:-1]]
+    assert events[0]["type"] == "envelope"
+    assert all(response["id"] == 5 for response in responses)
+    assert responses[-1]["success"] is True
+    assert "".join(event["text"] for event in events if event["type"] == "chunk") == responses[-1]["result"]["answer"]
+
+
+def test_streaming_a_model_without_stream_support_sends_only_the_response():
+    responses = serve({"id": 6, "model": "attendance_analytics", "stream": True, "payload": {"records": []}})
+    assert len(responses) == 1
+    assert responses[0]["id"] == 6 and responses[0]["success"] is True
+
+
+def test_a_failing_stream_ends_with_an_error_response(monkeypatch):
+    def stream_request(payload):
+        yield {"type": "envelope"}
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(worker.chatbot, "stream_request", stream_request)
+    responses = serve({"id": 8, "model": "chatbot", "stream": True, "payload": {}})
+    assert responses == [
+        {"id": 8, "event": {"type": "envelope"}},
+        {"id": 8, "success": False, "message": "model crashed"}
+    ]
+
+
+def test_each_streamed_line_is_flushed_as_it_is_written():
+    class Writer(io.StringIO):
+        flushed = []
+
+        def flush(self):
+            self.flushed.append(self.getvalue().count("\n"))
+
+    writer = Writer()
+    request = {"id": 9, "model": "chatbot", "stream": True, "payload": {"message": "How many leave days do I have?"}}
+    worker.serve_stream(io.StringIO(json.dumps(request) + "\n"), writer)
+    lines = writer.getvalue().count("\n")
+    assert lines > 2
+    assert writer.flushed == list(range(1, lines + 1))
@@ -7,108 +7,198 @@ Uses statistical analysis and anomaly detection
 import sys
 import json
 import os
-import numpy as np
-from datetime import datetime, timedelta
+import re
+from datetime import datetime
+from operator import itemgetter
 import random
 
-def detect_patterns(attendance_records):
-    """Detect patterns in attendance data"""
-    # In production, use actual statistical analysis
-    # Here we use a simple mock implementation
+from batch import batch_source, run_batch
+from instrumentation import stage, track
+from json_input import is_input_reference, read_json_records
+
+# Record fields the analytics read; everything else is dropped on load
+ATTENDANCE_FIELDS = ["employeeId", "date", "status", "checkIn", "checkOut", "overtime"]
+
+# Status strings as small integer codes; unknown or missing statuses are 0
+STATUS_CODES = {"present": 1, "late": 2, "absent": 3, "half_day": 4, "work_from_home": 5}
+PRESENT_STATUSES = ["present", "late", "work_from_home"]
+
+# Reported when no anomaly is detected
+POSSIBLE_ANOMALIES = [
+    "Frequent late arrivals on Mondays",
+    "Extended lunch breaks detected",
+    "Irregular work hours pattern",
+    "Frequent early departures on Fridays",
+    "Inconsistent working hours"
+]
+
+# Org-wide analyses of at least this many employees are sharded across
+# a process pool
+ORG_SHARD_EMPLOYEES = 50000
+SHARDS_PER_WORKER = 4
+
+# ISO timestamps parse_timestamps hands to NumPy, one per line: year 0001
+# on, ASCII digits only, and an offset fromisoformat would accept
+_TIMESTAMP = re.compile(
+    r'^((?!0000)[0-9]{4}-[0-9]{2}-[0-9]{2}(?:T[0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]+)?)?)'
+    r'(Z|[+-](?:[01][0-9]|2[0-3]):[0-5][0-9])?$',
+    re.MULTILINE
+)
+
+class AttendanceColumns:
+    """Attendance records as parallel NumPy arrays, parsed once
+
+    Timestamps are kept as local wall-clock datetime64[s] plus the UTC
+    offset in seconds, matching what datetime.fromisoformat gives: hours
+    and weekdays read the local time, durations the absolute one.
+    """
+
+    def __init__(self, records):
+        import numpy as np
+        
+        count = len(records)
+        self.count = count
+        self.status = np.fromiter(
+            (STATUS_CODES.get(record.get('status'), 0) for record in records), dtype=np.int8, count=count
+        )
+        # A null or missing overtime is none, not NaN (which is not valid JSON)
+        self.overtime = np.fromiter((record.get('overtime') or 0 for record in records), dtype=np.float64, count=count)
+        self.date, self.date_offset = parse_timestamps([record.get('date') for record in records])
+        self.check_in, self.check_in_offset = parse_timestamps([record.get('checkIn') for record in records])
+        # Check-outs are only read next to a check-in; without one they are
+        # left unparsed (NaT), however they are written
+        self.check_out, self.check_out_offset = parse_timestamps(
+            [record.get('checkOut') if record.get('checkIn') else None for record in records]
+        )
+
+    def has(self, status):
+        """Boolean mask of records with the given status"""
+        return self.status == STATUS_CODES[status]
+
+def attendance_columns(records):
+    """Columnar view of records; columns pass through unchanged"""
+    return records if isinstance(records, AttendanceColumns) else AttendanceColumns(records)
+
+def parse_timestamps(values):
+    """(local datetime64[s], UTC offset seconds) arrays for ISO timestamps
+
+    Missing values become NaT. Dates and "YYYY-MM-DDTHH:MM:SS" timestamps
+    with an optional fraction and "Z"/"+HH:MM" suffix are parsed by NumPy
+    in one call; if any value is in another form or out of range, all of
+    them go through fromisoformat, so results and errors are the same as
+    parsing each value with it.
+    """
+    import numpy as np
     
-    # Count late arrivals
-    late_arrivals = sum(1 for record in attendance_records if record.get('status') == 'late')
+    local = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[s]')
+    offset = np.zeros(len(values), dtype=np.int64)
+    present = [i for i, value in enumerate(values) if value]
+    if not present:
+        return local, offset
     
-    # Count early departures (simplified)
-    early_departures = 0
-    for record in attendance_records:
-        if record.get('checkOut') and record.get('checkIn'):
-            check_in = datetime.fromisoformat(record.get('checkIn').replace('Z', '+00:00'))
-            check_out = datetime.fromisoformat(record.get('checkOut').replace('Z', '+00:00'))
-            hours_worked = (check_out - check_in).total_seconds() / 3600
-            if hours_worked < 8 and record.get('status') != 'half_day':
-                early_departures += 1
+    # One value per line, and every line has to match
+    text = '\n'.join(values[i] for i in present)
+    found = _TIMESTAMP.findall(text)
+    if len(found) != len(present) or text.count('\n') != len(present) - 1:
+        return _parse_timestamps_slow(values)
+    try:
+        # NumPy rejects the same out-of-range fields (February 30, hour 24)
+        parsed = np.array(list(map(itemgetter(0), found)), dtype='datetime64[us]')
+    except ValueError:
+        return _parse_timestamps_slow(values)
+    local[present] = parsed.astype('datetime64[s]')
     
-    # Calculate overtime hours
-    overtime_hours = sum(record.get('overtime', 0) for record in attendance_records)
+    # A handful of distinct offsets; "Z" and naive timestamps are 0
+    zones = list(map(itemgetter(1), found))
+    seconds = {zone: _offset_seconds(zone) for zone in set(zones)}
+    offset[present] = np.fromiter(map(seconds.__getitem__, zones), dtype=np.int64, count=len(zones))
+    return local, offset
+
+def _offset_seconds(zone):
+    if zone in ('', 'Z'):
+        return 0
+    return (-1 if zone[0] == '-' else 1) * (int(zone[1:3]) * 3600 + int(zone[4:6]) * 60)
+
+def _parse_timestamps_slow(values):
+    import numpy as np
     
-    # Count absences
-    absenteeism = sum(1 for record in attendance_records if record.get('status') == 'absent')
+    local = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[s]')
+    offset = np.zeros(len(values), dtype=np.int64)
+    for i, value in enumerate(values):
+        if value:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            local[i] = np.datetime64(parsed.replace(tzinfo=None), 's')
+            if parsed.utcoffset() is not None:
+                offset[i] = int(parsed.utcoffset().total_seconds())
+    return local, offset
+
+def _early_departures(columns):
+    """Mask of records under 8 hours between check-in and check-out, in absolute time"""
+    import numpy as np
     
-    return {
-        "lateArrivals": late_arrivals,
-        "earlyDepartures": early_departures,
-        "overtimeHours": overtime_hours,
-        "absenteeism": absenteeism
-    }
+    both = ~np.isnat(columns.check_in) & ~np.isnat(columns.check_out)
+    seconds_worked = (
+        (columns.check_out - columns.check_in).astype(np.int64)
+        - (columns.check_out_offset - columns.check_in_offset)
+    )
+    return both & (seconds_worked < 8 * 3600) & ~columns.has('half_day')
 
-def detect_anomalies(attendance_records):
-    """Detect anomalies in attendance patterns"""
-    # In production, use actual anomaly detection algorithms
-    # Here we generate some plausible anomalies
+def _late_pairs(columns):
+    """Mask of late records following a late record (record order)"""
+    import numpy as np
     
-    anomalies = []
+    late = columns.has('late')
+    pairs = np.zeros(columns.count, dtype=bool)
+    pairs[1:] = late[1:] & late[:-1]
+    return pairs
+
+def _check_in_minutes(columns):
+    """(has check-in mask, local check-in minute of the day)"""
+    import numpy as np
     
-    # Check for consecutive late arrivals
-    consecutive_late = 0
-    for i in range(1, len(attendance_records)):
-        if attendance_records[i].get('status') == 'late' and attendance_records[i-1].get('status') == 'late':
-            consecutive_late += 1
+    timed = ~np.isnat(columns.check_in)
+    minutes = (columns.check_in - columns.check_in.astype('datetime64[D]')).astype('timedelta64[m]').astype(np.int64)
+    return timed, minutes
+
+def _monday_absences(columns):
+    """Mask of absences on Mondays; 1970-01-01 was a Thursday (weekday 3)"""
+    import numpy as np
+    
+    weekdays = (columns.date.astype('datetime64[D]').astype(np.int64) + 3) % 7
+    return ~np.isnat(columns.date) & (weekdays == 0) & columns.has('absent')
+
+def _overtime_hours(total):
+    """Overtime total as reported: an int when whole"""
+    total = float(total)
+    return int(total) if total.is_integer() else total
+
+def _anomaly_messages(consecutive_late, check_in_std, monday_absences):
+    """Anomaly descriptions from the detected counts; check_in_std is None without check-ins"""
+    anomalies = []
     
     if consecutive_late > 1:
         anomalies.append(f"Detected {consecutive_late} consecutive late arrivals")
     
-    # Check for irregular check-in times
-    check_in_times = []
-    for record in attendance_records:
-        if record.get('checkIn'):
-            check_in = datetime.fromisoformat(record.get('checkIn').replace('Z', '+00:00'))
-            check_in_times.append(check_in.hour * 60 + check_in.minute)
-    
-    if check_in_times:
-        std_dev = np.std(check_in_times)
-        if std_dev > 60:  # More than 1 hour standard deviation
+    if check_in_std is not None:
+        if check_in_std > 60:  # More than 1 hour standard deviation
             anomalies.append("Highly irregular check-in times detected")
-        elif std_dev > 30:  # More than 30 minutes standard deviation
+        elif check_in_std > 30:  # More than 30 minutes standard deviation
             anomalies.append("Moderately irregular check-in times detected")
     
-    # Check for Monday absences
-    monday_absences = 0
-    for record in attendance_records:
-        if record.get('date'):
-            date = datetime.fromisoformat(record.get('date').replace('Z', '+00:00'))
-            if date.weekday() == 0 and record.get('status') == 'absent':
-                monday_absences += 1
-    
     if monday_absences > 1:
         anomalies.append(f"Detected {monday_absences} Monday absences")
     
     # Add some random plausible anomalies if none detected
     if not anomalies:
-        possible_anomalies = [
-            "Frequent late arrivals on Mondays",
-            "Extended lunch breaks detected",
-            "Irregular work hours pattern",
-            "Frequent early departures on Fridays",
-            "Inconsistent working hours"
-        ]
-        anomalies = [random.choice(possible_anomalies)]
+        anomalies = [random.choice(POSSIBLE_ANOMALIES)]
     
     return anomalies
 
-def predict_attendance(attendance_records):
-    """Predict future attendance patterns"""
-    # In production, use time series forecasting
-    # Here we use a simple prediction based on recent patterns
-    
+def _predictions(present_days, total_days, patterns):
+    """Attendance forecast and risk score from present-day counts and patterns"""
     # Calculate average attendance rate
-    present_days = sum(1 for record in attendance_records if record.get('status') in ['present', 'late', 'work_from_home'])
-    total_days = len(attendance_records)
     attendance_rate = (present_days / total_days) * 100 if total_days > 0 else 0
     
-    # Calculate risk score based on patterns
-    patterns = detect_patterns(attendance_records)
-    
     risk_factors = [
         patterns['lateArrivals'] > 5,  # Many late arrivals
         patterns['earlyDepartures'] > 5,  # Many early departures
@@ -126,8 +216,295 @@ def predict_attendance(attendance_records):
         "riskScore": round(risk_score, 1)
     }
 
+def _present_days(columns):
+    """Mask of records counted as attended"""
+    import numpy as np
+    
+    return np.isin(columns.status, [STATUS_CODES[status] for status in PRESENT_STATUSES])
+
+def detect_patterns(attendance_records):
+    """Detect patterns in attendance data"""
+    # In production, use actual statistical analysis
+    # Here we use a simple mock implementation
+    import numpy as np
+    
+    columns = attendance_columns(attendance_records)
+    
+    # Count late arrivals
+    late_arrivals = int(np.count_nonzero(columns.has('late')))
+    
+    # Count early departures (simplified)
+    early_departures = int(np.count_nonzero(_early_departures(columns)))
+    
+    # Calculate overtime hours
+    overtime_hours = _overtime_hours(columns.overtime.sum())
+    
+    # Count absences
+    absenteeism = int(np.count_nonzero(columns.has('absent')))
+    
+    return {
+        "lateArrivals": late_arrivals,
+        "earlyDepartures": early_departures,
+        "overtimeHours": overtime_hours,
+        "absenteeism": absenteeism
+    }
+
+def detect_anomalies(attendance_records):
+    """Detect anomalies in attendance patterns"""
+    # In production, use actual anomaly detection algorithms
+    # Here we generate some plausible anomalies
+    import numpy as np
+    
+    columns = attendance_columns(attendance_records)
+    
+    # Check for consecutive late arrivals
+    consecutive_late = int(np.count_nonzero(_late_pairs(columns)))
+    
+    # Check for irregular check-in times
+    timed, minutes = _check_in_minutes(columns)
+    std_dev = float(np.std(minutes[timed])) if timed.any() else None
+    
+    # Check for Monday absences
+    monday_absences = int(np.count_nonzero(_monday_absences(columns)))
+    
+    return _anomaly_messages(consecutive_late, std_dev, monday_absences)
+
+def predict_attendance(attendance_records, patterns=None):
+    """Predict future attendance patterns"""
+    # In production, use time series forecasting
+    # Here we use a simple prediction based on recent patterns
+    import numpy as np
+    
+    columns = attendance_columns(attendance_records)
+    present_days = int(np.count_nonzero(_present_days(columns)))
+    
+    # Calculate risk score based on patterns, reusing them when given
+    if patterns is None:
+        patterns = detect_patterns(columns)
+    
+    return _predictions(present_days, columns.count, patterns)
+
+def analyze_attendance(attendance_records):
+    """Run pattern detection, anomaly detection and prediction on records"""
+    with track('attendance_analytics') as tracker:
+        # Parse every record once into columns the analyses share
+        with stage('columns'):
+            columns = attendance_columns(attendance_records)
+        
+        # Detect patterns
+        with stage('patterns'):
+            patterns = detect_patterns(columns)
+        
+        # Detect anomalies
+        with stage('anomalies'):
+            anomalies = detect_anomalies(columns)
+        
+        # Predict future attendance
+        with stage('predictions'):
+            predictions = predict_attendance(columns, patterns)
+        
+        return {
+            "patterns": patterns,
+            "anomalies": anomalies,
+            "predictions": predictions,
+            "timings": tracker.timings()
+        }
+
+def employee_groups(records):
+    """(record order grouping records by employeeId, start of each group)
+
+    The sort is stable, so each employee's records keep their order.
+    Records without an employeeId form one group.
+    """
+    import numpy as np
+    
+    # Integer codes in first-seen order, then each code's rank among the
+    # sorted distinct ids: only the distinct ids are sorted as strings
+    codes = {}
+    keys = np.fromiter(
+        (codes.setdefault('' if record.get('employeeId') is None else str(record['employeeId']), len(codes)) for record in records),
+        dtype=np.int64, count=len(records)
+    )
+    ranks = np.empty(len(codes), dtype=np.int64)
+    ranks[np.argsort(np.array(list(codes), dtype=str), kind='stable')] = np.arange(len(codes))
+    keys = ranks[keys]
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else np.zeros(0, dtype=np.int64)
+    return order, starts
+
+def _group_sums(values, starts):
+    """Per-group sums of a column, groups given by their start index"""
+    import numpy as np
+    
+    return np.add.reduceat(values.astype(np.int64) if values.dtype == bool else values, starts)
+
+def _analyze_groups(records, order, starts):
+    """Patterns, anomalies and predictions per employee group"""
+    import numpy as np
+    
+    if not starts.size:
+        return []
+    
+    employee_ids = [records[order[start]].get('employeeId') for start in starts]
+    with stage('columns'):
+        columns = AttendanceColumns([records[i] for i in order])
+    sizes = np.diff(np.append(starts, columns.count))
+    
+    # Every per-employee figure is a segment sum over the shared columns
+    with stage('patterns'):
+        late = _group_sums(columns.has('late'), starts)
+        early = _group_sums(_early_departures(columns), starts)
+        overtime = _group_sums(columns.overtime, starts)
+        absent = _group_sums(columns.has('absent'), starts)
+        present = _group_sums(_present_days(columns), starts)
+    
+    with stage('anomalies'):
+        # A late pair spanning two employees is not consecutive
+        pairs = _late_pairs(columns)
+        pairs[starts] = False
+        consecutive = _group_sums(pairs, starts)
+        
+        # Two-pass check-in standard deviation, as np.std computes it
+        timed, minutes = _check_in_minutes(columns)
+        timed_counts = _group_sums(timed, starts)
+        divisors = np.maximum(timed_counts, 1)
+        means = _group_sums(np.where(timed, minutes, 0), starts) / divisors
+        deviations = np.where(timed, minutes - np.repeat(means, sizes), 0.0) ** 2
+        std_devs = np.sqrt(_group_sums(deviations, starts) / divisors)
+        
+        mondays = _group_sums(_monday_absences(columns), starts)
+    
+    employees = []
+    with stage('predictions'):
+        for i, employee_id in enumerate(employee_ids):
+            patterns = {
+                "lateArrivals": int(late[i]),
+                "earlyDepartures": int(early[i]),
+                "overtimeHours": _overtime_hours(overtime[i]),
+                "absenteeism": int(absent[i])
+            }
+            employees.append({
+                "employeeId": employee_id,
+                "patterns": patterns,
+                "anomalies": _anomaly_messages(
+                    int(consecutive[i]), float(std_devs[i]) if timed_counts[i] else None, int(mondays[i])
+                ),
+                "predictions": _predictions(int(present[i]), int(sizes[i]), patterns)
+            })
+    return employees
+
+def analyze_employees(records):
+    """Per-employee analytics of records for many employees, in employeeId order"""
+    return _analyze_groups(records, *employee_groups(records))
+
+def _analyze_sharded(records, order, starts, workers):
+    """Analyze contiguous runs of employees in a process pool"""
+    # Imported here: multiprocessing alone would double the script's
+    # cold-start time for every other invocation
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
+    
+    # Shards of roughly equal record counts, cut at employee boundaries
+    bounds = np.append(starts, len(order))
+    targets = np.linspace(0, len(order), workers * SHARDS_PER_WORKER + 1)
+    cuts = np.unique(bounds[np.searchsorted(bounds, targets)])
+    shards = ([records[i] for i in order[start:end]] for start, end in zip(cuts[:-1], cuts[1:]))
+    
+    employees = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard in executor.map(analyze_employees, shards):
+            employees.extend(shard)
+    return employees
+
+def _in_daemon_process():
+    """Whether this is a pool worker, which may not start processes of its own"""
+    import multiprocessing
+    
+    return multiprocessing.current_process().daemon
+
+def analyze_organization(attendance_records, workers=None):
+    """Patterns, anomalies and predictions for every employee at once
+
+    Records carry an employeeId and are grouped with one sort instead of
+    running one analysis (or process) per employee. With
+    ORG_SHARD_EMPLOYEES or more employees the groups are sharded across
+    `workers` processes (default: one per CPU), except inside a pool
+    worker such as the inference server's, where they run in process.
+    """
+    workers = workers or os.cpu_count() or 1
+    with track('attendance_analytics') as tracker:
+        with stage('grouping'):
+            order, starts = employee_groups(attendance_records)
+        
+        if workers > 1 and len(starts) >= ORG_SHARD_EMPLOYEES and not _in_daemon_process():
+            with stage('shards'):
+                employees = _analyze_sharded(attendance_records, order, starts, workers)
+        else:
+            employees = _analyze_groups(attendance_records, order, starts)
+        
+        return {
+            "employees": employees,
+            "summary": {
+                "employees": len(employees),
+                "records": len(attendance_records)
+            },
+            "timings": tracker.timings()
+        }
+
+def handle_request(payload):
+    """Handle an attendance analytics request from the AI worker
+
+    {"records", "byEmployee": true} analyzes records of many employees,
+    grouped by their employeeId.
+    """
+    if payload.get('byEmployee'):
+        return analyze_organization(payload.get('records', []), payload.get('workers'))
+    
+    return analyze_attendance(payload.get('records', []))
+
+def organization_arguments(argv):
+    """Options of the --by-employee org-wide mode"""
+    # Imported here: only this mode needs argument parsing
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Analyze attendance of every employee in the records")
+    parser.add_argument('records', help="Records JSON, '-' for stdin or '@path'")
+    parser.add_argument('--by-employee', action='store_true', required=True)
+    parser.add_argument('--workers', type=int, default=None, help="Processes for %d+ employees (default: CPU count)" % ORG_SHARD_EMPLOYEES)
+    return parser.parse_args(argv)
+
+def main_organization(argv):
+    """Print per-employee analytics for an organization's records"""
+    args = organization_arguments(argv)
+    try:
+        if is_input_reference(args.records):
+            attendance_records = read_json_records(args.records, ATTENDANCE_FIELDS)
+        else:
+            attendance_records = json.loads(args.records)
+        
+        print(json.dumps(analyze_organization(attendance_records, args.workers)))
+        
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "message": str(e)
+        }))
+        sys.exit(1)
+
 def main():
     """Main function to analyze attendance patterns"""
+    # JSONL batch mode: one request per line from stdin or a file
+    source = batch_source(sys.argv)
+    if source:
+        run_batch(handle_request, source)
+        return
+    
+    # Org-wide mode: records of many employees, analyzed per employee
+    if '--by-employee' in sys.argv[1:]:
+        main_organization(sys.argv[1:])
+        return
+    
     if len(sys.argv) < 2:
         print(json.dumps({
             "success": False,
@@ -136,24 +513,15 @@ def main():
         sys.exit(1)
     
     try:
-        # Parse attendance records
-        attendance_records = json.loads(sys.argv[1])
-        
-        # Detect patterns
-        patterns = detect_patterns(attendance_records)
-        
-        # Detect anomalies
-        anomalies = detect_anomalies(attendance_records)
-        
-        # Predict future attendance
-        predictions = predict_attendance(attendance_records)
+        # Parse attendance records from argv JSON, or stream them from
+        # stdin ('-') or a file ('@path') to avoid ARG_MAX limits
+        if is_input_reference(sys.argv[1]):
+            attendance_records = read_json_records(sys.argv[1], ATTENDANCE_FIELDS)
+        else:
+            attendance_records = json.loads(sys.argv[1])
         
         # Return result
-        result = {
-            "patterns": patterns,
-            "anomalies": anomalies,
-            "predictions": predictions
-        }
+        result = analyze_attendance(attendance_records)
         
         print(json.dumps(result))
         
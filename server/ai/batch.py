@@ -0,0 +1,64 @@
+"""
+VibhoHCM AI Batch Mode - JSONL batch runner shared by the AI scripts
+Reads one request per line and writes one result per line as it goes
+"""
+
+import sys
+import json
+
+def open_source(source):
+    """Open a JSONL source, where '-' or None means stdin"""
+    if source in (None, '-'):
+        return sys.stdin
+    return open(source, 'r', encoding='utf-8')
+
+def run_batch(handle_request, source=None, output=None):
+    """Run handle_request over every JSONL request in source
+
+    Each output line carries the request's optional "id" so results can be
+    matched back to inputs; a failing line is reported and does not stop
+    the batch.
+    """
+    output = output or sys.stdout
+    stream = open_source(source)
+    processed = failed = 0
+
+    try:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            request_id = None
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Request must be a JSON object")
+                request_id = request.get('id', line_number)
+                response = {
+                    "id": request_id,
+                    "success": True,
+                    "result": handle_request(request)
+                }
+            except Exception as e:
+                failed += 1
+                response = {
+                    "id": request_id if request_id is not None else line_number,
+                    "success": False,
+                    "message": str(e)
+                }
+
+            processed += 1
+            output.write(json.dumps(response) + "\n")
+            output.flush()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    return {"processed": processed, "failed": failed}
+
+def batch_source(argv):
+    """Return the batch source if argv requests batch mode, else False"""
+    if len(argv) > 1 and argv[1] == '--batch':
+        return argv[2] if len(argv) > 2 else '-'
+    return False
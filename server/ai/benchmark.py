@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+VibhoHCM AI Benchmarks - Microbenchmarks for the hot model functions
+Uses seeded synthetic data and reports throughput and latency percentiles
+as JSON so runs can be compared against a saved baseline
+"""
+
+import sys
+import json
+import argparse
+import platform
+import random
+import time
+from datetime import datetime, timedelta
+
+import attendance_analytics
+import chatbot
+import document_processor
+import insights_generator
+import payroll_prediction
+import resume_parser
+
+FIRST_NAMES = ["Aarav", "Priya", "John", "Maria", "Wei", "Fatima", "Carlos", "Emily", "Kenji", "Olivia"]
+LAST_NAMES = ["Sharma", "Patel", "Smith", "Garcia", "Chen", "Khan", "Lopez", "Brown", "Tanaka", "Wilson"]
+COMPANIES = ["Acme Widgets Inc", "Globex Corporation", "Initech Solutions LLC", "Umbrella Health Ltd"]
+SKILL_WORDS = ["Python", "React", "Node.js", "SQL", "AWS", "Docker", "Kubernetes", "Java", "Agile",
+               "Machine Learning", "Power BI", "TypeScript", "GraphQL", "Scrum", "Excel", "Tableau"]
+FILLER_WORDS = ["the", "team", "delivered", "project", "policy", "agreement", "payment", "report",
+                "analysis", "with", "and", "for", "customer", "employee", "quarterly", "review",
+                "good", "issue", "process", "terms", "summary", "request", "regards", "total"]
+STATUSES = ["present"] * 14 + ["late"] * 3 + ["absent", "half_day", "work_from_home"]
+
+# Dates in generated data are relative to a fixed day so runs are reproducible
+BASE_DATE = datetime(2024, 1, 1)
+
+# Size presets per profile
+PROFILES = {
+    "quick": {"documents": [1024, 100 * 1024], "attendance": [30, 1000], "resumes": [300, 1500]},
+    "standard": {"documents": [1024, 100 * 1024, 1024 * 1024], "attendance": [30, 1000, 10000], "resumes": [300, 1500, 5000]},
+    "full": {"documents": [1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024], "attendance": [30, 1000, 10000, 100000], "resumes": [300, 1500, 5000]}
+}
+
+def _person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def synthetic_sentence(rng):
+    """Build one sentence mixing filler words with entity-like tokens"""
+    words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(6, 14))]
+    roll = rng.random()
+    if roll < 0.15:
+        words.append(f"on {rng.randint(1, 28)}/{rng.randint(1, 12)}/2024")
+    elif roll < 0.3:
+        words.append(f"for ${rng.randint(100, 99999):,}.{rng.randint(0, 99):02d}")
+    elif roll < 0.4:
+        words.append(f"with {rng.choice(COMPANIES)}")
+    elif roll < 0.55:
+        words.append(f"by {_person(rng)}")
+    return " ".join(words).capitalize() + "."
+
+def synthetic_resume(rng, words=600):
+    """Generate a resume with skills, education and experience mentions"""
+    lines = [
+        _person(rng),
+        f"{rng.randint(1, 15)} years of experience in software development",
+        "Skills: " + ", ".join(rng.sample(SKILL_WORDS, rng.randint(3, 8))),
+        f"{rng.choice(['Bachelor', 'Master'])} of Science in Computer Science",
+        f"{rng.choice(['Stanford', 'Anna', 'Delhi', 'Texas'])} University"
+    ]
+    count = sum(len(line.split()) for line in lines)
+    while count < words:
+        sentence = synthetic_sentence(rng)
+        if rng.random() < 0.2:
+            sentence += " Used " + rng.choice(SKILL_WORDS) + " daily."
+        lines.append(sentence)
+        count += len(sentence.split())
+    return "\n".join(lines)
+
+def synthetic_document(rng, size):
+    """Generate document text of roughly size bytes"""
+    parts = ["Dear " + _person(rng) + ",", "This agreement is made between the parties."]
+    length = sum(len(part) + 1 for part in parts)
+    while length < size:
+        sentence = synthetic_sentence(rng)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    parts.append("Sincerely, " + _person(rng))
+    return " ".join(parts)[:size]
+
+def synthetic_attendance(rng, count, start=datetime(2020, 1, 6)):
+    """Generate count daily attendance records for one employee"""
+    records = []
+    for i in range(count):
+        day = start + timedelta(days=i)
+        status = rng.choice(STATUSES)
+        record = {"date": day.strftime("%Y-%m-%dT00:00:00Z"), "status": status}
+        if status != 'absent':
+            check_in = day + timedelta(hours=9, minutes=rng.randint(-20, 75 if status == 'late' else 15))
+            check_out = check_in + timedelta(hours=rng.uniform(4 if status == 'half_day' else 7, 10))
+            record["checkIn"] = check_in.strftime("%Y-%m-%dT%H:%M:%SZ")
+            record["checkOut"] = check_out.strftime("%Y-%m-%dT%H:%M:%SZ")
+            record["overtime"] = round(max(0.0, (check_out - check_in).total_seconds() / 3600 - 8), 2)
+        records.append(record)
+    return records
+
+def synthetic_payroll_history(rng, months=24):
+    """Generate monthly payroll totals"""
+    start = datetime(2022, 1, 1)
+    return [
+        {"date": (start + timedelta(days=30 * i)).strftime("%Y-%m-%d"), "value": round(2000000 * (1 + 0.01 * i) * rng.uniform(0.97, 1.03))}
+        for i in range(months)
+    ]
+
+def synthetic_performance_data(rng, reviews=8, goals=12, skills=20, start=BASE_DATE):
+    """Generate performance insight input for one employee"""
+    return {
+        "employeeId": "EMP-BENCH",
+        "reviews": [{"rating": rng.randint(1, 5)} for _ in range(reviews)],
+        "goals": [
+            {
+                "status": rng.choice(["completed", "in_progress", "not_started"]),
+                "progress": rng.randint(0, 100),
+                "targetDate": (start + timedelta(days=rng.randint(1, 90))).isoformat()
+            }
+            for _ in range(goals)
+        ],
+        "skills": [
+            {"skillName": rng.choice(SKILL_WORDS), "currentLevel": rng.randint(1, 5), "targetLevel": rng.randint(1, 5)}
+            for _ in range(skills)
+        ]
+    }
+
+def synthetic_recruitment_data(rng, postings=50, candidates=2000):
+    """Generate recruitment insight input"""
+    return {
+        "jobPostings": [{"title": f"Role {i}"} for i in range(postings)],
+        "candidates": [{"aiScore": rng.randint(40, 100)} for _ in range(candidates)]
+    }
+
+def _shared_input(seed, key, build):
+    """Build a case input on first use, from its own seeded generator
+
+    Every input gets a generator seeded from (seed, key), so the data for
+    a case is the same whether or not other cases are built; inputs
+    shared by several cases are built once.
+    """
+    built = []
+
+    def load():
+        if not built:
+            built.append(build(random.Random(f"{seed}:{key}")))
+        return built[0]
+
+    return load
+
+def build_cases(seed, profile):
+    """Build (name, size label, function, load) benchmark cases
+
+    load() builds the case's input on demand and returns (args, units);
+    units are bytes for text inputs and records/items for structured
+    inputs. Nothing is generated for cases that are filtered out.
+    """
+    sizes = PROFILES[profile]
+    cases = []
+
+    def text_args(text):
+        return (text,), len(text)
+
+    for words in sizes["resumes"]:
+        resume = _shared_input(seed, f"resume:{words}", lambda rng, words=words: synthetic_resume(rng, words))
+        load = lambda resume=resume: text_args(resume())
+        label = f"{words}w"
+        cases.append(("resume_parser.extract_skills", label, resume_parser.extract_skills, load))
+        cases.append(("resume_parser.extract_education", label, resume_parser.extract_education, load))
+
+    for size in sizes["documents"]:
+        document = _shared_input(seed, f"document:{size}", lambda rng, size=size: synthetic_document(rng, size))
+        load = lambda document=document: text_args(document())
+        label = f"{size // 1024}KB"
+        cases.append(("document_processor.classify_document", label, document_processor.classify_document, load))
+        cases.append(("document_processor.extract_entities", label, document_processor.extract_entities, load))
+        cases.append(("chatbot.extract_entities", label, chatbot.extract_entities, load))
+
+    for count in sizes["attendance"]:
+        records = _shared_input(seed, f"attendance:{count}", lambda rng, count=count: synthetic_attendance(rng, count))
+        label = f"{count}rec"
+        cases.append(("attendance_analytics.detect_patterns", label, attendance_analytics.detect_patterns,
+                      lambda records=records, count=count: ((records(),), count)))
+        cases.append(("attendance_analytics.detect_anomalies", label, attendance_analytics.detect_anomalies,
+                      lambda records=records, count=count: ((records(),), count)))
+        cases.append(("insights_generator.generate_attendance_insights", label, insights_generator.generate_attendance_insights,
+                      lambda records=records, count=count: (({"attendanceRecords": records()},), count)))
+
+    history = _shared_input(seed, "payroll", synthetic_payroll_history)
+    cases.append(("payroll_prediction.forecast_payroll", "24mo", payroll_prediction.forecast_payroll,
+                  lambda: ((history(),), len(history()))))
+
+    performance = _shared_input(seed, "performance", synthetic_performance_data)
+    cases.append(("insights_generator.generate_performance_insights", "default", insights_generator.generate_performance_insights,
+                  lambda: ((performance(),), 0)))
+
+    recruitment = _shared_input(seed, "recruitment", synthetic_recruitment_data)
+    cases.append(("insights_generator.generate_recruitment_insights", "2000cand", insights_generator.generate_recruitment_insights,
+                  lambda: ((recruitment(),), len(recruitment()["candidates"]))))
+
+    return cases
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def run_case(func, args, min_time, max_iterations):
+    """Time func(*args) repeatedly and summarize the latencies"""
+    func(*args)  # warm-up
+
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < max_iterations:
+        t0 = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - t0)
+        if time.perf_counter() - started >= min_time and len(latencies) >= 3:
+            break
+
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        "iterations": len(latencies),
+        "throughput": round(len(latencies) / total, 3) if total > 0 else None,
+        "meanMs": round(total / len(latencies) * 1000, 4),
+        "p50Ms": round(percentile(latencies, 50) * 1000, 4),
+        "p99Ms": round(percentile(latencies, 99) * 1000, 4)
+    }
+
+def compare(results, baseline, threshold):
+    """List cases whose p50 regressed by more than threshold vs baseline"""
+    previous = {(entry["name"], entry["size"]): entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry["name"], entry["size"]))
+        if not before or not before.get("p50Ms"):
+            continue
+        change = (entry["p50Ms"] - before["p50Ms"]) / before["p50Ms"]
+        if change > threshold:
+            regressions.append({
+                "name": entry["name"],
+                "size": entry["size"],
+                "baselineP50Ms": before["p50Ms"],
+                "p50Ms": entry["p50Ms"],
+                "change": round(change, 3)
+            })
+    return regressions
+
+def main():
+    """Main function to run the benchmark suite"""
+    parser = argparse.ArgumentParser(description="VibhoHCM AI microbenchmarks")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='standard')
+    parser.add_argument('--only', help="Only run cases whose name contains this string")
+    parser.add_argument('--min-time', type=float, default=0.5, help="Minimum seconds to spend per case")
+    parser.add_argument('--max-iterations', type=int, default=1000)
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--baseline', help="Previous report to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed p50 slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Data generators are seeded per input; this seeds the module-level
+    # randomness the models use
+    random.seed(args.seed)
+
+    results = []
+    for name, size, func, load in build_cases(args.seed, args.profile):
+        if args.only and args.only not in name:
+            continue
+        func_args, units = load()
+        entry = {"name": name, "size": size, "units": units}
+        entry.update(run_case(func, func_args, args.min_time, args.max_iterations))
+        if units and entry["throughput"]:
+            entry["unitsPerSecond"] = round(units * entry["throughput"], 1)
+        results.append(entry)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "profile": args.profile,
+        "results": results
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
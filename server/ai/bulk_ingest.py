@@ -0,0 +1,152 @@
+"""
+VibhoHCM AI Bulk Ingestion - Parallel file ingestion shared by the AI scripts
+Walks a directory or a manifest, parses files across a process pool with a
+bounded number of files in flight, streams one JSONL result per file as it
+finishes and checkpoints progress so an interrupted import can resume
+"""
+
+import sys
+import json
+import os
+import argparse
+
+def iter_paths(source, extensions=None):
+    """Yield file paths from a directory tree or a manifest file
+
+    A manifest lists one path per line (or JSONL objects with a "path");
+    relative paths are resolved against the manifest's directory.
+    """
+    if os.path.isdir(source):
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if extensions is None or os.path.splitext(filename)[1].lower() in extensions:
+                    yield os.path.abspath(os.path.join(dirpath, filename))
+        return
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r', encoding='utf-8') as manifest:
+        for line in manifest:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = json.loads(line)['path'] if line.startswith('{') else line
+            yield os.path.abspath(os.path.join(base, path))
+
+def load_checkpoint(path):
+    """Paths already ingested successfully according to the checkpoint"""
+    done = set()
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn last line from an interrupted run
+                continue
+            if entry.get('success'):
+                done.add(entry['path'])
+    return done
+
+def _parse(parse_file, path):
+    try:
+        return {"id": path, "success": True, "result": parse_file(path)}
+    except Exception as e:
+        return {"id": path, "success": False, "message": str(e)}
+
+def run_ingest(parse_file, source, output=None, checkpoint=None, workers=None, max_in_flight=None, extensions=None):
+    """Parse every file under source with parse_file across a process pool
+
+    parse_file must be a module-level function so it can be sent to the
+    worker processes. Failed files are reported but not checkpointed, so
+    a resumed run retries them.
+    """
+    # Imported here: multiprocessing alone would double the scripts'
+    # cold-start time for every non-ingest invocation
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    output = output or sys.stdout
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    done = load_checkpoint(checkpoint)
+    summary = {"processed": 0, "failed": 0, "skipped": 0}
+
+    checkpoint_file = open(checkpoint, 'a', encoding='utf-8') if checkpoint else None
+    executor = ProcessPoolExecutor(max_workers=workers)
+    in_flight = set()
+
+    def drain(block_until):
+        nonlocal in_flight
+        finished, in_flight = wait(in_flight, return_when=block_until)
+        for future in finished:
+            response = future.result()
+            summary["processed"] += 1
+            if not response["success"]:
+                summary["failed"] += 1
+            output.write(json.dumps(response) + "\n")
+            output.flush()
+            if checkpoint_file:
+                checkpoint_file.write(json.dumps({"path": response["id"], "success": response["success"]}) + "\n")
+                checkpoint_file.flush()
+
+    try:
+        for path in iter_paths(source, extensions):
+            if path in done:
+                summary["skipped"] += 1
+                continue
+            # Bound the work in flight so huge imports do not queue every
+            # path (and every result) in memory at once
+            while len(in_flight) >= max_in_flight:
+                drain(FIRST_COMPLETED)
+            in_flight.add(executor.submit(_parse, parse_file, path))
+
+        while in_flight:
+            drain(FIRST_COMPLETED)
+    except KeyboardInterrupt:
+        # Everything written so far is checkpointed; rerun to resume
+        summary["interrupted"] = True
+    finally:
+        executor.shutdown(wait=not in_flight, cancel_futures=True)
+        if checkpoint_file:
+            checkpoint_file.close()
+
+    return summary
+
+def ingest_arguments(argv):
+    """Parse `--ingest SOURCE [options]` from argv, or return None"""
+    if len(argv) < 2 or argv[1] != '--ingest':
+        return None
+
+    parser = argparse.ArgumentParser(prog=os.path.basename(argv[0]) + ' --ingest')
+    parser.add_argument('source', help="Directory to walk or manifest of file paths")
+    parser.add_argument('--output', help="Append JSONL results here instead of stdout")
+    parser.add_argument('--checkpoint', help="Progress file (default: OUTPUT.checkpoint when --output is set)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--in-flight', type=int, dest='in_flight', help="Maximum files queued at once (default: 4 x workers)")
+    args = parser.parse_args(argv[2:])
+    if args.checkpoint is None and args.output:
+        args.checkpoint = args.output + '.checkpoint'
+    return args
+
+def main_ingest(parse_file, args, extensions=None):
+    """Run an ingest from parsed CLI arguments and report the summary on stderr"""
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+    try:
+        summary = run_ingest(
+            parse_file,
+            args.source,
+            output=output,
+            checkpoint=args.checkpoint,
+            workers=args.workers,
+            max_in_flight=args.in_flight,
+            extensions=extensions
+        )
+    finally:
+        if output:
+            output.close()
+
+    sys.stderr.write(json.dumps(dict(summary, success=not summary.get("interrupted"))) + "\n")
+    if summary.get("interrupted"):
+        sys.exit(130)
+    return summary
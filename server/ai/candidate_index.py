@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+VibhoHCM Candidate Index - BM25 search over parsed resumes
+On-disk inverted index of candidates by skill and term. New resumes are
+added as small immutable segments and can be merged later; postings are
+memory-mapped NumPy arrays so a query only touches the terms it uses
+"""
+
+import sys
+import json
+import os
+import argparse
+import math
+import re
+import shutil
+from functools import lru_cache
+
+import numpy as np
+
+from batch import open_source
+from text_extraction import iter_text_chunks
+
+INDEX_FORMAT = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Query weight of skill terms relative to free-text terms
+SKILL_WEIGHT = 2.0
+
+# Documents buffered in memory before a segment is written
+SEGMENT_SIZE = 10000
+
+TERM_PATTERN = re.compile(r'\w+')
+
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "to", "was", "were", "will", "with", "we", "you"
+])
+
+def text_terms(text):
+    """Lowercased word terms with stopwords removed"""
+    return [term for term in TERM_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+def skill_term(skill):
+    return "skill:" + skill.lower()
+
+def document_terms(record):
+    """Term frequencies for one parsed resume record"""
+    frequencies = {}
+    text = record.get('text') or ''
+    for term in text_terms(text):
+        frequencies[term] = frequencies.get(term, 0) + 1
+    for entry in record.get('education') or []:
+        for term in text_terms(entry):
+            frequencies[term] = frequencies.get(term, 0) + 1
+    for skill in record.get('skills') or []:
+        term = skill_term(skill)
+        frequencies[term] = frequencies.get(term, 0) + 1
+    return frequencies
+
+def bm25_idf(doc_count, doc_freq):
+    """Okapi BM25 inverse document frequency (always positive)"""
+    return math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+def bm25_weights(tf, doc_lengths, avg_length, k1=K1, b=B):
+    """Vectorized BM25 term-frequency saturation"""
+    return tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_lengths / avg_length))
+
+class Segment:
+    """One immutable, memory-mapped slice of the index"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        with open(os.path.join(path, 'terms.json'), 'r', encoding='utf-8') as file:
+            self.terms = json.load(file)
+        with open(os.path.join(path, 'candidates.json'), 'r', encoding='utf-8') as file:
+            self.candidates = json.load(file)
+        self.doc_base = meta["docBase"]
+        self.doc_count = meta["docCount"]
+        self.total_length = meta["totalLength"]
+        self.docs = np.load(os.path.join(path, 'postings_docs.npy'), mmap_mode='r')
+        self.tfs = np.load(os.path.join(path, 'postings_tf.npy'), mmap_mode='r')
+        self.lengths = np.load(os.path.join(path, 'doc_lengths.npy'), mmap_mode='r')
+
+    def postings(self, term):
+        """(local doc ids, term frequencies) for a term, or None"""
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        start, count = entry
+        return self.docs[start:start + count], self.tfs[start:start + count]
+
+def write_segment(path, doc_base, candidate_ids, doc_lengths, postings):
+    """Write a segment from {term: [(local doc, tf), ...]}"""
+    os.makedirs(path, exist_ok=True)
+    terms = {}
+    docs = []
+    tfs = []
+    offset = 0
+    for term in sorted(postings):
+        entries = postings[term]
+        terms[term] = [offset, len(entries)]
+        for local_doc, tf in entries:
+            docs.append(local_doc)
+            tfs.append(tf)
+        offset += len(entries)
+
+    np.save(os.path.join(path, 'postings_docs.npy'), np.asarray(docs, dtype=np.int32))
+    np.save(os.path.join(path, 'postings_tf.npy'), np.asarray(tfs, dtype=np.float32))
+    np.save(os.path.join(path, 'doc_lengths.npy'), np.asarray(doc_lengths, dtype=np.int32))
+    with open(os.path.join(path, 'terms.json'), 'w', encoding='utf-8') as file:
+        json.dump(terms, file)
+    with open(os.path.join(path, 'candidates.json'), 'w', encoding='utf-8') as file:
+        json.dump(candidate_ids, file)
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump({
+            "docBase": doc_base,
+            "docCount": len(candidate_ids),
+            "totalLength": int(sum(doc_lengths))
+        }, file)
+
+class CandidateIndex:
+    """Segmented BM25 index of candidates stored under one directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self._load_manifest()
+        self.segments = [Segment(os.path.join(directory, name)) for name in self.manifest["segments"]]
+        self.deleted = np.zeros(self.manifest["nextDoc"], dtype=bool)
+        if self.manifest["deleted"]:
+            self.deleted[np.asarray(self.manifest["deleted"], dtype=np.int64)] = True
+        self.live_length = self._live_length()
+        self._pending = []
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                self.manifest = json.load(file)
+            if self.manifest.get("format") != INDEX_FORMAT:
+                raise ValueError(f"Unsupported index format in {self.directory}")
+        else:
+            self.manifest = {
+                "format": INDEX_FORMAT,
+                "segments": [],
+                "nextDoc": 0,
+                "nextSegment": 1,
+                "deleted": [],
+                "candidates": {}
+            }
+
+    def _save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.manifest, file)
+        os.replace(tmp_path, self.manifest_path)
+
+    @property
+    def doc_count(self):
+        return self.manifest["nextDoc"] - len(self.manifest["deleted"])
+
+    def _live_length(self):
+        """Total length of the documents not replaced by a newer version"""
+        total = sum(segment.total_length for segment in self.segments)
+        if self.manifest["deleted"]:
+            for segment in self.segments:
+                deleted = self.deleted[segment.doc_base:segment.doc_base + segment.doc_count]
+                total -= int(np.asarray(segment.lengths)[deleted].sum())
+        return total
+
+    def add(self, record):
+        """Queue a parsed resume; a re-added candidateId replaces the old one
+
+        Near duplicates of an indexed resume are skipped and return False.
+        """
+        if not record.get('candidateId'):
+            raise ValueError("Record is missing candidateId")
+        if record.get('duplicateOf'):
+            return False
+        self._pending.append(record)
+        if len(self._pending) >= SEGMENT_SIZE:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Write queued records as a new segment and update the manifest"""
+        if not self._pending:
+            return
+
+        doc_base = self.manifest["nextDoc"]
+        candidates = self.manifest["candidates"]
+        candidate_ids = []
+        doc_lengths = []
+        postings = {}
+
+        for local_doc, record in enumerate(self._pending):
+            candidate_id = record['candidateId']
+            previous = candidates.get(candidate_id)
+            if previous is not None:
+                self.manifest["deleted"].append(previous)
+            candidates[candidate_id] = doc_base + local_doc
+
+            frequencies = document_terms(record)
+            candidate_ids.append(candidate_id)
+            doc_lengths.append(sum(frequencies.values()))
+            for term, tf in frequencies.items():
+                postings.setdefault(term, []).append((local_doc, tf))
+
+        name = f"seg-{self.manifest['nextSegment']:06d}"
+        write_segment(os.path.join(self.directory, name), doc_base, candidate_ids, doc_lengths, postings)
+
+        self.manifest["segments"].append(name)
+        self.manifest["nextSegment"] += 1
+        self.manifest["nextDoc"] = doc_base + len(candidate_ids)
+        self._save_manifest()
+
+        self.segments.append(Segment(os.path.join(self.directory, name)))
+        deleted = np.zeros(self.manifest["nextDoc"], dtype=bool)
+        deleted[:len(self.deleted)] = self.deleted
+        if self.manifest["deleted"]:
+            deleted[np.asarray(self.manifest["deleted"], dtype=np.int64)] = True
+        self.deleted = deleted
+        self.live_length = self._live_length()
+        self._pending = []
+
+    def search(self, query_text='', skills=None, top=50):
+        """Top candidates for a job description and/or required skills"""
+        query = {}
+        for term in text_terms(query_text or ''):
+            query[term] = query.get(term, 0.0) + 1.0
+        for skill in skills or []:
+            term = skill_term(skill)
+            query[term] = query.get(term, 0.0) + SKILL_WEIGHT
+
+        total_docs = self.manifest["nextDoc"]
+        live_docs = self.doc_count
+        if not query or live_docs <= 0:
+            return []
+
+        # Collection statistics only count live documents: postings of
+        # replaced candidates stay in their segments until optimize()
+        has_deleted = bool(self.manifest["deleted"])
+        avg_length = max(1.0, self.live_length / live_docs)
+        scores = np.zeros(total_docs, dtype=np.float32)
+
+        for term, weight in query.items():
+            found = [(segment, segment.postings(term)) for segment in self.segments]
+            found = [(segment, postings) for segment, postings in found if postings is not None]
+            if has_deleted:
+                doc_freq = sum(int(np.count_nonzero(~self.deleted[segment.doc_base + docs])) for segment, (docs, _) in found)
+            else:
+                doc_freq = sum(len(docs) for _, (docs, _) in found)
+            if not doc_freq:
+                continue
+            idf = bm25_idf(live_docs, doc_freq) * weight
+            for segment, (docs, tfs) in found:
+                # Doc ids are unique within a term's postings, so plain
+                # fancy-index addition is safe here
+                scores[segment.doc_base + docs] += idf * bm25_weights(tfs, segment.lengths[docs], avg_length)
+
+        scores[self.deleted[:total_docs]] = 0
+        top = min(top, total_docs)
+        candidates = np.argpartition(-scores, top - 1)[:top] if top < total_docs else np.arange(total_docs)
+        candidates = candidates[scores[candidates] > 0]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        return [
+            {"candidateId": self._candidate_id(int(doc)), "score": round(float(scores[doc]), 4)}
+            for doc in candidates
+        ]
+
+    def _candidate_id(self, doc):
+        for segment in self.segments:
+            if segment.doc_base <= doc < segment.doc_base + segment.doc_count:
+                return segment.candidates[doc - segment.doc_base]
+        return None
+
+    def optimize(self):
+        """Merge every segment into one, dropping replaced candidates"""
+        self.flush()
+        if len(self.segments) <= 1 and not self.manifest["deleted"]:
+            return
+
+        keep = ~self.deleted
+        remap = np.cumsum(keep) - 1
+        candidate_ids = []
+        doc_lengths = []
+        for segment in self.segments:
+            live = keep[segment.doc_base:segment.doc_base + segment.doc_count]
+            candidate_ids.extend(candidate for candidate, alive in zip(segment.candidates, live) if alive)
+            doc_lengths.append(np.asarray(segment.lengths)[live])
+
+        terms = {}
+        all_docs = []
+        all_tfs = []
+        offset = 0
+        for term in sorted(set().union(*(segment.terms for segment in self.segments))):
+            term_docs = []
+            term_tfs = []
+            for segment in self.segments:
+                postings = segment.postings(term)
+                if postings is None:
+                    continue
+                global_docs = segment.doc_base + np.asarray(postings[0], dtype=np.int64)
+                live = keep[global_docs]
+                term_docs.append(remap[global_docs[live]].astype(np.int32))
+                term_tfs.append(np.asarray(postings[1])[live])
+            count = sum(len(docs) for docs in term_docs)
+            if not count:
+                continue
+            terms[term] = [offset, count]
+            all_docs.extend(term_docs)
+            all_tfs.extend(term_tfs)
+            offset += count
+
+        name = f"seg-{self.manifest['nextSegment']:06d}"
+        path = os.path.join(self.directory, name)
+        os.makedirs(path, exist_ok=True)
+        lengths = np.concatenate(doc_lengths) if doc_lengths else np.zeros(0, dtype=np.int32)
+        np.save(os.path.join(path, 'postings_docs.npy'), np.concatenate(all_docs) if all_docs else np.zeros(0, dtype=np.int32))
+        np.save(os.path.join(path, 'postings_tf.npy'), np.concatenate(all_tfs).astype(np.float32) if all_tfs else np.zeros(0, dtype=np.float32))
+        np.save(os.path.join(path, 'doc_lengths.npy'), lengths.astype(np.int32))
+        with open(os.path.join(path, 'terms.json'), 'w', encoding='utf-8') as file:
+            json.dump(terms, file)
+        with open(os.path.join(path, 'candidates.json'), 'w', encoding='utf-8') as file:
+            json.dump(candidate_ids, file)
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump({"docBase": 0, "docCount": len(candidate_ids), "totalLength": int(lengths.sum())}, file)
+
+        old_segments = self.manifest["segments"]
+        self.manifest.update({
+            "segments": [name],
+            "nextSegment": self.manifest["nextSegment"] + 1,
+            "nextDoc": len(candidate_ids),
+            "deleted": [],
+            "candidates": {candidate: doc for doc, candidate in enumerate(candidate_ids)}
+        })
+        self._save_manifest()
+
+        self.segments = [Segment(path)]
+        self.deleted = np.zeros(len(candidate_ids), dtype=bool)
+        self.live_length = self._live_length()
+        for old in old_segments:
+            shutil.rmtree(os.path.join(self.directory, old), ignore_errors=True)
+
+    def stats(self):
+        return {
+            "candidates": self.doc_count,
+            "documents": self.manifest["nextDoc"],
+            "segments": len(self.segments),
+            "terms": len(set().union(*(segment.terms for segment in self.segments))) if self.segments else 0
+        }
+
+@lru_cache(maxsize=8)
+def _open_cached(directory, manifest_mtime):
+    return CandidateIndex(directory)
+
+def open_index(directory):
+    """Open an index once per process, reopening when it changes on disk"""
+    manifest = os.path.join(directory, 'manifest.json')
+    mtime = os.path.getmtime(manifest) if os.path.exists(manifest) else None
+    return _open_cached(directory, mtime)
+
+def record_from_payload(record):
+    """Fill in resume text from a file path so it can be indexed
+
+    resume_parser results carry skills and education but not the resume
+    text, so a record without "text" or "path" is only searchable by
+    those.
+    """
+    if not record.get('text') and record.get('path'):
+        record = dict(record, text=''.join(iter_text_chunks(record['path'])))
+    return record
+
+def handle_request(payload):
+    """Handle a candidate search request from the AI worker"""
+    if not payload.get('index'):
+        raise ValueError("Missing index directory")
+
+    index = open_index(payload['index'])
+    return index.search(payload.get('query', ''), payload.get('skills'), int(payload.get('top', 50)))
+
+def main():
+    """Main function to build and query the candidate index"""
+    parser = argparse.ArgumentParser(description="VibhoHCM candidate search index")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="Index JSONL resume_parser results; add text or path to search the resume text")
+    add.add_argument('index')
+    add.add_argument('source', nargs='?', default='-')
+
+    search = commands.add_parser('search', help="Rank candidates for a job description")
+    search.add_argument('index')
+    search.add_argument('query', nargs='?', default='')
+    search.add_argument('--skills', default='', help="Comma separated required skills")
+    search.add_argument('--top', type=int, default=50)
+
+    optimize = commands.add_parser('optimize', help="Merge segments and drop replaced candidates")
+    optimize.add_argument('index')
+
+    stats = commands.add_parser('stats', help="Show index statistics")
+    stats.add_argument('index')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'add':
+            index = CandidateIndex(args.index)
+            stream = open_source(args.source)
+            added = 0
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                # Accept both bare parse results and batch-mode envelopes
+                if 'result' in record and isinstance(record['result'], dict):
+                    record = dict(record['result'], **{k: v for k, v in record.items() if k in ('text', 'path')})
+                if index.add(record_from_payload(record)):
+                    added += 1
+            index.flush()
+            result = dict(index.stats(), added=added)
+        elif args.command == 'search':
+            skills = [skill.strip() for skill in args.skills.split(',') if skill.strip()]
+            result = CandidateIndex(args.index).search(args.query, skills, args.top)
+        elif args.command == 'optimize':
+            index = CandidateIndex(args.index)
+            index.optimize()
+            result = index.stats()
+        else:
+            result = CandidateIndex(args.index).stats()
+
+        print(json.dumps(result))
+
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "message": str(e)
+        }))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
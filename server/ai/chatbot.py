@@ -5,56 +5,79 @@ Uses Hugging Face Transformers for intent classification and entity recognition
 """
 
 import sys
-import json
 import os
-import numpy as np
-from datetime import datetime
 import re
+import json
+from contextlib import ExitStack, closing
+
+from batch import batch_source, run_batch
+from entity_scanner import get_scanner
+from hr_data import get_hr_data
+from instrumentation import stage, track
+from intent_index import get_intent_index
+from json_input import load_json_argument
+from session_store import get_store
+
+# Entity types recognized in chat messages
+# In production, use spaCy or Hugging Face NER models
+ENTITY_TYPES = ["DATE", "EMAIL", "PERSON"]
+
+# Confidence of a follow-up turn that inherits the previous turn's intent
+FOLLOW_UP_CONFIDENCE = 0.65
+
+# Intents answered from the HR policy documents when a passage matches
+POLICY_INTENTS = ("help_request", "general_inquiry")
+# Lowest relevance (BM25 score over the question's total idf, see
+# PolicyIndex.search) of a passage worth answering with. Raw scores depend
+# on the corpus size, so a fixed score cutoff rejected good passages from
+# small policy sets
+POLICY_MIN_RELEVANCE = 0.5
+# Longest policy passage quoted in an answer, in characters
+POLICY_ANSWER_CHARS = 600
+
+# Streamed answers are split after sentence-ending punctuation
+SENTENCE_BREAK = re.compile(r'(?<=[.!?]\s)')
 
 # Mock implementation - in production, use actual models
 def extract_entities(text):
     """Extract entities from text using NER"""
-    entities = []
-    
-    # Simple regex patterns for demonstration
-    # In production, use spaCy or Hugging Face NER models
-    date_pattern = r'\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b|\b\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4}\b'
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    name_pattern = r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'
-    
-    # Find dates
-    for match in re.finditer(date_pattern, text):
-        entities.append({
-            "entity": match.group(),
-            "type": "DATE",
-            "start": match.start(),
-            "end": match.end()
-        })
-    
-    # Find emails
-    for match in re.finditer(email_pattern, text):
-        entities.append({
-            "entity": match.group(),
-            "type": "EMAIL",
-            "start": match.start(),
-            "end": match.end()
-        })
-    
-    # Find names
-    for match in re.finditer(name_pattern, text):
-        entities.append({
-            "entity": match.group(),
-            "type": "PERSON",
-            "start": match.start(),
-            "end": match.end()
-        })
-    
-    return entities
+    return get_scanner(ENTITY_TYPES).scan(text)
+
+# model.nlp intents are namespaced by area ("leave.balance"); the area
+# picks the chatbot intent the responses are keyed by
+MODEL_INTENT_AREAS = {
+    "leave": "leave_inquiry",
+    "payroll": "payroll_inquiry",
+    "attendance": "attendance_inquiry",
+    "document": "document_inquiry"
+}
+
+def intent_index():
+    """Intent index compiled from model.nlp, or None when it is missing"""
+    return get_intent_index()
 
 def classify_intent(text, context):
-    """Classify user intent"""
-    # In production, use a trained intent classifier
-    # Here we use simple keyword matching
+    """Classify user intent
+
+    Returns (intent, confidence, model intent). The trained model.nlp
+    intents are tried first; messages they do not cover fall back to
+    keyword matching, with no model intent.
+    """
+    index = intent_index()
+    return resolve_intent(text, index.classify(text) if index else None)
+
+def resolve_intent(text, match):
+    """Chatbot intent for a message given its model.nlp match (or None)"""
+    if match:
+        area = match["intent"].split('.', 1)[0]
+        if area in MODEL_INTENT_AREAS:
+            return MODEL_INTENT_AREAS[area], match["confidence"], match["intent"]
+    
+    intent, confidence = classify_keywords(text)
+    return intent, confidence, None
+
+def classify_keywords(text):
+    """Classify user intent by keyword matching"""
     text_lower = text.lower()
     
     if any(word in text_lower for word in ['leave', 'vacation', 'time off', 'sick']):
@@ -74,56 +97,227 @@ def classify_intent(text, context):
     
     return "general_inquiry", 0.60
 
-def generate_response(intent, entities, context):
+def classify_intents(messages):
+    """Classify many messages in one call"""
+    index = intent_index()
+    results = []
+    for message in messages:
+        intent, confidence, model_intent = resolve_intent(message, index.classify(message) if index else None)
+        results.append({"intent": intent, "confidence": confidence, "nlpIntent": model_intent})
+    return results
+
+# Fact groups each intent's answers read, fetched (and prefetched) per employee
+INTENT_FACTS = {
+    "leave_inquiry": ("leave",),
+    "payroll_inquiry": ("payroll",),
+    "attendance_inquiry": ("attendance",),
+    "document_inquiry": ("documents",)
+}
+
+RESPONSES = {
+    "leave_inquiry": [
+        "I can help you with leave information. Based on our records, you have {annualRemaining} annual leave days remaining.",
+        "Your leave balance shows {annualRemaining} annual and {sickRemaining} sick leave days available. Would you like to apply for leave?",
+        "I see you're asking about leave. Your last leave was from {lastLeave}. You have {annualRemaining} days remaining."
+    ],
+    "payroll_inquiry": [
+        "Your latest payslip for {latestPayslip} has been processed. The net amount is ${netPay:,.2f}.",
+        "I can help with payroll information. Your YTD earnings are ${ytdEarnings:,.0f} with ${ytdTax:,.0f} in tax deductions.",
+        "Your next salary payment is scheduled for {nextPayDate}. Would you like to view your latest payslip?"
+    ],
+    "attendance_inquiry": [
+        "Your attendance rate for this month is {attendanceRate}%. You were late on {lastLate}.",
+        "You've worked {hoursWorked} hours this month with an average daily attendance of {averageDailyHours} hours.",
+        "Your attendance records show you've been present for {daysPresent} days this month with {workFromHomeDays} work-from-home day."
+    ],
+    "document_inquiry": [
+        "You have {documentCount} documents in your profile. Your passport is expiring in {passportExpiry}.",
+        "I can help you manage your documents. Would you like to upload a new document or view existing ones?",
+        "Your document repository contains: {documentSummary}."
+    ],
+    "help_request": [
+        "I'm here to help! You can ask me about leave, attendance, payroll, documents, and more.",
+        "How can I assist you today? I can provide information on various HR services and policies.",
+        "I'm your HR assistant. Feel free to ask about company policies, benefits, or any HR-related questions."
+    ],
+    "general_inquiry": [
+        "Hello {name}! How can I assist you with HR matters today?",
+        "I'm here to help with any HR-related questions you might have.",
+        "Is there something specific about your employment that you'd like to know?"
+    ]
+}
+
+def prefetch_facts(intent, context):
+    """Start loading the employee facts an intent's answer will need"""
+    groups = INTENT_FACTS.get(intent)
+    if groups:
+        get_hr_data().prefetch(context.get('employeeId'), groups)
+
+def answer_fields(facts):
+    """Template fields from the fetched fact groups"""
+    fields = {}
+    for group in facts.values():
+        fields.update(group)
+    documents = fields.get('documents')
+    if documents is not None:
+        fields['documentCount'] = len(documents)
+        shown = ', '.join(documents[:3])
+        fields['documentSummary'] = f"{shown}, and {len(documents) - 3} more documents" if len(documents) > 3 else shown
+    return fields
+
+def get_policy_index():
+    """The policy passage index, or None when none has been built"""
+    # POLICY_INDEX_DIR or server/ai/policy_index, checked without importing
+    # NumPy so the chatbot's cold start stays short
+    directory = os.environ.get('POLICY_INDEX_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'policy_index')
+    if not os.path.exists(os.path.join(directory, 'meta.json')):
+        return None
+    from policy_index import open_index
+    return open_index(directory)
+
+def policy_answer(message):
+    """Answer quoting the best matching policy passage, or None"""
+    index = get_policy_index()
+    passages = index.search(message, 1) if index and message else []
+    if not passages or passages[0]["relevance"] < POLICY_MIN_RELEVANCE:
+        return None
+    
+    text = passages[0]["text"]
+    if len(text) > POLICY_ANSWER_CHARS:
+        # Cut at the last full sentence that fits
+        text = text[:POLICY_ANSWER_CHARS]
+        end = max(text.rfind('. '), text.rfind('? '), text.rfind('! '))
+        text = text[:end + 1] if end > 0 else text.rsplit(' ', 1)[0] + '...'
+    return f"According to {passages[0]['title']}: {text}"
+
+def generate_response(intent, entities, context, message=''):
     """Generate response based on intent, entities, and context"""
     # In production, use a more sophisticated response generator
     
-    user_role = context.get('userRole', 'employee')
-    user_name = context.get('name', 'there')
-    
-    responses = {
-        "leave_inquiry": [
-            f"I can help you with leave information. Based on our records, you have 15 annual leave days remaining.",
-            f"Your leave balance shows 15 annual and 10 sick leave days available. Would you like to apply for leave?",
-            f"I see you're asking about leave. Your last leave was from March 10-15, 2024. You have 15 days remaining."
-        ],
-        "payroll_inquiry": [
-            f"Your latest payslip for April 2024 has been processed. The net amount is $4,250.00.",
-            f"I can help with payroll information. Your YTD earnings are $17,000 with $3,400 in tax deductions.",
-            f"Your next salary payment is scheduled for May 30, 2024. Would you like to view your latest payslip?"
-        ],
-        "attendance_inquiry": [
-            f"Your attendance rate for this month is 96%. You were late on May 5, 2024.",
-            f"You've worked 160 hours this month with an average daily attendance of 8.5 hours.",
-            f"Your attendance records show you've been present for 20 days this month with 1 work-from-home day."
-        ],
-        "document_inquiry": [
-            f"You have 5 documents in your profile. Your passport is expiring in 3 months.",
-            f"I can help you manage your documents. Would you like to upload a new document or view existing ones?",
-            f"Your document repository contains: Passport, Driver's License, Degree Certificate, and 2 more documents."
-        ],
-        "help_request": [
-            f"I'm here to help! You can ask me about leave, attendance, payroll, documents, and more.",
-            f"How can I assist you today? I can provide information on various HR services and policies.",
-            f"I'm your HR assistant. Feel free to ask about company policies, benefits, or any HR-related questions."
-        ],
-        "general_inquiry": [
-            f"Hello {user_name}! How can I assist you with HR matters today?",
-            f"I'm here to help with any HR-related questions you might have.",
-            f"Is there something specific about your employment that you'd like to know?"
-        ]
-    }
+    # Policy questions are answered from the indexed policy documents
+    if intent in POLICY_INTENTS:
+        answer = policy_answer(message)
+        if answer:
+            return answer
     
     # Select a response based on intent
-    if intent in responses:
+    if intent in RESPONSES:
+        # Facts come from the HR data provider in one batched, memoized call
+        groups = INTENT_FACTS.get(intent, ())
+        facts = get_hr_data().get(context.get('employeeId'), groups) if groups else {}
+        
         # In production, use a more sophisticated selection method
-        response_idx = hash(context.get('name', '') + intent) % len(responses[intent])
-        return responses[intent][response_idx]
+        response_idx = hash(context.get('name', '') + intent) % len(RESPONSES[intent])
+        return RESPONSES[intent][response_idx].format(name=context.get('name', 'there'), **answer_fields(facts))
     
     return "I'm not sure how to help with that. Could you please rephrase your question?"
 
+def answer_chunks(answer):
+    """Split an answer into sentence-sized pieces that join back to it"""
+    return [piece for piece in SENTENCE_BREAK.split(answer) if piece]
+
+def iter_response(message, context, session_id=None, prefetch=True):
+    """Build the reply incrementally
+
+    Yields an "envelope" event (intent, confidence and entities) as soon as
+    classification is done, then "chunk" events with pieces of the answer
+    text, then a "done" event carrying the complete result. With prefetch
+    the employee facts start loading before the envelope is sent.
+
+    With a session id the conversation state lives in the session store:
+    context only needs the profile fields that changed, and a follow-up
+    turn without an intent of its own continues the previous turn's.
+    """
+    with track('chatbot') as tracker, ExitStack() as held:
+        session = None
+        if session_id:
+            # The session stays locked until the turn is saved, so a second
+            # turn of the conversation waits for this one's state
+            with stage('session'):
+                store = get_store()
+                held.enter_context(store.lock(session_id))
+                session = store.get(session_id)
+                session.profile.update(context)
+                context = session.profile
+        
+        # Extract entities
+        with stage('entities'):
+            entities = extract_entities(message)
+        
+        # Classify intent
+        with stage('intent'):
+            intent, confidence, model_intent = classify_intent(message, context)
+            if session is not None and intent == "general_inquiry":
+                previous_intent = session.last_intent()
+                if previous_intent and previous_intent != "general_inquiry":
+                    intent, confidence = previous_intent, FOLLOW_UP_CONFIDENCE
+        
+        # Employee facts load in the background while the envelope goes out
+        if prefetch:
+            with stage('prefetch'):
+                prefetch_facts(intent, context)
+        
+        envelope = {
+            "entities": entities,
+            "intent": intent,
+            "confidence": confidence,
+            "nlpIntent": model_intent
+        }
+        if session is not None:
+            envelope["sessionId"] = session_id
+            envelope["turn"] = session.turn_count + 1
+        yield {"type": "envelope", **envelope}
+        
+        # Generate response
+        with stage('response'):
+            answer = generate_response(intent, entities, context, message)
+        for piece in answer_chunks(answer):
+            yield {"type": "chunk", "text": piece}
+        
+        if session is not None:
+            with stage('session'):
+                session.add_turn(message, intent, entities)
+                store.update(session)
+        
+        result = dict({"answer": answer}, **envelope, timings=tracker.timings())
+        yield {"type": "done", "result": result}
+
+def process_message(message, context, session_id=None):
+    """Process a chatbot message and build the whole reply"""
+    # Nothing is sent before the answer, so there is nothing to prefetch
+    # for; closing the events releases the session lock as soon as we return
+    with closing(iter_response(message, context, session_id, prefetch=False)) as events:
+        for event in events:
+            if event["type"] == "done":
+                return event["result"]
+
+def handle_request(payload):
+    """Handle a chatbot request from the AI worker
+
+    {"messages": [...]} classifies a batch of messages without replying;
+    {"sessionId", "endSession": true} forgets a conversation.
+    """
+    if 'messages' in payload:
+        return classify_intents(payload['messages'])
+    if payload.get('endSession'):
+        store = get_store()
+        with store.lock(payload.get('sessionId')):
+            ended = store.drop(payload.get('sessionId'))
+        return {"sessionId": payload.get('sessionId'), "ended": ended}
+    return process_message(payload.get('message', ''), payload.get('context', {}), payload.get('sessionId'))
+
+def stream_request(payload):
+    """Handle a streaming chatbot request from the AI worker"""
+    return iter_response(payload.get('message', ''), payload.get('context', {}), payload.get('sessionId'))
+
 def main():
     """Main function to process chatbot messages"""
+    # JSONL batch mode: one request per line from stdin or a file
+    source = batch_source(sys.argv)
+    if source:
+        run_batch(handle_request, source)
+        return
+    
     if len(sys.argv) < 3:
         print(json.dumps({
             "success": False,
@@ -132,24 +326,11 @@ def main():
         sys.exit(1)
     
     message = sys.argv[1]
-    context = json.loads(sys.argv[2])
-    
-    # Extract entities
-    entities = extract_entities(message)
-    
-    # Classify intent
-    intent, confidence = classify_intent(message, context)
-    
-    # Generate response
-    answer = generate_response(intent, entities, context)
+    # Context may be inline JSON, stdin ('-') or a file ('@path')
+    context = load_json_argument(sys.argv[2])
     
     # Return result
-    result = {
-        "answer": answer,
-        "entities": entities,
-        "intent": intent,
-        "confidence": confidence
-    }
+    result = process_message(message, context)
     
     print(json.dumps(result))
 
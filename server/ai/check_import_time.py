@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+VibhoHCM AI Cold-Start Budget - Import-time regression check
+Runs each entry point under `python -X importtime` and fails when its
+cumulative import time exceeds the budget or a heavy dependency is
+imported at module load
+"""
+
+import sys
+import json
+import os
+import argparse
+import subprocess
+
+AI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time budget per module, in milliseconds
+IMPORT_BUDGETS_MS = {
+    "chatbot": 40,
+    "resume_parser": 40,
+    "document_processor": 40,
+    "attendance_analytics": 40,
+    "insights_generator": 40,
+    "payroll_prediction": 40
+}
+
+# Dependencies that must only be imported on the code paths using them
+LAZY_MODULES = ["numpy"]
+
+def parse_importtime(output):
+    """Map module name -> (self_us, cumulative_us) from -X importtime output"""
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            timings[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return timings
+
+def measure(module, runs):
+    """Best-of-N cumulative import time and the modules it pulled in"""
+    best = None
+    imported = set()
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=AI_DIR,
+            capture_output=True,
+            text=True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed: {completed.stderr.strip().splitlines()[-1:]}")
+        timings = parse_importtime(completed.stderr)
+        if module not in timings:
+            raise RuntimeError(f"No import timing reported for {module}")
+        cumulative = timings[module][1]
+        best = cumulative if best is None else min(best, cumulative)
+        imported = set(timings)
+    return best, imported
+
+def check_module(module, runs=5, scale=1.0):
+    """Measure one module against its budget and the lazy-import rule"""
+    budget_ms = IMPORT_BUDGETS_MS.get(module, max(IMPORT_BUDGETS_MS.values())) * scale
+    cumulative_us, imported = measure(module, max(1, runs))
+    eager = sorted(name for name in LAZY_MODULES if name in imported)
+    return {
+        "module": module,
+        "importMs": round(cumulative_us / 1000, 2),
+        "budgetMs": round(budget_ms, 2),
+        "eagerHeavyImports": eager,
+        "ok": cumulative_us / 1000 <= budget_ms and not eager
+    }
+
+def main():
+    """Main function to check cold-start import budgets"""
+    parser = argparse.ArgumentParser(description="Check AI script import-time budgets")
+    parser.add_argument('--runs', type=int, default=5, help="Take the best of this many runs per module")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply budgets, e.g. for slow CI machines")
+    parser.add_argument('modules', nargs='*', help="Modules to check (default: all budgeted modules)")
+    args = parser.parse_args()
+
+    results = [check_module(module, args.runs, args.scale) for module in args.modules or sorted(IMPORT_BUDGETS_MS)]
+    failed = not all(result["ok"] for result in results)
+
+    print(json.dumps({"success": not failed, "results": results}, indent=2))
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+VibhoHCM Document Classifier - Hashed-feature Naive Bayes model
+Multinomial Naive Bayes over hashed term counts, trained offline from
+labelled documents and saved as a compact .npz file. Inference scores a
+whole batch of documents with NumPy matrix operations
+"""
+
+import sys
+import json
+import os
+import argparse
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from text_extraction import iter_text_chunks
+from text_features import TermCounts, count_terms
+
+AI_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL_PATH = os.path.join(AI_DIR, 'document_classifier.npz')
+
+# Bump when features or the file layout change
+MODEL_FORMAT = 1
+
+DEFAULT_FEATURES = 1 << 16
+DEFAULT_ALPHA = 0.1
+
+# Documents scored per matrix operation
+BATCH_SIZE = 1024
+
+def model_path():
+    """Model file location, overridable with DOCUMENT_CLASSIFIER_MODEL"""
+    return os.environ.get('DOCUMENT_CLASSIFIER_MODEL') or DEFAULT_MODEL_PATH
+
+@lru_cache(maxsize=1 << 18)
+def feature_index(term, features):
+    """Stable hashed feature column for a term"""
+    return zlib.crc32(term.encode('utf-8')) % features
+
+def hash_batch(term_counts, features):
+    """Sparse (rows, columns, values) for a batch of TermCounts
+
+    Values are log(1 + count), which keeps long documents from being
+    dominated by a few repeated words.
+    """
+    rows = []
+    columns = []
+    values = []
+    for row, terms in enumerate(term_counts):
+        for term, count in terms.counts.items():
+            rows.append(row)
+            columns.append(feature_index(term, features))
+            values.append(count)
+    return (
+        np.asarray(rows, dtype=np.int64),
+        np.asarray(columns, dtype=np.int64),
+        np.log1p(np.asarray(values, dtype=np.float32))
+    )
+
+class DocumentClassifier:
+    """Trained model: class priors and per-class feature log probabilities"""
+
+    def __init__(self, classes, log_prior, log_prob, version):
+        self.classes = list(classes)
+        self.log_prior = log_prior.astype(np.float32)
+        self.log_prob = log_prob.astype(np.float32)
+        self.features = log_prob.shape[1]
+        self.version = version
+
+    def scores(self, term_counts):
+        """(documents x classes) joint log likelihoods"""
+        rows, columns, values = hash_batch(term_counts, self.features)
+        scores = np.tile(self.log_prior, (len(term_counts), 1))
+        if len(rows):
+            # contributions[c, i] = value_i * log P(feature_i | class c),
+            # summed per document with one bincount per class
+            contributions = self.log_prob[:, columns] * values
+            for column in range(len(self.classes)):
+                scores[:, column] += np.bincount(rows, weights=contributions[column], minlength=len(term_counts))
+        return scores
+
+    def classify_batch(self, term_counts):
+        """Category and confidence for every document in a batch"""
+        results = []
+        for start in range(0, len(term_counts), BATCH_SIZE):
+            scores = self.scores(term_counts[start:start + BATCH_SIZE])
+            scores -= scores.max(axis=1, keepdims=True)
+            probabilities = np.exp(scores)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            best = probabilities.argmax(axis=1)
+            results.extend(
+                {"category": self.classes[index], "confidence": round(float(probabilities[row, index]), 4)}
+                for row, index in enumerate(best)
+            )
+        return results
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(
+            tmp_path,
+            format=np.array(MODEL_FORMAT),
+            classes=np.array(self.classes),
+            log_prior=self.log_prior,
+            # Half precision is plenty for log probabilities and halves the file
+            log_prob=self.log_prob.astype(np.float16),
+            version=np.array(self.version)
+        )
+        os.replace(tmp_path, path)
+
+def train(documents, features=DEFAULT_FEATURES, alpha=DEFAULT_ALPHA):
+    """Fit a model from (TermCounts, category) pairs, streaming the data"""
+    classes = []
+    class_index = {}
+    feature_counts = []
+    document_counts = []
+
+    for terms, category in documents:
+        if category not in class_index:
+            class_index[category] = len(classes)
+            classes.append(category)
+            feature_counts.append(np.zeros(features, dtype=np.float64))
+            document_counts.append(0)
+        index = class_index[category]
+        _, columns, values = hash_batch([terms], features)
+        np.add.at(feature_counts[index], columns, values)
+        document_counts[index] += 1
+
+    if len(classes) < 2:
+        raise ValueError("Training data needs at least two categories")
+
+    counts = np.vstack(feature_counts) + alpha
+    log_prob = np.log(counts / counts.sum(axis=1, keepdims=True))
+    log_prior = np.log(np.asarray(document_counts, dtype=np.float64) / sum(document_counts))
+    version = '%08x' % (zlib.crc32(log_prob.astype(np.float16).tobytes()) ^ zlib.crc32(json.dumps(classes).encode('utf-8')))
+    return DocumentClassifier(classes, log_prior, log_prob, version)
+
+@lru_cache(maxsize=4)
+def _load(path, mtime):
+    with np.load(path) as data:
+        if int(data['format']) != MODEL_FORMAT:
+            raise ValueError(f"Unsupported document classifier format in {path}")
+        return DocumentClassifier(
+            [str(name) for name in data['classes']],
+            data['log_prior'],
+            data['log_prob'].astype(np.float32),
+            str(data['version'])
+        )
+
+def load_model(path=None):
+    """Load a model once per process, reloading when the file changes"""
+    path = path or model_path()
+    return _load(path, os.path.getmtime(path))
+
+def document_terms(record):
+    """TermCounts for a {"text"} or {"path"} record"""
+    if record.get('text') is not None:
+        return count_terms(record['text'])
+    terms = TermCounts()
+    for chunk in iter_text_chunks(record['path']):
+        terms.update(chunk)
+    return terms.close()
+
+def iter_labelled(path):
+    """(TermCounts, category) pairs from a JSONL training file"""
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                yield document_terms(record), record['category']
+
+def classify_documents(records, model=None):
+    """Classify many {"text"} / {"path"} records in batches"""
+    model = model or load_model()
+    results = []
+    for start in range(0, len(records), BATCH_SIZE):
+        batch = [document_terms(record) for record in records[start:start + BATCH_SIZE]]
+        results.extend(model.classify_batch(batch))
+    return results
+
+def handle_request(payload):
+    """Handle a batch classification request from the AI worker"""
+    records = [{"text": text} for text in payload.get('texts', [])]
+    records += [{"path": path} for path in payload.get('paths', [])]
+    if not records:
+        raise ValueError("Missing texts or paths to classify")
+    return classify_documents(records)
+
+def main():
+    """Main function to train, evaluate and run the document classifier"""
+    parser = argparse.ArgumentParser(description="VibhoHCM document classifier")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = commands.add_parser('train', help="Train from JSONL lines of {text|path, category}")
+    train_parser.add_argument('data')
+    train_parser.add_argument('--model', default=None, help="Output path (default: DOCUMENT_CLASSIFIER_MODEL or document_classifier.npz)")
+    train_parser.add_argument('--features', type=int, default=DEFAULT_FEATURES)
+    train_parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA)
+
+    evaluate_parser = commands.add_parser('evaluate', help="Accuracy on labelled JSONL data")
+    evaluate_parser.add_argument('data')
+    evaluate_parser.add_argument('--model', default=None)
+
+    classify_parser = commands.add_parser('classify', help="Classify document files")
+    classify_parser.add_argument('paths', nargs='+')
+    classify_parser.add_argument('--model', default=None)
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'train':
+            model = train(iter_labelled(args.data), args.features, args.alpha)
+            path = args.model or model_path()
+            model.save(path)
+            result = {"success": True, "model": path, "classes": model.classes, "features": model.features, "version": model.version}
+        elif args.command == 'evaluate':
+            model = load_model(args.model)
+            labelled = list(iter_labelled(args.data))
+            predictions = model.classify_batch([terms for terms, _ in labelled])
+            correct = sum(1 for (_, category), prediction in zip(labelled, predictions) if prediction["category"] == category)
+            result = {"documents": len(labelled), "accuracy": round(correct / max(1, len(labelled)), 4)}
+        else:
+            model = load_model(args.model)
+            predictions = classify_documents([{"path": path} for path in args.paths], model)
+            result = [dict(prediction, path=path) for path, prediction in zip(args.paths, predictions)]
+
+        print(json.dumps(result))
+
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "message": str(e)
+        }))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -7,51 +7,74 @@ Uses text classification and entity extraction for document processing
 import sys
 import json
 import os
-import re
-import random
-from datetime import datetime
+from functools import lru_cache
+
+from batch import batch_source, run_batch
+from entity_scanner import ENTITY_PATTERNS, get_scanner
+from instrumentation import stage, track
+from result_cache import file_digest, get_cache, version_digest
+from text_extraction import iter_text_chunks
+from text_features import TOKEN_PATTERN, TermCounts, count_terms
 
 def extract_text_from_file(file_path):
     """Extract text from document file"""
-    # In production, use proper document parsing libraries
-    # Here we simply read the file if it's a text file
-    
-    file_ext = os.path.splitext(file_path)[1].lower()
-    
-    if file_ext == '.txt':
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    elif file_ext in ['.pdf', '.doc', '.docx']:
-        # Mock text extraction for non-text files
-        return f"This is extracted text from a {file_ext} document. In production, we would use proper document parsing libraries."
-    elif file_ext in ['.jpg', '.jpeg', '.png']:
-        # Mock OCR for image files
-        return f"This is OCR text from a {file_ext} image. In production, we would use OCR libraries."
-    else:
-        return "Unsupported file format"
+    return ''.join(iter_text_chunks(file_path))
+
+# Define document categories and their keywords
+DOCUMENT_CATEGORIES = {
+    "Contract": ["agreement", "contract", "terms", "parties", "signed", "clause"],
+    "Invoice": ["invoice", "payment", "amount", "due", "bill", "tax", "total"],
+    "Resume": ["experience", "skills", "education", "employment", "resume", "cv"],
+    "Policy": ["policy", "guidelines", "rules", "compliance", "procedure"],
+    "Report": ["report", "analysis", "findings", "conclusion", "summary"],
+    "Letter": ["dear", "sincerely", "regards", "letter", "request"],
+    "Email": ["from:", "to:", "subject:", "sent:", "received:", "forwarded"]
+}
+
+POSITIVE_WORDS = ["good", "great", "excellent", "positive", "happy", "pleased", "satisfied", "agree", "benefit", "success"]
+NEGATIVE_WORDS = ["bad", "poor", "negative", "unhappy", "disappointed", "dissatisfied", "disagree", "problem", "issue", "failure"]
+
+# Bump when the pipeline's output changes in ways the tables above do not capture
+PIPELINE_VERSION = 4
+
+# Characters of context carried from one chunk to the next so entities
+# spanning a chunk boundary are still found
+CHUNK_OVERLAP = 256
+
+# Distinct entities emitted per type in the JSONL entity output
+DEFAULT_ENTITY_CAP = 200
+
+@lru_cache(maxsize=None)
+def _sentiment_lexicon():
+    """Sentiment word sets, built on first use"""
+    return frozenset(POSITIVE_WORDS), frozenset(NEGATIVE_WORDS)
 
 def classify_document(text):
     """Classify document type based on content"""
-    # In production, use a trained document classifier
-    # Here we use simple keyword matching
-    
-    text_lower = text.lower()
-    
-    # Define document categories and their keywords
-    categories = {
-        "Contract": ["agreement", "contract", "terms", "parties", "signed", "clause"],
-        "Invoice": ["invoice", "payment", "amount", "due", "bill", "tax", "total"],
-        "Resume": ["experience", "skills", "education", "employment", "resume", "cv"],
-        "Policy": ["policy", "guidelines", "rules", "compliance", "procedure"],
-        "Report": ["report", "analysis", "findings", "conclusion", "summary"],
-        "Letter": ["dear", "sincerely", "regards", "letter", "request"],
-        "Email": ["from:", "to:", "subject:", "sent:", "received:", "forwarded"]
-    }
+    return classify_terms(count_terms(text))
+
+def trained_classifier():
+    """The trained document classifier, or None when no model file exists"""
+    # Same location as document_classifier.model_path(), without importing it
+    path = os.environ.get('DOCUMENT_CLASSIFIER_MODEL') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_classifier.npz')
+    if not os.path.exists(path):
+        return None
+    # Imported here so NumPy stays off the cold-start path
+    from document_classifier import load_model
+    return load_model(path)
+
+def classify_terms(terms):
+    """Classify document type from the document's term counts"""
+    model = trained_classifier()
+    if model is not None:
+        return model.classify_batch([terms])[0]
+    
+    # Without a trained model we use simple keyword matching
     
     # Count keyword matches for each category
     scores = {}
-    for category, keywords in categories.items():
-        score = sum(1 for keyword in keywords if keyword in text_lower)
+    for category, keywords in DOCUMENT_CATEGORIES.items():
+        score = sum(1 for keyword in keywords if keyword in terms)
         scores[category] = score
     
     # Find category with highest score
@@ -69,16 +92,16 @@ def classify_document(text):
 
 def analyze_sentiment(text):
     """Analyze sentiment of document text"""
+    return sentiment_from_terms(count_terms(text))
+
+def sentiment_from_terms(terms):
+    """Score sentiment from the document's term counts"""
     # In production, use a trained sentiment analysis model
     # Here we use simple keyword counting
     
-    text_lower = text.lower()
-    
-    positive_words = ["good", "great", "excellent", "positive", "happy", "pleased", "satisfied", "agree", "benefit", "success"]
-    negative_words = ["bad", "poor", "negative", "unhappy", "disappointed", "dissatisfied", "disagree", "problem", "issue", "failure"]
-    
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
+    positive_words, negative_words = _sentiment_lexicon()
+    positive_count = len(terms.present(positive_words))
+    negative_count = len(terms.present(negative_words))
     
     total = positive_count + negative_count
     if total == 0:
@@ -98,57 +121,279 @@ def analyze_sentiment(text):
         "score": score
     }
 
-def extract_entities(text):
-    """Extract entities from document text"""
-    # In production, use NER models
-    # Here we use simple regex patterns
-    
+# Entity types extracted from documents, see entity_scanner
+ENTITY_TYPES = ["DATE", "MONEY", "ORGANIZATION", "PERSON"]
+
+def extract_entities(text, types=None):
+    """Extract entities from document text in a single pass"""
+    return get_scanner(types or ENTITY_TYPES).scan(text)
+
+def analyze_text_stream(chunks, entity_types=None):
+    """Classify, score sentiment and extract entities from text chunks
+
+    Each chunk is tokenized once into shared term counts that the keyword
+    analyzers read, and fed to the entity scanner. Only the current chunk
+    plus CHUNK_OVERLAP characters of context is held in memory.
+    """
+    terms = TermCounts()
     entities = []
+    entity_stream = get_scanner(entity_types or ENTITY_TYPES).stream(CHUNK_OVERLAP)
+    text_length = 0
+    
+    chunks = iter(chunks)
+    while True:
+        with stage('extraction'):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+        
+        text_length += len(chunk)
+        with stage('tokenize'):
+            terms.update(chunk)
+        with stage('entities'):
+            entities.extend(entity_stream.feed(chunk))
+    
+    with stage('tokenize'):
+        terms.close()
+    with stage('entities'):
+        entities.extend(entity_stream.close())
     
-    # Extract dates
-    date_pattern = r'\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b|\b\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4}\b'
-    for match in re.finditer(date_pattern, text):
-        entities.append({
-            "entity": match.group(),
-            "type": "DATE",
-            "start": match.start(),
-            "end": match.end()
-        })
-    
-    # Extract monetary amounts
-    money_pattern = r'\$\s*\d+(?:,\d+)*(?:\.\d+)?|\d+(?:,\d+)*(?:\.\d+)?\s*(?:USD|EUR|GBP|INR)'
-    for match in re.finditer(money_pattern, text):
-        entities.append({
-            "entity": match.group(),
-            "type": "MONEY",
-            "start": match.start(),
-            "end": match.end()
-        })
-    
-    # Extract organizations
-    org_pattern = r'\b[A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)+\s+(?:Inc|LLC|Ltd|Corp|Corporation|Company)\b'
-    for match in re.finditer(org_pattern, text):
-        entities.append({
-            "entity": match.group(),
-            "type": "ORGANIZATION",
-            "start": match.start(),
-            "end": match.end()
-        })
-    
-    # Extract people names (simplified)
-    name_pattern = r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'
-    for match in re.finditer(name_pattern, text):
-        entities.append({
-            "entity": match.group(),
-            "type": "PERSON",
-            "start": match.start(),
-            "end": match.end()
-        })
-    
-    return entities
+    with stage('classification'):
+        classification = classify_terms(terms)
+    with stage('sentiment'):
+        sentiment = sentiment_from_terms(terms)
+    
+    return {
+        "classification": classification,
+        "sentiment": sentiment,
+        "entities": entities,
+        "textLength": text_length
+    }
+
+def parse_entity_cursor(cursor):
+    """Text offset a page of entities resumes from"""
+    if cursor in (None, ''):
+        return 0
+    try:
+        offset = int(cursor)
+    except (TypeError, ValueError):
+        offset = -1
+    if offset < 0:
+        raise ValueError(f"Invalid entity cursor: {cursor}")
+    return offset
+
+def iter_entity_records(chunks, entity_types=None, cap=DEFAULT_ENTITY_CAP, limit=None, cursor=None):
+    """Yield a document's entities as JSONL records, then a summary record
+
+    Each distinct (type, text) is emitted once, at its first occurrence;
+    repeats are only counted. At most `cap` distinct entities are emitted
+    per type and at most `limit` per page. When the page fills up the scan
+    stops and the summary's nextCursor resumes it from the next entity, so
+    memory and output stay bounded by the caps rather than the document.
+    A resumed page scans the text before its cursor again without emitting
+    it, which restores the deduplication and cap state: the pages together
+    are exactly the unpaged output. Classification and sentiment are
+    included once the whole text has been read.
+    """
+    types = entity_types or ENTITY_TYPES
+    start_offset = parse_entity_cursor(cursor)
+    terms = TermCounts()
+    entity_stream = get_scanner(types).stream(CHUNK_OVERLAP)
+    counts = {entity_type: {"occurrences": 0, "emitted": 0, "truncated": False} for entity_type in types}
+    # Occurrence counts of the emitted entities, bounded by cap per type
+    seen = {}
+    # Entities emitted on this page
+    emitted = 0
+    next_cursor = None
+    text_length = 0
+    
+    def settle(entities):
+        """Records for newly settled entities; sets next_cursor when the page is full"""
+        nonlocal emitted, next_cursor
+        records = []
+        for entity in entities:
+            key = (entity["type"], entity["entity"])
+            if key in seen:
+                seen[key] += 1
+                counts[entity["type"]]["occurrences"] += 1
+                continue
+            type_counts = counts[entity["type"]]
+            if type_counts["emitted"] >= cap:
+                type_counts["occurrences"] += 1
+                type_counts["truncated"] = True
+                continue
+            # Entities before the cursor were emitted by earlier pages
+            resumed = entity["start"] < start_offset
+            if not resumed and limit is not None and emitted >= limit:
+                next_cursor = str(entity["start"])
+                break
+            seen[key] = 1
+            type_counts["occurrences"] += 1
+            type_counts["emitted"] += 1
+            if not resumed:
+                emitted += 1
+                records.append(entity)
+        return records
+    
+    chunks = iter(chunks)
+    while next_cursor is None:
+        with stage('extraction'):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+        
+        text_length += len(chunk)
+        with stage('tokenize'):
+            terms.update(chunk)
+        with stage('entities'):
+            records = settle(entity_stream.feed(chunk))
+        yield from records
+    
+    summary = {"summary": True}
+    if next_cursor is None:
+        with stage('entities'):
+            records = settle(entity_stream.close())
+        yield from records
+        with stage('tokenize'):
+            terms.close()
+        with stage('classification'):
+            classification = classify_terms(terms)
+        with stage('sentiment'):
+            sentiment = sentiment_from_terms(terms)
+        summary.update(
+            category=classification["category"],
+            confidence=classification["confidence"],
+            sentiment=sentiment,
+            textLength=text_length
+        )
+    
+    summary.update(
+        counts=counts,
+        repeats=sorted(
+            ({"entity": text, "type": entity_type, "count": count} for (entity_type, text), count in seen.items() if count > 1),
+            key=lambda repeat: (-repeat["count"], repeat["type"], repeat["entity"])
+        ),
+        nextCursor=next_cursor
+    )
+    yield summary
+
+def model_version():
+    """Hash of everything the pipeline's output depends on"""
+    model = trained_classifier()
+    return version_digest(
+        PIPELINE_VERSION, DOCUMENT_CATEGORIES, POSITIVE_WORDS, NEGATIVE_WORDS,
+        ENTITY_PATTERNS, ENTITY_TYPES, TOKEN_PATTERN, model.version if model else None
+    )
+
+def process_document(document_path):
+    """Run the full document processing pipeline on a file
+
+    Results are cached by file content, so re-processing an identical
+    document only costs a hash of the file.
+    """
+    with track('document_processor') as tracker:
+        with stage('hash'):
+            file_ext = os.path.splitext(document_path)[1].lower()
+            cache_key = file_digest(document_path) + file_ext
+            cache = get_cache('document_processor', model_version())
+            cached = cache.get(cache_key) if cache else None
+        
+        if cached is not None:
+            result = dict(cached, cached=True)
+        else:
+            # Text is extracted and analyzed chunk by chunk
+            analysis = analyze_text_stream(iter_text_chunks(document_path))
+            classification = analysis["classification"]
+            
+            result = {
+                "category": classification["category"],
+                "confidence": classification["confidence"],
+                "sentiment": analysis["sentiment"],
+                "entities": analysis["entities"],
+                "textLength": analysis["textLength"],
+                "cached": False
+            }
+            if cache:
+                cache.put(cache_key, result)
+        
+        # A new dict: the cached entry must not pick up per-request fields
+        return dict(result, processingTime=round(tracker.elapsed(), 6), timings=tracker.timings())
+
+def document_entities(document_path, entity_types=None, cap=DEFAULT_ENTITY_CAP, limit=None, cursor=None):
+    """One page of a document's deduplicated entities plus its summary"""
+    with track('document_processor') as tracker:
+        records = list(iter_entity_records(iter_text_chunks(document_path), entity_types, cap, limit, cursor))
+        summary = records.pop()
+        del summary["summary"]
+        summary["processingTime"] = round(tracker.elapsed(), 6)
+        summary["timings"] = tracker.timings()
+        return dict(summary, entities=records)
+
+def handle_request(payload):
+    """Handle a document processing request from the AI worker
+
+    {"path", "entities": {"types", "cap", "limit", "cursor"}} returns one
+    bounded page of entities instead of the full analysis.
+    """
+    if not payload.get('path'):
+        raise ValueError("Missing document file path")
+    
+    options = payload.get('entities')
+    if options is not None:
+        return document_entities(
+            payload['path'],
+            options.get('types'),
+            options.get('cap', DEFAULT_ENTITY_CAP),
+            options.get('limit'),
+            options.get('cursor')
+        )
+    
+    return process_document(payload['path'])
+
+def entity_arguments(argv):
+    """Options of the --entities JSONL output mode"""
+    # Imported here: only this mode needs argument parsing
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Stream a document's entities as JSONL")
+    parser.add_argument('path')
+    parser.add_argument('--entities', action='store_true', required=True)
+    parser.add_argument('--types', default=None, help="Comma-separated entity types (default: %s)" % ','.join(ENTITY_TYPES))
+    parser.add_argument('--cap', type=int, default=DEFAULT_ENTITY_CAP, help="Distinct entities emitted per type")
+    parser.add_argument('--limit', type=int, default=None, help="Entities per page")
+    parser.add_argument('--cursor', default=None, help="nextCursor of the previous page")
+    args = parser.parse_args(argv)
+    args.types = args.types.split(',') if args.types else None
+    return args
+
+def main_entities(argv):
+    """Write entity records as JSONL, one line at a time, then the summary"""
+    args = entity_arguments(argv)
+    try:
+        with track('document_processor'):
+            records = iter_entity_records(iter_text_chunks(args.path), args.types, args.cap, args.limit, args.cursor)
+            for record in records:
+                sys.stdout.write(json.dumps(record) + '\n')
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "message": str(e)
+        }))
+        sys.exit(1)
 
 def main():
     """Main function to process documents"""
+    # JSONL batch mode: one request per line from stdin or a file
+    source = batch_source(sys.argv)
+    if source:
+        run_batch(handle_request, source)
+        return
+    
+    # JSONL entity mode for large documents
+    if '--entities' in sys.argv[1:]:
+        main_entities(sys.argv[1:])
+        return
+    
     if len(sys.argv) < 2:
         print(json.dumps({
             "success": False,
@@ -159,27 +404,8 @@ def main():
     document_path = sys.argv[1]
     
     try:
-        # Extract text from document
-        text = extract_text_from_file(document_path)
-        
-        # Classify document
-        classification = classify_document(text)
-        
-        # Analyze sentiment
-        sentiment = analyze_sentiment(text)
-        
-        # Extract entities
-        entities = extract_entities(text)
-        
         # Return result
-        result = {
-            "category": classification["category"],
-            "confidence": classification["confidence"],
-            "sentiment": sentiment,
-            "entities": entities,
-            "textLength": len(text),
-            "processingTime": random.uniform(0.5, 2.0)  # Mock processing time
-        }
+        result = process_document(document_path)
         
         print(json.dumps(result))
         
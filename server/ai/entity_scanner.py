@@ -0,0 +1,136 @@
+"""
+VibhoHCM AI Entity Scanner - Single-pass multi-pattern entity extraction
+Combines every entity pattern into one alternation with a named group per
+type, so a text is scanned once however many types are requested. Large
+documents are fed in chunks with a carried overlap so entities on chunk
+boundaries are not lost
+"""
+
+import re
+from functools import lru_cache
+
+# Simple regex patterns, in production use NER models. Order is priority:
+# where two types match at the same position the earlier one wins, so
+# "Acme Holdings Inc" is an ORGANIZATION rather than a PERSON
+ENTITY_PATTERNS = [
+    ("EMAIL", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    ("DATE", r'\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b|\b\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{2,4}\b'),
+    ("MONEY", r'\$\s*\d+(?:,\d+)*(?:\.\d+)?|\d+(?:,\d+)*(?:\.\d+)?\s*(?:USD|EUR|GBP|INR)'),
+    ("ORGANIZATION", r'\b[A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)+\s+(?:Inc|LLC|Ltd|Corp|Corporation|Company)\b'),
+    ("PERSON", r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b')
+]
+
+ENTITY_TYPES = [entity_type for entity_type, _ in ENTITY_PATTERNS]
+
+# Characters each type's matches can start with. The combined pattern
+# opens with a lookahead on their union, which lets the engine reject most
+# positions with one class test instead of trying every alternative
+START_CHARACTERS = {
+    "EMAIL": "A-Za-z0-9._%+-",
+    "DATE": "0-9",
+    "MONEY": "$0-9",
+    "ORGANIZATION": "A-Z",
+    "PERSON": "A-Z"
+}
+
+# Characters carried between chunks; longer than any entity we expect
+DEFAULT_OVERLAP = 256
+
+class EntityScanner:
+    """One compiled alternation over the requested entity types"""
+
+    def __init__(self, types=None):
+        unknown = set(types or []) - set(ENTITY_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown entity types: {', '.join(sorted(unknown))}")
+        self.types = [entity_type for entity_type in ENTITY_TYPES if types is None or entity_type in types]
+        alternatives = '|'.join(
+            f'(?P<{entity_type}>{pattern})' for entity_type, pattern in ENTITY_PATTERNS if entity_type in self.types
+        )
+        starts = ''.join(START_CHARACTERS[entity_type] for entity_type in self.types)
+        self.pattern = re.compile(f'(?=[{starts}])(?:{alternatives})')
+
+    def scan(self, text, offset=0):
+        """Entities in text, in order of position"""
+        return [
+            {
+                "entity": match.group(),
+                "type": match.lastgroup,
+                "start": offset + match.start(),
+                "end": offset + match.end()
+            }
+            for match in self.pattern.finditer(text)
+        ]
+
+    def stream(self, overlap=DEFAULT_OVERLAP):
+        """Incremental scanner for text arriving in chunks"""
+        return EntityStream(self, overlap)
+
+    def scan_chunks(self, chunks, overlap=DEFAULT_OVERLAP):
+        """Yield the entities of a chunked text with text-wide offsets"""
+        stream = self.stream(overlap)
+        for chunk in chunks:
+            yield from stream.feed(chunk)
+        yield from stream.close()
+
+class EntityStream:
+    """Feeds chunks through a scanner, carrying an overlap between them
+
+    Matches starting in the last `overlap` characters of what has been fed
+    are held back until the next chunk arrives, where they are seen whole;
+    the carry also keeps as much leading context so word boundaries at the
+    start of a window match what a single pass would see.
+    """
+
+    def __init__(self, scanner, overlap=DEFAULT_OVERLAP):
+        self.pattern = scanner.pattern
+        self.overlap = overlap
+        self.carry = ''
+        self.carry_start = 0
+        # First offset not yet covered by an emitted match
+        self.next_start = 0
+
+    def feed(self, chunk, final=False):
+        """Entities settled after adding chunk"""
+        window = self.carry + chunk
+        window_start = self.carry_start
+        window_end = window_start + len(window)
+        settled_end = window_end if final else window_end - self.overlap
+
+        # Resume where a single pass would: right after the last emitted
+        # match. Searching from a position (rather than slicing) keeps the
+        # preceding character visible to \b, and stops matches that ended
+        # before the window's carry from pairing words differently
+        found = []
+        for match in self.pattern.finditer(window, max(0, self.next_start - window_start)):
+            start = window_start + match.start()
+            if start >= settled_end:
+                break
+            found.append({
+                "entity": match.group(),
+                "type": match.lastgroup,
+                "start": start,
+                "end": window_start + match.end()
+            })
+            self.next_start = window_start + match.end()
+        self.next_start = max(self.next_start, settled_end)
+
+        self.carry = window[-2 * self.overlap:] if self.overlap else ''
+        self.carry_start = window_end - len(self.carry)
+        return found
+
+    def close(self):
+        """Entities left in the carried tail at the end of the text"""
+        return self.feed('', final=True)
+
+@lru_cache(maxsize=None)
+def _scanner(types):
+    return EntityScanner(types)
+
+def get_scanner(types=None):
+    """Shared compiled scanner for a set of entity types (None for all)"""
+    return _scanner(tuple(sorted(types)) if types is not None else None)
+
+def extract_entities(text, types=None):
+    """Entities of the given types in text, in one pass"""
+    return get_scanner(types).scan(text)
@@ -0,0 +1,203 @@
+"""
+VibhoHCM AI HR Data - Employee facts behind chatbot answers
+Defines the provider interface the chatbot reads leave, payroll, attendance
+and document facts through, a local stand-in with sample data, and a
+memoizing layer that fetches every missing fact group of an employee in
+one provider call, keeps it for a short TTL and can prefetch in the
+background while the rest of the reply is being built
+"""
+
+import os
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+FACT_GROUPS = ("leave", "payroll", "attendance", "documents")
+
+# Seconds a fetched group stays fresh; attendance changes through the day,
+# payslips once a month
+FACT_TTLS = {
+    "leave": 60,
+    "payroll": 300,
+    "attendance": 30,
+    "documents": 120
+}
+
+MAX_ENTRIES = 50000
+# Longest a lookup waits for a prefetch of the same group before fetching itself
+PREFETCH_WAIT_SECONDS = 2.0
+
+class HRDataProvider(ABC):
+    """Source of employee facts
+
+    fetch() receives every group needed for one employee at once, so an
+    implementation backed by a database or API can answer with a single
+    round trip. A subclass without fetch() cannot be instantiated.
+    """
+
+    @abstractmethod
+    def fetch(self, employee_id, groups):
+        """{group: facts} for the requested groups of one employee"""
+
+class LocalHRDataProvider(HRDataProvider):
+    """Stand-in provider: sample figures, optionally overridden per employee
+
+    The override file maps employee ids to {group: {field: value}}.
+    """
+
+    SAMPLE = {
+        "leave": {
+            "annualRemaining": 15,
+            "sickRemaining": 10,
+            "lastLeave": "March 10-15, 2024"
+        },
+        "payroll": {
+            "latestPayslip": "April 2024",
+            "netPay": 4250.00,
+            "ytdEarnings": 17000,
+            "ytdTax": 3400,
+            "nextPayDate": "May 30, 2024"
+        },
+        "attendance": {
+            "attendanceRate": 96,
+            "lastLate": "May 5, 2024",
+            "hoursWorked": 160,
+            "averageDailyHours": 8.5,
+            "daysPresent": 20,
+            "workFromHomeDays": 1
+        },
+        "documents": {
+            "documents": ["Passport", "Driver's License", "Degree Certificate", "PAN Card", "Offer Letter"],
+            "passportExpiry": "3 months"
+        }
+    }
+
+    def __init__(self, path=None):
+        self.records = {}
+        if path:
+            with open(path, 'r', encoding='utf-8') as file:
+                self.records = json.load(file)
+        self.calls = 0
+
+    def fetch(self, employee_id, groups):
+        self.calls += 1
+        record = self.records.get(employee_id, {}) if employee_id else {}
+        return {group: dict(self.SAMPLE[group], **record.get(group, {})) for group in groups}
+
+class HRData:
+    """Memoized, batched access to a provider, shared across threads"""
+
+    def __init__(self, provider, ttls=None, max_entries=MAX_ENTRIES):
+        self.provider = provider
+        self.ttls = dict(FACT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        # (employee id, group) -> (expiry, facts), least recently used first
+        self.cache = OrderedDict()
+        # (employee id, group) -> Event set when an in-flight fetch finishes
+        self.inflight = {}
+        self.lock = threading.Lock()
+
+    def get(self, employee_id, groups):
+        """{group: facts} for one employee, fetching what is missing in one call"""
+        found, missing, waiting = self._claim(employee_id, groups)
+        if missing:
+            found.update(self._load(employee_id, missing))
+
+        retry = []
+        for group, event in waiting:
+            event.wait(PREFETCH_WAIT_SECONDS)
+            facts = self._cached(employee_id, group)
+            if facts is None:
+                retry.append(group)
+            else:
+                found[group] = facts
+        if retry:
+            # The prefetch failed or is stuck; ask the provider directly
+            found.update(self.provider.fetch(employee_id, retry))
+        return found
+
+    def prefetch(self, employee_id, groups):
+        """Start fetching groups in the background; get() picks them up"""
+        _, missing, _ = self._claim(employee_id, groups)
+        if missing:
+            threading.Thread(target=self._prefetch, args=(employee_id, missing), daemon=True).start()
+
+    def _prefetch(self, employee_id, groups):
+        try:
+            self._load(employee_id, groups)
+        except Exception:
+            # get() falls back to its own fetch
+            pass
+
+    def _claim(self, employee_id, groups):
+        """Split groups into cached, to-fetch (now marked in flight) and in-flight"""
+        found = {}
+        missing = []
+        waiting = []
+        now = time.monotonic()
+        with self.lock:
+            for group in groups:
+                key = (employee_id, group)
+                entry = self.cache.get(key)
+                if entry is not None and entry[0] > now:
+                    self.cache.move_to_end(key)
+                    found[group] = entry[1]
+                elif key in self.inflight:
+                    waiting.append((group, self.inflight[key]))
+                else:
+                    self.inflight[key] = threading.Event()
+                    missing.append(group)
+        return found, missing, waiting
+
+    def _cached(self, employee_id, group):
+        with self.lock:
+            entry = self.cache.get((employee_id, group))
+            return entry[1] if entry is not None and entry[0] > time.monotonic() else None
+
+    def _load(self, employee_id, groups):
+        """Fetch claimed groups, store them and release anyone waiting"""
+        try:
+            facts = self.provider.fetch(employee_id, groups)
+            now = time.monotonic()
+            with self.lock:
+                for group, value in facts.items():
+                    self.cache[(employee_id, group)] = (now + self.ttls.get(group, 0), value)
+                    self.cache.move_to_end((employee_id, group))
+                while len(self.cache) > self.max_entries:
+                    self.cache.popitem(last=False)
+            return facts
+        finally:
+            with self.lock:
+                for group in groups:
+                    event = self.inflight.pop((employee_id, group), None)
+                    if event is not None:
+                        event.set()
+
+    def invalidate(self, employee_id, groups=FACT_GROUPS):
+        """Drop cached facts, e.g. after the employee applies for leave"""
+        with self.lock:
+            for group in groups:
+                self.cache.pop((employee_id, group), None)
+
+_hr_data = None
+_hr_data_lock = threading.Lock()
+
+def get_hr_data():
+    """Process-wide HR data access, using the local provider by default
+
+    HR_DATA_FILE points the local provider at per-employee overrides.
+    """
+    global _hr_data
+    with _hr_data_lock:
+        if _hr_data is None:
+            _hr_data = HRData(LocalHRDataProvider(os.environ.get('HR_DATA_FILE')))
+        return _hr_data
+
+def set_provider(provider, ttls=None):
+    """Serve chatbot facts from another provider (e.g. the HRMS database)"""
+    global _hr_data
+    with _hr_data_lock:
+        _hr_data = HRData(provider, ttls)
+        return _hr_data
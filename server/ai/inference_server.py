@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+VibhoHCM Inference Server - Process-pool model serving
+Dispatches requests to pre-forked worker processes with per-model
+concurrency limits and reports queue depth and worker utilization
+"""
+
+import sys
+import json
+import os
+import argparse
+import multiprocessing
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import worker
+from instrumentation import REGISTRY
+
+# CPU-heavy models only get part of the pool by default, and together
+# never more than all but one worker, so they cannot starve interactive
+# traffic such as the chatbot
+HEAVY_MODELS = ["candidate_index", "document_classifier", "document_processor", "job_matcher", "resume_parser"]
+
+REQUEST_TIMEOUT = 120
+
+def default_limits(workers):
+    """Build the default per-model concurrency caps for a pool size"""
+    limits = {}
+    for model in worker.MODELS:
+        if model in HEAVY_MODELS:
+            limits[model] = max(1, workers // 2)
+        else:
+            limits[model] = workers
+    return limits
+
+def is_heavy(model, payload):
+    """Whether a request counts against the shared heavy-model limit
+
+    Org-wide attendance analytics runs every employee's analysis in one
+    request, so it is heavy even though single-employee requests are not.
+    """
+    if model in HEAVY_MODELS:
+        return True
+    return model == "attendance_analytics" and bool((payload or {}).get('byEmployee'))
+
+def heavy_limit(workers):
+    """Workers the heavy models may occupy together: all but one"""
+    return max(1, workers - 1)
+
+def parse_limits(specs, workers):
+    """Parse model=N overrides on top of the default caps"""
+    limits = default_limits(workers)
+    for spec in specs or []:
+        model, _, value = spec.partition('=')
+        if model not in worker.MODELS:
+            raise ValueError(f"Unknown model in limit: {model}")
+        limits[model] = max(1, int(value))
+    return limits
+
+class ModelScheduler:
+    """Admit requests into the process pool under per-model limits"""
+
+    def __init__(self, workers, limits):
+        self.workers = workers
+        self.limits = limits
+        self.pool = multiprocessing.get_context('fork').Pool(processes=workers)
+        self.slots = {model: threading.BoundedSemaphore(cap) for model, cap in limits.items()}
+        self.heavy_limit = heavy_limit(workers)
+        self.heavy_slots = threading.BoundedSemaphore(self.heavy_limit)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.stats = {
+            model: {"queued": 0, "running": 0, "completed": 0, "failed": 0, "busySeconds": 0.0}
+            for model in limits
+        }
+
+    def _update(self, model, **deltas):
+        with self.lock:
+            entry = self.stats[model]
+            for key, delta in deltas.items():
+                entry[key] += delta
+
+    def run(self, model, payload, profile=False, trace_memory=False, timeout=REQUEST_TIMEOUT):
+        """Run a request in the pool, waiting for a free model slot
+
+        Returns (result, timings); timings measured in the worker process
+        are folded into this process's metrics registry. A request that
+        times out keeps its slots until the pool process is done with it,
+        so the limits always match the work actually running.
+        """
+        if model not in self.slots:
+            raise ValueError(f"Unknown model: {model}")
+
+        slots = [self.slots[model]]
+        if is_heavy(model, payload):
+            slots.append(self.heavy_slots)
+
+        self._update(model, queued=1)
+        for slot in slots:
+            slot.acquire()
+        self._update(model, queued=-1, running=1)
+
+        started = time.perf_counter()
+
+        def finish(_):
+            self._update(model, running=-1, busySeconds=time.perf_counter() - started)
+            for slot in slots:
+                slot.release()
+
+        try:
+            pending = self.pool.apply_async(
+                worker.dispatch_tracked, (model, payload, profile, trace_memory),
+                callback=finish, error_callback=finish
+            )
+        except Exception:
+            self._update(model, failed=1)
+            finish(None)
+            raise
+
+        try:
+            result, timings = pending.get(timeout)
+        except Exception:
+            self._update(model, failed=1)
+            raise
+        REGISTRY.observe(model, timings)
+        self._update(model, completed=1)
+        return result, timings
+
+    def snapshot(self):
+        """Report queue depth, in-flight work and worker utilization"""
+        with self.lock:
+            models = {
+                model: dict(entry, limit=self.limits[model], busySeconds=round(entry["busySeconds"], 3))
+                for model, entry in self.stats.items()
+            }
+
+        busy = sum(entry["running"] for entry in models.values())
+        busy_seconds = sum(entry["busySeconds"] for entry in models.values())
+        uptime = time.time() - self.started
+
+        return {
+            "workers": self.workers,
+            "busyWorkers": min(busy, self.workers),
+            "queueDepth": sum(entry["queued"] for entry in models.values()),
+            "utilization": round(min(busy, self.workers) / self.workers, 3),
+            "averageUtilization": round(busy_seconds / (uptime * self.workers), 3) if uptime > 0 else 0,
+            "uptime": round(uptime, 1),
+            "heavyLimit": self.heavy_limit,
+            "models": models
+        }
+
+    def export_prometheus(self):
+        """Stage metrics plus pool gauges in Prometheus text format"""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP vibhohcm_ai_pool_workers Worker processes in the pool.",
+            "# TYPE vibhohcm_ai_pool_workers gauge",
+            f"vibhohcm_ai_pool_workers {snapshot['workers']}",
+            "# HELP vibhohcm_ai_pool_busy_workers Worker processes currently serving a request.",
+            "# TYPE vibhohcm_ai_pool_busy_workers gauge",
+            f"vibhohcm_ai_pool_busy_workers {snapshot['busyWorkers']}",
+            "# HELP vibhohcm_ai_queue_depth Requests waiting for a model slot.",
+            "# TYPE vibhohcm_ai_queue_depth gauge"
+        ]
+        for model, entry in sorted(snapshot["models"].items()):
+            lines.append(f'vibhohcm_ai_queue_depth{{model="{model}"}} {entry["queued"]}')
+        return REGISTRY.export_prometheus() + "\n".join(lines) + "\n"
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for the model scheduler"""
+
+    server_version = "VibhoHCM-AI/1.0"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_text(self, status, text):
+        data = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {"success": True})
+        elif self.path == '/stats':
+            self._send_json(200, self.server.scheduler.snapshot())
+        elif self.path == '/metrics':
+            self._send_text(200, self.server.scheduler.export_prometheus())
+        else:
+            self._send_json(404, {"success": False, "message": "Not found"})
+
+    def do_POST(self):
+        # POST /models/<model> with the payload as body, or POST /infer
+        # with the same {"id", "model", "payload"} envelope as worker.py
+        try:
+            body = self._read_json()
+        except ValueError as e:
+            self._send_json(400, {"success": False, "message": f"Invalid request: {e}"})
+            return
+
+        if not isinstance(body, dict):
+            self._send_json(400, {"success": False, "message": "Invalid request: body must be a JSON object"})
+            return
+
+        if self.path == '/infer':
+            request_id = body.get('id')
+            model = body.get('model')
+            payload = body.get('payload') or {}
+            options = body
+        elif self.path.startswith('/models/'):
+            request_id = None
+            model = self.path[len('/models/'):]
+            payload = body
+            options = self.headers_options()
+        else:
+            self._send_json(404, {"success": False, "message": "Not found"})
+            return
+
+        if not isinstance(payload, dict):
+            self._send_json(400, {"id": request_id, "success": False, "message": "Invalid request: payload must be a JSON object"})
+            return
+
+        if model not in worker.MODELS:
+            self._send_json(404, {"id": request_id, "success": False, "message": f"Unknown model: {model}"})
+            return
+
+        try:
+            result, timings = self.server.scheduler.run(
+                model,
+                payload,
+                profile=options.get('profile', False),
+                trace_memory=options.get('traceMemory', False)
+            )
+            self._send_json(200, {"id": request_id, "success": True, "result": result, "timings": timings})
+        except Exception as e:
+            self._send_json(500, {"id": request_id, "success": False, "message": str(e)})
+
+    def headers_options(self):
+        """Per-request profiling switches passed as X-AI-* headers"""
+        return {
+            "profile": self.headers.get('X-AI-Profile') == '1',
+            "traceMemory": self.headers.get('X-AI-Trace-Memory') == '1'
+        }
+
+    def address_string(self):
+        # Unix socket clients have no host/port tuple
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            sys.stderr.write("%s - %s\n" % (self.address_string(), format % args))
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server bound to a Unix domain socket"""
+
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+def create_server(args, scheduler):
+    """Create the HTTP server on TCP or a Unix socket"""
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        server = UnixHTTPServer(args.socket, InferenceRequestHandler)
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), InferenceRequestHandler)
+        server.daemon_threads = True
+
+    server.scheduler = scheduler
+    server.verbose = args.verbose
+    return server
+
+def main():
+    """Main function to run the inference server"""
+    parser = argparse.ArgumentParser(description="VibhoHCM AI inference server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', help="Serve HTTP on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of pre-forked worker processes (default: CPU count)")
+    parser.add_argument('--limit', action='append', metavar='MODEL=N',
+                        help="Maximum concurrent requests for a model (repeatable)")
+    parser.add_argument('--verbose', action='store_true', help="Log every request to stderr")
+    args = parser.parse_args()
+
+    try:
+        workers = max(1, args.workers)
+        limits = parse_limits(args.limit, workers)
+    except ValueError as e:
+        print(json.dumps({
+            "success": False,
+            "message": str(e)
+        }))
+        sys.exit(1)
+
+    # Load heavy dependencies before forking so every worker starts warm
+    worker.preload()
+    scheduler = ModelScheduler(workers, limits)
+    server = create_server(args, scheduler)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        scheduler.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+if __name__ == "__main__":
+    main()
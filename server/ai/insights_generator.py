@@ -6,9 +6,12 @@ Generates AI insights for various HR data
 
 import sys
 import json
-import os
 import random
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from batch import batch_source, run_batch
+from instrumentation import stage, track
+from json_input import load_json_argument
 
 def generate_performance_insights(data):
     """Generate insights for performance data"""
@@ -224,8 +227,38 @@ def generate_recruitment_insights(data):
     
     return insights
 
+def generate_insights(insight_type, data):
+    """Generate insights for the requested insight type
+
+    The response is a bare list, so stage timings are only reported through
+    the worker envelope and the metrics registry.
+    """
+    generators = {
+        'performance': generate_performance_insights,
+        'attendance': generate_attendance_insights,
+        'recruitment': generate_recruitment_insights
+    }
+    
+    generator = generators.get(insight_type)
+    if generator is None:
+        return []
+    
+    with track('insights_generator'):
+        with stage(insight_type):
+            return generator(data)
+
+def handle_request(payload):
+    """Handle an insights request from the AI worker"""
+    return generate_insights(payload.get('type'), payload.get('data', {}))
+
 def main():
     """Main function to generate insights"""
+    # JSONL batch mode: one request per line from stdin or a file
+    source = batch_source(sys.argv)
+    if source:
+        run_batch(handle_request, source)
+        return
+    
     if len(sys.argv) < 3:
         print(json.dumps({
             "success": False,
@@ -235,17 +268,11 @@ def main():
     
     try:
         insight_type = sys.argv[1]
-        data = json.loads(sys.argv[2])
+        # Data may be inline JSON, stdin ('-') or a file ('@path')
+        data = load_json_argument(sys.argv[2])
         
         # Generate insights based on type
-        if insight_type == 'performance':
-            insights = generate_performance_insights(data)
-        elif insight_type == 'attendance':
-            insights = generate_attendance_insights(data)
-        elif insight_type == 'recruitment':
-            insights = generate_recruitment_insights(data)
-        else:
-            insights = []
+        insights = generate_insights(insight_type, data)
         
         # Return insights
         print(json.dumps(insights))
@@ -0,0 +1,209 @@
+"""
+VibhoHCM AI Instrumentation - Per-stage timing and metrics
+Records wall and CPU time for each pipeline stage, aggregates them for
+Prometheus export and optionally captures cProfile/tracemalloc output
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_LIMIT = 25
+MEMORY_LIMIT = 10
+
+_current = contextvars.ContextVar('vibhohcm_ai_tracker', default=None)
+
+class RequestTracker:
+    """Timings collected while serving one request"""
+
+    def __init__(self, model, profile=False, trace_memory=False):
+        self.model = model
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.profile_report = None
+        self.memory_report = None
+        self._profiler = None
+        self._owns_tracemalloc = False
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._wall = None
+        self._cpu = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block of work under the given stage name"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, [0.0, 0.0])
+            entry[0] += time.perf_counter() - wall_start
+            entry[1] += time.process_time() - cpu_start
+
+    def elapsed(self):
+        """Wall seconds since the request started (or its final duration)"""
+        if self._wall is not None:
+            return self._wall
+        return time.perf_counter() - self._wall_start
+
+    def start(self):
+        # Profilers are imported only when a request asks for them
+        if self.trace_memory:
+            import tracemalloc
+            self._owns_tracemalloc = not tracemalloc.is_tracing()
+            if self._owns_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        if self.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self):
+        self._wall = time.perf_counter() - self._wall_start
+        self._cpu = time.process_time() - self._cpu_start
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.profile_report = summarize_profile(self._profiler)
+            self._profiler = None
+        if self.trace_memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                self.memory_report = summarize_memory()
+                if self._owns_tracemalloc:
+                    tracemalloc.stop()
+
+    def timings(self):
+        """Stage timings in seconds, suitable for a JSON response"""
+        report = {
+            "stages": {
+                name: {"wall": round(wall, 6), "cpu": round(cpu, 6)}
+                for name, (wall, cpu) in self.stages.items()
+            },
+            "total": {
+                "wall": round(self.elapsed(), 6),
+                "cpu": round(self._cpu if self._cpu is not None else time.process_time() - self._cpu_start, 6)
+            }
+        }
+        if self.profile_report is not None:
+            report["profile"] = self.profile_report
+        if self.memory_report is not None:
+            report["memory"] = self.memory_report
+        return report
+
+def summarize_profile(profiler, limit=PROFILE_LIMIT):
+    """Top functions by cumulative time from a cProfile run"""
+    import pstats
+    stats = pstats.Stats(profiler).stats
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in stats.items():
+        rows.append({
+            "function": f"{filename}:{line}({function})",
+            "calls": calls,
+            "total": round(total, 6),
+            "cumulative": round(cumulative, 6)
+        })
+    rows.sort(key=lambda row: row["cumulative"], reverse=True)
+    return rows[:limit]
+
+def summarize_memory(limit=MEMORY_LIMIT):
+    """Current/peak traced memory and the largest allocation sites"""
+    import tracemalloc
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    top = snapshot.statistics('lineno')[:limit]
+    return {
+        "currentBytes": current,
+        "peakBytes": peak,
+        "top": [
+            {"location": str(stat.traceback), "sizeBytes": stat.size, "count": stat.count}
+            for stat in top
+        ]
+    }
+
+class MetricsRegistry:
+    """Process-wide aggregate of request and stage timings"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.stages = {}
+
+    def observe(self, model, timings):
+        """Add one request's timings report to the aggregates"""
+        with self.lock:
+            entry = self.requests.setdefault(model, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += timings["total"]["wall"]
+            entry[2] += timings["total"]["cpu"]
+            for name, stage in timings["stages"].items():
+                entry = self.stages.setdefault((model, name), [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += stage["wall"]
+                entry[2] += stage["cpu"]
+
+    def export_prometheus(self):
+        """Render the aggregates in the Prometheus text exposition format"""
+        with self.lock:
+            requests = sorted(self.requests.items())
+            stages = sorted(self.stages.items())
+
+        lines = [
+            "# HELP vibhohcm_ai_request_seconds Wall time spent serving AI requests.",
+            "# TYPE vibhohcm_ai_request_seconds summary"
+        ]
+        for model, (count, wall, _) in requests:
+            lines.append(f'vibhohcm_ai_request_seconds_sum{{model="{model}"}} {wall:.6f}')
+            lines.append(f'vibhohcm_ai_request_seconds_count{{model="{model}"}} {count}')
+
+        lines.append("# HELP vibhohcm_ai_request_cpu_seconds_total CPU time spent serving AI requests.")
+        lines.append("# TYPE vibhohcm_ai_request_cpu_seconds_total counter")
+        for model, (_, _, cpu) in requests:
+            lines.append(f'vibhohcm_ai_request_cpu_seconds_total{{model="{model}"}} {cpu:.6f}')
+
+        lines.append("# HELP vibhohcm_ai_stage_seconds Wall time spent in each pipeline stage.")
+        lines.append("# TYPE vibhohcm_ai_stage_seconds summary")
+        for (model, name), (count, wall, _) in stages:
+            lines.append(f'vibhohcm_ai_stage_seconds_sum{{model="{model}",stage="{name}"}} {wall:.6f}')
+            lines.append(f'vibhohcm_ai_stage_seconds_count{{model="{model}",stage="{name}"}} {count}')
+
+        lines.append("# HELP vibhohcm_ai_stage_cpu_seconds_total CPU time spent in each pipeline stage.")
+        lines.append("# TYPE vibhohcm_ai_stage_cpu_seconds_total counter")
+        for (model, name), (_, _, cpu) in stages:
+            lines.append(f'vibhohcm_ai_stage_cpu_seconds_total{{model="{model}",stage="{name}"}} {cpu:.6f}')
+
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+@contextmanager
+def track(model, profile=False, trace_memory=False):
+    """Track one request; nested calls join the outer request's tracker"""
+    tracker = _current.get()
+    if tracker is not None:
+        yield tracker
+        return
+
+    tracker = RequestTracker(model, profile=bool(profile), trace_memory=bool(trace_memory))
+    token = _current.set(tracker)
+    tracker.start()
+    try:
+        yield tracker
+    finally:
+        tracker.stop()
+        _current.reset(token)
+        REGISTRY.observe(model, tracker.timings())
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage against the current request, if any"""
+    tracker = _current.get()
+    if tracker is None:
+        yield
+        return
+
+    with tracker.stage(name):
+        yield
@@ -0,0 +1,268 @@
+"""
+VibhoHCM AI Intent Index - Chatbot intents compiled from model.nlp
+Loads the trained NLP model shipped with the app (stem dictionary and
+per-intent features) once and compiles it into a stem -> intent postings
+table, so classifying a message costs one hash lookup per token however
+many intents the model has
+"""
+
+import os
+import re
+import json
+import math
+import threading
+from functools import lru_cache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MODEL_PATH = os.path.join(REPO_ROOT, 'model.nlp')
+
+LOCALE = 'en'
+
+# Function words carry no intent on their own; model.nlp keeps them as
+# features, so they are weighted zero here rather than dropped from it
+STOPWORDS = frozenset([
+    "a", "am", "an", "and", "are", "at", "be", "been", "can", "could", "do", "doe",
+    "for", "from", "has", "have", "how", "i", "in", "is", "it", "me", "my", "of",
+    "on", "or", "pleas", "s", "that", "the", "this", "to", "was", "what", "when",
+    "where", "which", "will", "with", "would", "you", "your"
+])
+
+# Weight of a message stem the model has never seen: as uninformative as a
+# feature every intent shares, but it still dilutes the confidence
+UNKNOWN_WEIGHT = math.log(2)
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+def model_path():
+    """model.nlp location, overridable with CHATBOT_NLP_MODEL"""
+    return os.environ.get('CHATBOT_NLP_MODEL') or DEFAULT_MODEL_PATH
+
+# --- English stemmer ----------------------------------------------------
+# model.nlp was trained with the Snowball English (Porter2) stemmer, so
+# messages must be stemmed the same way to hit its stems
+
+_VOWELS = frozenset('aeiouy')
+_DOUBLES = ('bb', 'dd', 'ff', 'gg', 'mm', 'nn', 'pp', 'rr', 'tt')
+_LI_ENDINGS = frozenset('cdeghkmnrt')
+
+_EXCEPTIONS = {
+    'skis': 'ski', 'skies': 'sky', 'dying': 'die', 'lying': 'lie', 'tying': 'tie',
+    'idly': 'idl', 'gently': 'gentl', 'ugly': 'ugli', 'early': 'earli', 'only': 'onli',
+    'singly': 'singl', 'sky': 'sky', 'news': 'news', 'howe': 'howe', 'atlas': 'atlas',
+    'cosmos': 'cosmos', 'bias': 'bias', 'andes': 'andes'
+}
+_INVARIANT_AFTER_1A = frozenset(['inning', 'outing', 'canning', 'herring', 'earring', 'proceed', 'exceed', 'succeed'])
+
+_STEP2 = [
+    ('ization', 'ize'), ('ational', 'ate'), ('fulness', 'ful'), ('ousness', 'ous'), ('iveness', 'ive'),
+    ('tional', 'tion'), ('biliti', 'ble'), ('lessli', 'less'), ('entli', 'ent'), ('ation', 'ate'),
+    ('alism', 'al'), ('aliti', 'al'), ('ousli', 'ous'), ('iviti', 'ive'), ('fulli', 'ful'),
+    ('enci', 'ence'), ('anci', 'ance'), ('abli', 'able'), ('izer', 'ize'), ('ator', 'ate'),
+    ('alli', 'al'), ('bli', 'ble'), ('ogi', 'og'), ('li', '')
+]
+_STEP3 = [
+    ('ational', 'ate'), ('tional', 'tion'), ('alize', 'al'), ('icate', 'ic'), ('iciti', 'ic'),
+    ('ative', ''), ('ical', 'ic'), ('ness', ''), ('ful', '')
+]
+_STEP4 = [
+    'ement', 'ance', 'ence', 'able', 'ible', 'ment', 'ant', 'ent', 'ism', 'ate', 'iti',
+    'ous', 'ive', 'ize', 'ion', 'al', 'er', 'ic'
+]
+
+def _regions(word):
+    """Start offsets of the R1 and R2 regions"""
+    def region_after(start):
+        for i in range(start + 1, len(word)):
+            if word[i] not in _VOWELS and word[i - 1] in _VOWELS:
+                return i + 1
+        return len(word)
+
+    for prefix in ('gener', 'commun', 'arsen'):
+        if word.startswith(prefix):
+            r1 = len(prefix)
+            break
+    else:
+        r1 = region_after(0)
+    return r1, region_after(r1)
+
+def _ends_short_syllable(word):
+    if len(word) == 2:
+        return word[0] in _VOWELS and word[1] not in _VOWELS
+    return (
+        len(word) >= 3 and word[-3] not in _VOWELS and word[-2] in _VOWELS
+        and word[-1] not in _VOWELS and word[-1] not in 'wxY'
+    )
+
+def _suffix(word, suffixes):
+    """Longest suffix of word from suffixes (longest first), or None"""
+    for entry in suffixes:
+        suffix = entry[0] if isinstance(entry, tuple) else entry
+        if word.endswith(suffix):
+            return entry
+    return None
+
+@lru_cache(maxsize=1 << 16)
+def stem(word):
+    """Snowball English stem of a lowercase word"""
+    if len(word) <= 2:
+        return word
+    if word in _EXCEPTIONS:
+        return _EXCEPTIONS[word]
+
+    # Consonant-like y is marked Y so the vowel tests skip it
+    if word[0] == 'y':
+        word = 'Y' + word[1:]
+    word = ''.join('Y' if char == 'y' and i and word[i - 1] in _VOWELS else char for i, char in enumerate(word))
+    r1, r2 = _regions(word)
+
+    # Step 0 has no work here: apostrophes never survive tokenizing
+
+    # Step 1a: plurals
+    if word.endswith('sses'):
+        word = word[:-2]
+    elif word.endswith(('ied', 'ies')):
+        word = word[:-2] if len(word) > 4 else word[:-1]
+    elif word.endswith(('us', 'ss')):
+        pass
+    elif word.endswith('s') and any(char in _VOWELS for char in word[:-2]):
+        word = word[:-1]
+
+    if word in _INVARIANT_AFTER_1A:
+        return word
+
+    # Step 1b: -ed, -ing and friends
+    suffix = _suffix(word, ('eedly', 'ingly', 'edly', 'eed', 'ing', 'ed'))
+    if suffix in ('eedly', 'eed'):
+        if len(word) - len(suffix) >= r1:
+            word = word[:-len(suffix)] + 'ee'
+    elif suffix:
+        stem_part = word[:-len(suffix)]
+        if any(char in _VOWELS for char in stem_part):
+            word = stem_part
+            if word.endswith(('at', 'bl', 'iz')):
+                word += 'e'
+            elif word.endswith(_DOUBLES):
+                word = word[:-1]
+            elif r1 >= len(word) and _ends_short_syllable(word):
+                word += 'e'
+
+    # Step 1c: y -> i after a consonant that is not the first letter
+    if len(word) > 2 and word[-1] in 'yY' and word[-2] not in _VOWELS:
+        word = word[:-1] + 'i'
+
+    # Step 2: double suffixes, inside R1
+    entry = _suffix(word, _STEP2)
+    if entry and len(word) - len(entry[0]) >= r1:
+        suffix, replacement = entry
+        if suffix == 'ogi':
+            if word[-4:-3] == 'l':
+                word = word[:-3] + replacement
+        elif suffix == 'li':
+            if word[-3:-2] in _LI_ENDINGS:
+                word = word[:-2]
+        else:
+            word = word[:-len(suffix)] + replacement
+
+    # Step 3: inside R1, -ative inside R2
+    entry = _suffix(word, _STEP3)
+    if entry and len(word) - len(entry[0]) >= r1:
+        suffix, replacement = entry
+        if suffix != 'ative' or len(word) - len(suffix) >= r2:
+            word = word[:-len(suffix)] + replacement
+
+    # Step 4: single suffixes, inside R2
+    suffix = _suffix(word, _STEP4)
+    if suffix and len(word) - len(suffix) >= r2:
+        if suffix != 'ion' or word[-4:-3] in ('s', 't'):
+            word = word[:-len(suffix)]
+
+    # Step 5: final e and ll
+    if word.endswith('e'):
+        if len(word) - 1 >= r2 or (len(word) - 1 >= r1 and not _ends_short_syllable(word[:-1])):
+            word = word[:-1]
+    elif word.endswith('ll') and len(word) - 1 >= r2:
+        word = word[:-1]
+
+    return word.replace('Y', 'y')
+
+def stems(text):
+    """Stems of the words in text, in order"""
+    return [stem(word) for word in WORD_PATTERN.findall(text.lower())]
+
+# --- Index --------------------------------------------------------------
+
+class IntentIndex:
+    """Stem -> intent postings compiled from a model.nlp file"""
+
+    def __init__(self, model):
+        domain_manager = model['nluManager']['domainManagers'][LOCALE]
+        self.threshold = model.get('settings', {}).get('threshold', 0.5)
+
+        # Whole utterances the model was trained on, keyed like node-nlp:
+        # the sorted distinct stems joined with commas
+        self.exact = {key: entry['intent'] for key, entry in domain_manager.get('stemDict', {}).items()}
+
+        intent_features = {}
+        for domain in domain_manager.get('domains', {}).values():
+            for intent, features in domain.get('intentFeatures', {}).items():
+                intent_features.setdefault(intent, set()).update(features)
+        self.intents = sorted(intent_features)
+
+        # Inverse intent frequency: a stem shared by every intent says
+        # nothing, one unique to an intent says a lot
+        document_frequency = {}
+        for features in intent_features.values():
+            for feature in features:
+                document_frequency[feature] = document_frequency.get(feature, 0) + 1
+        self.weights = {
+            feature: 0.0 if feature in STOPWORDS else math.log(1 + len(self.intents) / frequency)
+            for feature, frequency in document_frequency.items()
+        }
+        self.postings = {}
+        for intent_id, intent in enumerate(self.intents):
+            for feature in intent_features[intent]:
+                if self.weights[feature] > 0:
+                    self.postings.setdefault(feature, []).append(intent_id)
+
+    def classify(self, text):
+        """Best model intent for a message: {"intent", "confidence"} or None"""
+        message_stems = set(stems(text))
+        exact = self.exact.get(','.join(sorted(message_stems)))
+        if exact is not None:
+            return {"intent": exact, "confidence": 1.0}
+
+        scores = [0.0] * len(self.intents)
+        total = 0.0
+        for message_stem in message_stems:
+            weight = self.weights.get(message_stem, UNKNOWN_WEIGHT)
+            total += weight
+            for intent_id in self.postings.get(message_stem, ()):
+                scores[intent_id] += weight
+        if total == 0:
+            return None
+
+        best = max(range(len(scores)), key=scores.__getitem__)
+        runner_up = max((score for intent_id, score in enumerate(scores) if intent_id != best), default=0.0)
+        # Share of the message the intent explains, discounted when another
+        # intent explains it nearly as well
+        confidence = scores[best] / (total + runner_up)
+        if confidence < self.threshold:
+            return None
+        return {"intent": self.intents[best], "confidence": round(confidence, 4)}
+
+_load_lock = threading.Lock()
+
+@lru_cache(maxsize=4)
+def _load(path, mtime):
+    with open(path, 'r', encoding='utf-8') as file:
+        return IntentIndex(json.load(file))
+
+def get_intent_index(path=None):
+    """Compiled index of model.nlp, loaded once per process (None if missing)"""
+    path = path or model_path()
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _load_lock:
+        return _load(path, mtime)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+VibhoHCM Job Matcher - Candidate x job-opening match matrix
+Encodes skill sets as packed bitsets and scores every candidate against
+every opening with vectorized AND + popcount, keeping the top matches per
+candidate and per opening
+"""
+
+import sys
+import json
+
+import numpy as np
+
+from batch import batch_source, run_batch
+from instrumentation import stage, track
+from json_input import load_json_argument
+
+# Same weights as resume_parser.score_against_requirements
+SKILL_POINTS = 70
+EXPERIENCE_POINTS = 20
+MAX_EXTRA_SKILLS = 10
+
+# Candidates scored per block, bounding the score matrix held in memory
+BLOCK_SIZE = 4096
+
+# 64-bit words ANDed at once when counting shared skills, bounding the
+# (candidates x openings x words) intermediate to 8 MB
+OVERLAP_WORDS = 1 << 20
+
+# Set bits per byte, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+def build_vocabulary(candidates, openings):
+    """Map lowercased skill name -> column index"""
+    vocabulary = {}
+    for record in list(candidates) + list(openings):
+        for skill in record.get('skills') or []:
+            vocabulary.setdefault(skill.lower(), len(vocabulary))
+    return vocabulary
+
+def encode_skills(records, vocabulary):
+    """Skill sets as packed bitsets: (records x words) uint64, bit c = skill c
+
+    Memory is one bit per vocabulary skill per record, and only the set
+    bits are ever touched while encoding.
+    """
+    words = max(1, (len(vocabulary) + 63) // 64)
+    rows = []
+    columns = []
+    for row, record in enumerate(records):
+        for skill in record.get('skills') or []:
+            column = vocabulary.get(skill.lower())
+            if column is not None:
+                rows.append(row)
+                columns.append(column)
+
+    bitsets = np.zeros((len(records), words), dtype=np.uint64)
+    columns = np.asarray(columns, dtype=np.uint64)
+    np.bitwise_or.at(bitsets, (np.asarray(rows, dtype=np.intp), (columns >> np.uint64(6)).astype(np.intp)),
+                     np.uint64(1) << (columns & np.uint64(63)))
+    return bitsets
+
+def popcount(words):
+    """Set bits in each element of a uint64 array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    words = np.ascontiguousarray(words)
+    return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+def skill_overlap(candidate_skills, opening_skills):
+    """Shared skill counts (candidates x openings) of two bitset matrices"""
+    overlap = np.empty((len(candidate_skills), len(opening_skills)), dtype=np.float32)
+    step = max(1, OVERLAP_WORDS // max(1, opening_skills.size))
+    for start in range(0, len(candidate_skills), step):
+        shared = candidate_skills[start:start + step, None, :] & opening_skills[None, :, :]
+        overlap[start:start + step] = popcount(shared).sum(axis=2)
+    return overlap
+
+def score_block(candidate_skills, candidate_experience, opening_skills, min_experience):
+    """Match scores (candidates x openings) for one block of candidates"""
+    overlap = skill_overlap(candidate_skills, opening_skills)
+    required = popcount(opening_skills).sum(axis=1).astype(np.float32)
+    have = popcount(candidate_skills).sum(axis=1).astype(np.float32)
+
+    coverage = np.divide(overlap, required, out=np.ones_like(overlap), where=required > 0)
+    experience_fit = np.minimum(
+        np.divide(candidate_experience[:, None], min_experience[None, :],
+                  out=np.ones((len(candidate_experience), len(min_experience)), dtype=np.float32),
+                  where=min_experience[None, :] > 0),
+        1.0
+    )
+    extra = np.minimum(have[:, None] - overlap, MAX_EXTRA_SKILLS)
+
+    return np.rint(coverage * SKILL_POINTS + experience_fit * EXPERIENCE_POINTS + extra)
+
+def top_k_rows(scores, k):
+    """Column indices of the k best scores in each row, best first"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    if k < scores.shape[1]:
+        indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        indices = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    # Order by score, then by original position for stable ties
+    picked = np.take_along_axis(scores, indices, axis=1)
+    order = np.lexsort((indices, -picked), axis=1)
+    return np.take_along_axis(indices, order, axis=1)
+
+def match_pipeline(candidates, openings, top=10):
+    """Top openings for every candidate and top candidates for every opening"""
+    with track('job_matcher') as tracker:
+        with stage('encode'):
+            vocabulary = build_vocabulary(candidates, openings)
+            candidate_skills = encode_skills(candidates, vocabulary)
+            opening_skills = encode_skills(openings, vocabulary)
+            candidate_experience = np.asarray([c.get('experience') or 0 for c in candidates], dtype=np.float32)
+            min_experience = np.asarray([o.get('minExperience') or 0 for o in openings], dtype=np.float32)
+
+        by_candidate = []
+        # Running best candidates per opening: (k x openings) scores and rows
+        best_scores = np.empty((0, len(openings)), dtype=np.float32)
+        best_rows = np.empty((0, len(openings)), dtype=np.int64)
+
+        with stage('scoring'):
+            for start in range(0, len(candidates), BLOCK_SIZE):
+                end = min(start + BLOCK_SIZE, len(candidates))
+                scores = score_block(
+                    candidate_skills[start:end], candidate_experience[start:end], opening_skills, min_experience
+                )
+                if not len(openings):
+                    by_candidate.extend([] for _ in range(end - start))
+                    continue
+
+                best_openings = top_k_rows(scores, top)
+                by_candidate.extend(
+                    [(int(job), float(scores[row, job])) for job in best_openings[row]]
+                    for row in range(end - start)
+                )
+
+                # Merge this block's best candidates into the running top-k
+                block_best = top_k_rows(scores.T, top).T
+                merged_scores = np.vstack([best_scores, np.take_along_axis(scores, block_best, axis=0)])
+                merged_rows = np.vstack([best_rows, block_best + start])
+                keep = top_k_rows(merged_scores.T, top).T
+                best_scores = np.take_along_axis(merged_scores, keep, axis=0)
+                best_rows = np.take_along_axis(merged_rows, keep, axis=0)
+
+        with stage('results'):
+            result = {
+                "byCandidate": [
+                    {
+                        "candidateId": candidate.get('candidateId'),
+                        "matches": [
+                            {"jobId": openings[job].get('jobId'), "title": openings[job].get('title'), "score": int(score)}
+                            for job, score in matches
+                        ]
+                    }
+                    for candidate, matches in zip(candidates, by_candidate)
+                ],
+                "byOpening": [
+                    {
+                        "jobId": opening.get('jobId'),
+                        "matches": [
+                            {"candidateId": candidates[int(row)].get('candidateId'), "score": int(score)}
+                            for row, score in zip(best_rows[:, column], best_scores[:, column])
+                        ]
+                    }
+                    for column, opening in enumerate(openings)
+                ]
+            }
+
+        return dict(result, timings=tracker.timings())
+
+def handle_request(payload):
+    """Handle a matching request from the AI worker"""
+    return match_pipeline(payload.get('candidates', []), payload.get('openings', []), int(payload.get('top', 10)))
+
+def main():
+    """Main function to match candidates against job openings"""
+    # JSONL batch mode: one request per line from stdin or a file
+    source = batch_source(sys.argv)
+    if source:
+        run_batch(handle_request, source)
+        return
+
+    if len(sys.argv) < 2:
+        print(json.dumps({
+            "success": False,
+            "message": "Missing candidates and openings data"
+        }))
+        sys.exit(1)
+
+    try:
+        # Data may be inline JSON, stdin ('-') or a file ('@path')
+        result = handle_request(load_json_argument(sys.argv[1]))
+
+        print(json.dumps(result))
+
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "message": str(e)
+        }))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
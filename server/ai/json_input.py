@@ -0,0 +1,131 @@
+"""
+VibhoHCM AI JSON Input - Large payload input helpers
+Lets the scripts read JSON arguments from stdin or a file instead of argv,
+and stream the elements of a top-level array without loading the whole
+document into memory
+"""
+
+import sys
+import json
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\r\n'
+_DELIMITERS = _WHITESPACE + ',]'
+
+def is_input_reference(arg):
+    """True when a CLI argument points at stdin ('-') or a file ('@path')"""
+    return arg == '-' or arg.startswith('@')
+
+def open_input(arg):
+    """Open the stream an input reference points at"""
+    if arg == '-':
+        return sys.stdin
+    return open(arg[1:], 'r', encoding='utf-8')
+
+def load_json_argument(arg):
+    """Decode a JSON CLI argument, following stdin/file references"""
+    if not is_input_reference(arg):
+        return json.loads(arg)
+
+    stream = open_input(arg)
+    try:
+        return json.load(stream)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def iter_json_records(stream, chunk_size=CHUNK_SIZE):
+    """Yield records from a JSON array or a JSONL stream incrementally
+
+    Only one chunk of text plus the record being decoded is held in memory,
+    so histories far larger than ARG_MAX never become one giant string.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    in_array = None
+    # Inside an array: 'first' right after '[', 'value' after ',' and
+    # 'separator' after an element
+    expect = 'first'
+    closed = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    while True:
+        # Skip whitespace
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            fill()
+
+        if position >= len(buffer):
+            if in_array and not closed:
+                raise ValueError("Unterminated JSON array")
+            return
+
+        char = buffer[position]
+        if closed:
+            raise ValueError(f"Extra data after JSON array: {char!r}")
+        if in_array is None:
+            in_array = char == '['
+            if in_array:
+                position += 1
+                continue
+        elif in_array:
+            if char == ']' and expect != 'value':
+                position += 1
+                closed = True
+                continue
+            if expect == 'separator':
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' after JSON array element, found {char!r}")
+                position += 1
+                expect = 'value'
+                continue
+            if char in ',]':
+                raise ValueError(f"Expected a JSON array element, found {char!r}")
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise
+            fill()
+            continue
+
+        # A value ending at the buffer edge, or a number not followed by a
+        # delimiter, may have been cut by the chunk boundary: read more
+        # and decode it again
+        if not eof and (end == len(buffer) or (
+                isinstance(value, (int, float)) and buffer[end] not in _DELIMITERS)):
+            fill()
+            continue
+
+        position = end
+        expect = 'separator'
+        yield value
+
+def read_json_records(arg, fields=None):
+    """Read an array/JSONL input reference, keeping only the given fields"""
+    stream = open_input(arg)
+    try:
+        records = []
+        for record in iter_json_records(stream):
+            if fields is not None and isinstance(record, dict):
+                record = {key: record[key] for key in fields if key in record}
+            records.append(record)
+        return records
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
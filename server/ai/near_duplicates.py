@@ -0,0 +1,203 @@
+"""
+VibhoHCM AI Near Duplicates - MinHash/LSH near-duplicate detection
+Summarizes each document as a MinHash signature over word shingles and
+files it under banded LSH buckets in a persistent SQLite index, so finding
+earlier versions of a resume is a handful of indexed lookups instead of a
+scan of the whole pool
+"""
+
+import os
+import re
+import hashlib
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+
+from result_cache import DEFAULT_DIRECTORY, private_directory
+
+# Bump when signatures or bucket keys change so old indexes are not reused
+INDEX_VERSION = 1
+
+NUM_PERMUTATIONS = 128
+# 16 bands of 8 rows puts the LSH candidate threshold near 0.7 Jaccard
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 5
+# Estimated Jaccard similarity at which two resumes count as duplicates
+THRESHOLD = 0.8
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+SEED = 42
+
+WORD_PATTERN = re.compile(r'\w+')
+
+@lru_cache(maxsize=1)
+def _permutations():
+    # Coefficients below 2**31 keep a * hash + b inside uint64
+    rng = np.random.default_rng(SEED)
+    a = rng.integers(1, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+def shingle_hashes(text):
+    """Stable 32-bit hashes of the distinct word shingles in text; none without words"""
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        shingles = set()
+    elif len(words) < SHINGLE_SIZE:
+        shingles = {' '.join(words)}
+    else:
+        shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+
+def minhash(text):
+    """MinHash signature (NUM_PERMUTATIONS uint32 values) of text
+
+    None when the text has no words: an empty or failed extraction says
+    nothing about which document it came from, so it matches nothing.
+    """
+    a, b = _permutations()
+    hashes = shingle_hashes(text)
+    if not hashes.size:
+        return None
+    return (((a * hashes[None, :] + b) % MERSENNE_PRIME) & MAX_HASH).min(axis=1).astype(np.uint32)
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(first == second))
+
+def bucket_keys(signature):
+    """One signed 64-bit LSH bucket key per band"""
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8, person=bytes([band]))
+        keys.append(int.from_bytes(digest.digest(), 'big', signed=True))
+    return keys
+
+class NearDuplicateIndex:
+    """Persistent LSH index of document signatures"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        # Another user able to write here could hide or invent duplicates
+        private_directory(os.path.dirname(os.path.abspath(path)))
+        # Bulk ingest writes from several processes; WAL plus a busy
+        # timeout lets them share the file. Transactions are explicit
+        # (see _write) rather than opened implicitly by the driver.
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                document_id TEXT PRIMARY KEY,
+                digest TEXT,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                bucket INTEGER NOT NULL,
+                document_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS buckets_by_key ON buckets (bucket);
+        """)
+
+    @contextmanager
+    def _write(self):
+        """Hold this process's lock and a write transaction
+
+        BEGIN IMMEDIATE takes SQLite's write lock up front, so a lookup and
+        the insert that depends on it are atomic across processes.
+        """
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def _matches(self, signature, threshold):
+        keys = bucket_keys(signature)
+        rows = self.connection.execute(
+            f"""SELECT document_id, digest, signature FROM signatures WHERE document_id IN (
+                    SELECT document_id FROM buckets WHERE bucket IN ({','.join('?' * len(keys))}))""",
+            keys
+        ).fetchall()
+
+        matches = []
+        for document_id, digest, blob in rows:
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= threshold:
+                matches.append({"id": document_id, "digest": digest, "similarity": round(score, 4)})
+        matches.sort(key=lambda match: (-match["similarity"], match["id"]))
+        return matches
+
+    def _insert(self, document_id, signature, digest):
+        inserted = self.connection.execute(
+            "INSERT OR IGNORE INTO signatures (document_id, digest, signature) VALUES (?, ?, ?)",
+            (document_id, digest, signature.astype(np.uint32).tobytes())
+        ).rowcount
+        if inserted:
+            self.connection.executemany(
+                "INSERT INTO buckets (bucket, document_id) VALUES (?, ?)",
+                [(key, document_id) for key in bucket_keys(signature)]
+            )
+
+    def query(self, signature, threshold=THRESHOLD):
+        """Indexed documents similar to signature, most similar first"""
+        with self.lock:
+            return self._matches(signature, threshold)
+
+    def add(self, document_id, signature, digest=None):
+        """Index a document's signature under its LSH buckets"""
+        with self._write():
+            self._insert(document_id, signature, digest)
+
+    def find_or_add(self, document_id, signature, digest=None):
+        """Best earlier near-duplicate of a document, or index it as new
+
+        The lookup and the insert share one write transaction, so two
+        processes ingesting copies of a resume cannot both miss each other
+        and both index it as new. Documents without a signature (no words)
+        are neither matched nor indexed.
+        """
+        if signature is None:
+            return None
+
+        with self._write():
+            for match in self._matches(signature, THRESHOLD):
+                if match["id"] != document_id:
+                    return match
+            # Duplicates are not indexed: the original already covers them
+            self._insert(document_id, signature, digest)
+        return None
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_index(name):
+    """Process-wide index for a document type, configured from the environment
+
+    AI_DEDUP_DIR overrides the directory (default: the AI cache directory);
+    AI_DEDUP_DISABLED=1 turns detection off (returns None).
+    """
+    if os.environ.get('AI_DEDUP_DISABLED') == '1':
+        return None
+
+    directory = private_directory(os.environ.get('AI_DEDUP_DIR') or os.environ.get('AI_CACHE_DIR') or DEFAULT_DIRECTORY)
+    path = os.path.join(directory, 'near_duplicates', f'{name}-v{INDEX_VERSION}.sqlite')
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = NearDuplicateIndex(path)
+            _indexes[path] = index
+        return index
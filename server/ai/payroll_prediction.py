@@ -6,16 +6,20 @@ Uses time series forecasting for payroll cost prediction
 
 import sys
 import json
-import os
-import numpy as np
 from datetime import datetime, timedelta
 import random
 
+from batch import batch_source, run_batch
+from instrumentation import stage, track
+
 def generate_historical_data(month, year):
     """Generate mock historical payroll data"""
     # In production, this would use actual historical data
     # Here we generate synthetic data
     
+    # NumPy is only loaded on the code paths that need it
+    import numpy as np
+    
     # Convert month and year to datetime
     current_date = datetime(int(year), int(month), 1)
     
@@ -45,6 +49,8 @@ def forecast_payroll(historical_data, periods=3):
     # In production, use Prophet or ARIMA models
     # Here we use a simple forecasting method
     
+    import numpy as np
+    
     # Extract values
     values = [entry["value"] for entry in historical_data]
     
@@ -115,8 +121,46 @@ def generate_cost_optimization(forecast):
     # Select a random subset of recommendations
     return random.sample(recommendations, 3)
 
+def predict_payroll(month, year):
+    """Build the payroll cost prediction for a month"""
+    with track('payroll_prediction') as tracker:
+        # Generate historical data
+        with stage('history'):
+            historical_data = generate_historical_data(month, year)
+        
+        # Forecast future payroll
+        with stage('forecast'):
+            forecast = forecast_payroll(historical_data)
+        
+        # Generate cost optimization recommendations
+        with stage('optimization'):
+            cost_optimization = generate_cost_optimization(forecast)
+        
+        return {
+            "month": f"{month}/{year}",
+            "predictedCost": forecast[0]["value"],
+            "variance": round((forecast[0]["value"] - historical_data[-1]["value"]) / historical_data[-1]["value"] * 100, 1),
+            "forecast": forecast,
+            "historicalData": historical_data,
+            "costOptimization": cost_optimization,
+            "timings": tracker.timings()
+        }
+
+def handle_request(payload):
+    """Handle a payroll prediction request from the AI worker"""
+    if 'month' not in payload or 'year' not in payload:
+        raise ValueError("Missing month and year parameters")
+    
+    return predict_payroll(payload['month'], payload['year'])
+
 def main():
     """Main function to predict payroll costs"""
+    # JSONL batch mode: one request per line from stdin or a file
+    source = batch_source(sys.argv)
+    if source:
+        run_batch(handle_request, source)
+        return
+    
     if len(sys.argv) < 3:
         print(json.dumps({
             "success": False,
@@ -128,24 +172,8 @@ def main():
         month = sys.argv[1]
         year = sys.argv[2]
         
-        # Generate historical data
-        historical_data = generate_historical_data(month, year)
-        
-        # Forecast future payroll
-        forecast = forecast_payroll(historical_data)
-        
-        # Generate cost optimization recommendations
-        cost_optimization = generate_cost_optimization(forecast)
-        
         # Return result
-        result = {
-            "month": f"{month}/{year}",
-            "predictedCost": forecast[0]["value"],
-            "variance": round((forecast[0]["value"] - historical_data[-1]["value"]) / historical_data[-1]["value"] * 100, 1),
-            "forecast": forecast,
-            "historicalData": historical_data,
-            "costOptimization": cost_optimization
-        }
+        result = predict_payroll(month, year)
         
         print(json.dumps(result))
         
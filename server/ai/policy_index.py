@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+VibhoHCM Policy Index - BM25 passage retrieval over HR policy documents
+Policy documents are split into passages and indexed offline. Postings hold
+precomputed BM25 term weights in one memory-mapped file, so every worker
+process shares a single copy through the page cache and a query is a
+handful of vectorized additions
+"""
+
+import sys
+import json
+import os
+import argparse
+import math
+import re
+import shutil
+from functools import lru_cache
+
+import numpy as np
+
+from bulk_ingest import iter_paths
+from candidate_index import B, K1, bm25_idf, bm25_weights
+from intent_index import STOPWORDS, stems
+from text_extraction import iter_text_chunks
+
+INDEX_FORMAT = 1
+
+POLICY_EXTENSIONS = ['.txt', '.pdf', '.docx']
+
+# Passages close at a paragraph break once they reach PASSAGE_MIN_WORDS
+# words, and are cut at PASSAGE_MAX_WORDS regardless
+PASSAGE_MIN_WORDS = 40
+PASSAGE_MAX_WORDS = 160
+
+# Weight of a query term no passage contains, as in the intent index: as
+# uninformative as a term every passage shares, but it still dilutes the
+# relevance of passages matching only the rest of the question
+UNKNOWN_TERM_IDF = math.log(2)
+
+POSTING_DTYPE = np.dtype([('passage', '<i4'), ('weight', '<f4')])
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+def passage_terms(text):
+    """Stemmed, stopword-free terms; the same analysis for passages and queries"""
+    return [term for term in stems(text) if term not in STOPWORDS]
+
+def iter_passages(path):
+    """Yield passage texts of a policy document, paragraph by paragraph"""
+    words = []
+    tail = ''
+    for chunk in iter_text_chunks(path):
+        paragraphs = PARAGRAPH_BREAK.split(tail + chunk)
+        # The last paragraph may continue in the next chunk
+        tail = paragraphs.pop()
+        for paragraph in paragraphs:
+            words.extend(paragraph.split())
+            while len(words) >= PASSAGE_MAX_WORDS:
+                yield ' '.join(words[:PASSAGE_MAX_WORDS])
+                words = words[PASSAGE_MAX_WORDS:]
+            if len(words) >= PASSAGE_MIN_WORDS:
+                yield ' '.join(words)
+                words = []
+    words.extend(tail.split())
+    while words:
+        yield ' '.join(words[:PASSAGE_MAX_WORDS])
+        words = words[PASSAGE_MAX_WORDS:]
+
+def iter_documents(sources):
+    """Policy files from file and directory arguments"""
+    for source in sources:
+        if os.path.isdir(source):
+            yield from iter_paths(source, POLICY_EXTENSIONS)
+        else:
+            yield os.path.abspath(source)
+
+def build_index(directory, sources):
+    """Index every passage of the policy documents into directory
+
+    The index is written to a temporary directory and swapped in, so
+    workers reading the old one are never left with a half-built index;
+    indexes already open keep reading the old files. Between moving the old
+    directory aside and renaming the new one into place there is briefly no
+    directory at all, and an index opened in that moment fails to load.
+    """
+    tmp_directory = directory.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+
+    postings = {}
+    lengths = []
+    offsets = [0]
+    documents = 0
+    with open(os.path.join(tmp_directory, 'passages.jsonl'), 'wb') as passages:
+        for path in iter_documents(sources):
+            documents += 1
+            title = os.path.splitext(os.path.basename(path))[0]
+            for text in iter_passages(path):
+                terms = passage_terms(text)
+                if not terms:
+                    continue
+                passage = len(lengths)
+                frequencies = {}
+                for term in terms:
+                    frequencies[term] = frequencies.get(term, 0) + 1
+                for term, tf in frequencies.items():
+                    postings.setdefault(term, []).append((passage, tf))
+                lengths.append(len(terms))
+                passages.write(json.dumps({"text": text, "source": path, "title": title}).encode('utf-8') + b'\n')
+                offsets.append(passages.tell())
+
+    passage_count = len(lengths)
+    lengths = np.asarray(lengths, dtype=np.float32)
+    avg_length = float(lengths.mean()) if passage_count else 1.0
+
+    # Each posting stores its full BM25 contribution (idf included), so a
+    # query only sums weights
+    terms = {}
+    records = np.zeros(sum(len(entries) for entries in postings.values()), dtype=POSTING_DTYPE)
+    offset = 0
+    for term in sorted(postings):
+        entries = np.asarray(postings[term], dtype=np.int64)
+        count = len(entries)
+        passage_ids = entries[:, 0]
+        idf = bm25_idf(passage_count, count)
+        records['passage'][offset:offset + count] = passage_ids
+        records['weight'][offset:offset + count] = idf * bm25_weights(entries[:, 1].astype(np.float32), lengths[passage_ids], avg_length)
+        terms[term] = [offset, count]
+        offset += count
+
+    np.save(os.path.join(tmp_directory, 'postings.npy'), records)
+    np.save(os.path.join(tmp_directory, 'passage_offsets.npy'), np.asarray(offsets, dtype=np.int64))
+    with open(os.path.join(tmp_directory, 'terms.json'), 'w', encoding='utf-8') as file:
+        json.dump(terms, file)
+    meta = {
+        "format": INDEX_FORMAT,
+        "documents": documents,
+        "passages": passage_count,
+        "terms": len(terms),
+        "avgLength": round(avg_length, 4),
+        "k1": K1,
+        "b": B
+    }
+    with open(os.path.join(tmp_directory, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump(meta, file)
+
+    old_directory = directory.rstrip(os.sep) + '.old'
+    shutil.rmtree(old_directory, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, old_directory)
+    os.replace(tmp_directory, directory)
+    shutil.rmtree(old_directory, ignore_errors=True)
+    return meta
+
+class PolicyIndex:
+    """Read-only, memory-mapped policy passage index"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as file:
+            self.meta = json.load(file)
+        if self.meta.get("format") != INDEX_FORMAT:
+            raise ValueError(f"Unsupported policy index format in {directory}")
+        with open(os.path.join(directory, 'terms.json'), 'r', encoding='utf-8') as file:
+            self.terms = json.load(file)
+        self.postings = np.load(os.path.join(directory, 'postings.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(directory, 'passage_offsets.npy'), mmap_mode='r')
+        # Opened along with the offsets, so a rebuild cannot pair them with
+        # another index's passages
+        self.passages = open(os.path.join(directory, 'passages.jsonl'), 'rb')
+        self.passage_count = self.meta["passages"]
+
+    def search(self, query, top=3):
+        """Best passages for a question, with their BM25 scores
+
+        BM25 scores grow with the corpus (rarer terms, higher idf), so each
+        passage also gets a relevance: its score over the query's total idf.
+        That is about 1 when a passage of average length contains every
+        query term once, on a corpus of ten passages or a hundred thousand.
+        """
+        query_terms = set(passage_terms(query or ''))
+        if not query_terms or not self.passage_count:
+            return []
+
+        scores = np.zeros(self.passage_count, dtype=np.float32)
+        query_idf = 0.0
+        for term in query_terms:
+            entry = self.terms.get(term)
+            if entry is None:
+                query_idf += UNKNOWN_TERM_IDF
+                continue
+            start, count = entry
+            query_idf += bm25_idf(self.passage_count, count)
+            postings = self.postings[start:start + count]
+            # Passage ids are unique within a term's postings
+            scores[postings['passage']] += postings['weight']
+
+        top = min(top, self.passage_count)
+        best = np.argpartition(-scores, top - 1)[:top] if top < self.passage_count else np.arange(self.passage_count)
+        best = best[scores[best] > 0]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [
+            dict(self.passage(int(passage)), score=round(float(scores[passage]), 4),
+                 relevance=round(float(scores[passage]) / query_idf, 4))
+            for passage in best
+        ]
+
+    def passage(self, passage):
+        """Stored passage record: text, source path and document title"""
+        start, end = int(self.offsets[passage]), int(self.offsets[passage + 1])
+        return json.loads(os.pread(self.passages.fileno(), end - start, start))
+
+@lru_cache(maxsize=4)
+def _open_cached(directory, meta_mtime):
+    return PolicyIndex(directory)
+
+def open_index(directory):
+    """Open an index once per process, reopening after a rebuild"""
+    return _open_cached(directory, os.path.getmtime(os.path.join(directory, 'meta.json')))
+
+def handle_request(payload):
+    """Handle a policy search request from the AI worker"""
+    if not payload.get('index'):
+        raise ValueError("Missing index directory")
+
+    return open_index(payload['index']).search(payload.get('query', ''), int(payload.get('top', 3)))
+
+def main():
+    """Main function to build and query the policy index"""
+    parser = argparse.ArgumentParser(description="VibhoHCM policy passage index")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="Index policy documents (files or directories)")
+    build.add_argument('index')
+    build.add_argument('sources', nargs='+')
+
+    search = commands.add_parser('search', help="Find passages answering a question")
+    search.add_argument('index')
+    search.add_argument('query')
+    search.add_argument('--top', type=int, default=3)
+
+    stats = commands.add_parser('stats', help="Show index statistics")
+    stats.add_argument('index')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'build':
+            result = build_index(args.index, args.sources)
+        elif args.command == 'search':
+            result = PolicyIndex(args.index).search(args.query, args.top)
+        else:
+            result = PolicyIndex(args.index).meta
+
+        print(json.dumps(result))
+
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "message": str(e)
+        }))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+VibhoHCM AI Result Cache - Content-addressed result cache
+Keeps analysis results keyed by a hash of the input content, with an
+in-memory LRU tier in front of a size-bounded on-disk store. Entries are
+namespaced by model version so changing a taxonomy or classifier
+invalidates everything computed with the old one
+"""
+
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Per user: cached results are served as the models' own output, so the
+# directory must not be one another local user could have created
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), f'vibhohcm-ai-cache-{os.getuid()}')
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def private_directory(path):
+    """Create path for this user only, refusing an existing one others can use"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path)
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"Directory {path} must be owned by this user with mode 0700")
+    return path
+
+def file_digest(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def text_digest(text):
+    """SHA-256 of text content"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def version_digest(*parts):
+    """Short stable hash of everything a model's output depends on"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+class ResultCache:
+    """Two-tier (memory LRU + disk) cache for JSON-serializable results"""
+
+    def __init__(self, name, version, directory=None, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.name = name
+        self.version = version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.root = os.path.join(private_directory(directory or DEFAULT_DIRECTORY), name)
+        self.directory = os.path.join(self.root, version)
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.disk_bytes = None
+        self._remove_stale_versions()
+
+    def _remove_stale_versions(self):
+        """Drop entries written by other versions of this model"""
+        if not os.path.isdir(self.root):
+            return
+        for entry in os.listdir(self.root):
+            if entry != self.version:
+                shutil.rmtree(os.path.join(self.root, entry), ignore_errors=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key):
+        """Return the cached result for key, or None"""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                value = json.load(file)
+            # Touch the file so disk eviction is least-recently-used
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a result in both tiers"""
+        self._remember(key, value)
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = json.dumps(value).encode('utf-8')
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the memory tier still works
+            return
+
+        with self.lock:
+            if self.disk_bytes is not None:
+                self.disk_bytes += len(data)
+        self._evict_disk()
+
+    def _remember(self, key, value):
+        with self.lock:
+            self.memory[key] = value
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+    def _scan(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if not filename.endswith('.json'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_disk(self):
+        """Delete least recently used files once the store exceeds max_bytes"""
+        with self.lock:
+            if self.disk_bytes is not None and self.disk_bytes <= self.max_bytes:
+                return
+
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            # Evict down to 90% so we do not rescan on every write
+            target = self.max_bytes * 0.9
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    continue
+
+        with self.lock:
+            self.disk_bytes = total
+
+    def clear(self):
+        """Remove every entry for this model version"""
+        with self.lock:
+            self.memory.clear()
+            self.disk_bytes = 0
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_cache(name, version):
+    """Process-wide cache for a model, configured from the environment
+
+    AI_CACHE_DIR, AI_CACHE_MAX_ENTRIES and AI_CACHE_MAX_BYTES tune the
+    tiers; AI_CACHE_DISABLED=1 turns caching off (returns None).
+    """
+    if os.environ.get('AI_CACHE_DISABLED') == '1':
+        return None
+
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None or cache.version != version:
+            cache = ResultCache(
+                name,
+                version,
+                directory=os.environ.get('AI_CACHE_DIR') or None,
+                max_entries=int(os.environ.get('AI_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)),
+                max_bytes=int(os.environ.get('AI_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+            )
+            _caches[name] = cache
+        return cache
@@ -9,31 +9,86 @@ import json
 import os
 import re
 import random
-from datetime import datetime
+from functools import lru_cache
+
+from batch import batch_source, run_batch
+from bulk_ingest import ingest_arguments, main_ingest
+from instrumentation import stage, track
+from result_cache import file_digest, get_cache, text_digest, version_digest
+from skill_matcher import load_matcher, load_taxonomy
+from text_extraction import iter_text_chunks
+
+# Built-in taxonomy, used unless SKILLS_TAXONOMY points at a JSON file of
+# names, {"name", "synonyms"} objects or a {name: [synonyms]} map
+COMMON_SKILLS = [
+    "JavaScript", "React", "Angular", "Vue.js", "Node.js", "Express", 
+    "Python", "Django", "Flask", "Java", "Spring", "C#", ".NET",
+    "PHP", "Laravel", "Ruby", "Rails", "Go", "Rust", "Swift",
+    "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Elasticsearch",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "Git",
+    "HTML", "CSS", "SASS", "LESS", "Bootstrap", "Tailwind",
+    "TypeScript", "GraphQL", "REST API", "Microservices", "CI/CD",
+    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch",
+    "Data Analysis", "Power BI", "Tableau", "Excel", "R",
+    "Agile", "Scrum", "Kanban", "JIRA", "Confluence", "Project Management"
+]
+
+SKILL_SYNONYMS = {
+    "JavaScript": ["ECMAScript"],
+    "React": ["ReactJS", "React.js"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Node.js": ["NodeJS"],
+    "PostgreSQL": ["Postgres"],
+    "Go": ["Golang"],
+    "AWS": ["Amazon Web Services"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "Kubernetes": ["k8s"],
+    "CI/CD": ["Continuous Integration"],
+    "Power BI": ["PowerBI"],
+    "Machine Learning": ["ML Engineering"]
+}
+
+# Look for degree patterns
+DEGREE_PATTERNS = [
+    r'(?:Bachelor|Master|PhD|Doctorate|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.E\.|M\.E\.|B\.Tech|M\.Tech|MBA)\s+(?:of|in)?\s+[A-Za-z\s]+',
+    r'(?:Bachelor|Master|PhD|Doctorate)\s+degree',
+    r'[A-Za-z\s]+\s+(?:University|College|Institute|School)'
+]
+
+EXPERIENCE_PATTERNS = [
+    r'(\d+)\+?\s+years?\s+(?:of)?\s+experience',
+    r'experience\s+(?:of)?\s+(\d+)\+?\s+years?',
+    r'worked\s+(?:for)?\s+(\d+)\+?\s+years?'
+]
+
+# Bump when the pipeline's output changes in ways the tables above do not capture
+PIPELINE_VERSION = 1
+
+# File types picked up by --ingest
+RESUME_EXTENSIONS = ['.txt', '.pdf', '.docx']
+
+@lru_cache(maxsize=None)
+def _skill_matcher():
+    """Load the skills taxonomy and its matching automaton once"""
+    taxonomy_path = os.environ.get('SKILLS_TAXONOMY')
+    if taxonomy_path:
+        entries = load_taxonomy(taxonomy_path)
+    else:
+        entries = [(skill, SKILL_SYNONYMS.get(skill, [])) for skill in COMMON_SKILLS]
+    return load_matcher(entries)
+
+@lru_cache(maxsize=None)
+def _degree_patterns():
+    return [re.compile(pattern) for pattern in DEGREE_PATTERNS]
+
+@lru_cache(maxsize=None)
+def _experience_patterns():
+    return [re.compile(pattern, re.IGNORECASE) for pattern in EXPERIENCE_PATTERNS]
 
 def extract_skills(text):
     """Extract skills from resume text"""
-    # In production, use a skills taxonomy and NER model
-    # Here we use a simple keyword approach
-    common_skills = [
-        "JavaScript", "React", "Angular", "Vue.js", "Node.js", "Express", 
-        "Python", "Django", "Flask", "Java", "Spring", "C#", ".NET",
-        "PHP", "Laravel", "Ruby", "Rails", "Go", "Rust", "Swift",
-        "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Elasticsearch",
-        "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "Git",
-        "HTML", "CSS", "SASS", "LESS", "Bootstrap", "Tailwind",
-        "TypeScript", "GraphQL", "REST API", "Microservices", "CI/CD",
-        "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch",
-        "Data Analysis", "Power BI", "Tableau", "Excel", "R",
-        "Agile", "Scrum", "Kanban", "JIRA", "Confluence", "Project Management"
-    ]
-    
-    found_skills = []
-    for skill in common_skills:
-        if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
-            found_skills.append(skill)
-    
-    return found_skills
+    # Single pass over the text regardless of taxonomy size
+    return _skill_matcher().find(text)
 
 def extract_education(text):
     """Extract education information from resume text"""
@@ -41,15 +96,8 @@ def extract_education(text):
     # Here we use simple regex patterns
     education = []
     
-    # Look for degree patterns
-    degree_patterns = [
-        r'(?:Bachelor|Master|PhD|Doctorate|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.E\.|M\.E\.|B\.Tech|M\.Tech|MBA)\s+(?:of|in)?\s+[A-Za-z\s]+',
-        r'(?:Bachelor|Master|PhD|Doctorate)\s+degree',
-        r'[A-Za-z\s]+\s+(?:University|College|Institute|School)'
-    ]
-    
-    for pattern in degree_patterns:
-        matches = re.findall(pattern, text)
+    for pattern in _degree_patterns():
+        matches = pattern.findall(text)
         education.extend(matches)
     
     # Remove duplicates and clean up
@@ -62,15 +110,9 @@ def estimate_experience(text):
     """Estimate years of experience from resume text"""
     # In production, use more sophisticated analysis
     # Here we use simple pattern matching
-    experience_patterns = [
-        r'(\d+)\+?\s+years?\s+(?:of)?\s+experience',
-        r'experience\s+(?:of)?\s+(\d+)\+?\s+years?',
-        r'worked\s+(?:for)?\s+(\d+)\+?\s+years?'
-    ]
-    
     years = []
-    for pattern in experience_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    for pattern in _experience_patterns():
+        matches = pattern.findall(text)
         years.extend([int(y) for y in matches])
     
     if years:
@@ -87,8 +129,10 @@ def estimate_experience(text):
 
 def calculate_match_score(skills, experience, job_requirements=None):
     """Calculate match score based on skills and experience"""
-    # In production, use more sophisticated scoring with job requirements
-    # Here we use a simple scoring method
+    if job_requirements:
+        return score_against_requirements(skills, experience, job_requirements)
+    
+    # Without a job to match against we use a simple scoring method
     
     # Base score from 60-80
     base_score = random.randint(60, 80)
@@ -105,6 +149,23 @@ def calculate_match_score(skills, experience, job_requirements=None):
     # Cap at 100
     return min(score, 100)
 
+def score_against_requirements(skills, experience, job_requirements):
+    """Deterministic 0-100 fit against {"skills": [...], "minExperience": n}"""
+    required = {skill.lower() for skill in job_requirements.get('skills') or []}
+    have = {skill.lower() for skill in skills}
+    
+    # Required skill coverage is worth up to 70 points
+    coverage = len(required & have) / len(required) if required else 1.0
+    
+    # Meeting the minimum experience is worth up to 20 points
+    min_experience = job_requirements.get('minExperience') or 0
+    experience_fit = min(experience / min_experience, 1.0) if min_experience else 1.0
+    
+    # Breadth beyond the required skills is worth up to 10 points
+    extra_points = min(len(have - required), 10)
+    
+    return int(round(coverage * 70 + experience_fit * 20 + extra_points))
+
 def generate_recommendations(skills, experience, score):
     """Generate recommendations based on resume analysis"""
     recommendations = []
@@ -148,10 +209,16 @@ def generate_recommendations(skills, experience, score):
     
     return recommendations
 
-def suggest_matching_jobs(skills, experience):
+def suggest_matching_jobs(skills, experience, openings=None):
     """Suggest matching jobs based on skills and experience"""
-    # In production, match against actual job openings
-    # Here we use predefined job titles based on skills and experience
+    if openings:
+        # Score against the real requisitions with the vectorized matcher
+        from job_matcher import match_pipeline
+        matches = match_pipeline([{"skills": skills, "experience": experience}], openings, 3)
+        return [match["title"] or match["jobId"] for match in matches["byCandidate"][0]["matches"]]
+    
+    # Without open requisitions we use predefined job titles based on
+    # skills and experience
     
     matching_jobs = []
     
@@ -197,46 +264,158 @@ def suggest_matching_jobs(skills, experience):
     
     return matching_jobs[:3]  # Return top 3 matches
 
-def main():
-    """Main function to parse resume"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
-            "success": False,
-            "message": "Missing resume file path"
-        }))
-        sys.exit(1)
-    
-    resume_path = sys.argv[1]
+def model_version():
+    """Hash of the skills taxonomy and patterns the parse depends on"""
+    return version_digest(PIPELINE_VERSION, _skill_matcher().version, DEGREE_PATTERNS, EXPERIENCE_PATTERNS)
+
+def _resume_cache():
+    return get_cache('resume_parser', model_version())
+
+def find_duplicate(candidate_id, content_digest, resume_text):
+    """Earlier near-duplicate resume, recording this one if it is new"""
+    # Imported here so NumPy stays off the cold-start path
+    from near_duplicates import get_index, minhash
     
-    try:
-        # Read resume file
-        with open(resume_path, 'r', encoding='utf-8') as file:
-            resume_text = file.read()
+    index = get_index('resume_parser')
+    if index is None:
+        return None
+    return index.find_or_add(candidate_id, minhash(resume_text), content_digest)
+
+def analyze_resume(resume_text, content_digest=None):
+    """Analyze resume text and build the candidate profile
+
+    Results are cached by content hash; the candidate id is derived from
+    the same hash so repeat uploads map to the same candidate. Near
+    duplicates of an earlier resume are flagged with duplicateOf and reuse
+    its scoring.
+    """
+    with track('resume_parser') as tracker:
+        cache = _resume_cache()
+        if content_digest is None:
+            with stage('hash'):
+                content_digest = text_digest(resume_text)
+                cached = cache.get(content_digest) if cache else None
+            if cached is not None:
+                return dict(cached, cached=True, timings=tracker.timings())
         
-        # Extract information
-        skills = extract_skills(resume_text)
-        education = extract_education(resume_text)
-        experience = estimate_experience(resume_text)
+        candidate_id = f"CAND-{content_digest[:8].upper()}"
         
-        # Calculate match score
-        score = calculate_match_score(skills, experience)
+        # Extract information
+        with stage('skills'):
+            skills = extract_skills(resume_text)
+        with stage('education'):
+            education = extract_education(resume_text)
         
-        # Generate recommendations
-        recommendations = generate_recommendations(skills, experience, score)
+        # Earlier versions of the same resume reuse the original's analysis
+        with stage('dedup'):
+            duplicate = find_duplicate(candidate_id, content_digest, resume_text)
+            original = cache.get(duplicate["digest"]) if duplicate and cache else None
         
-        # Suggest matching jobs
-        matching_jobs = suggest_matching_jobs(skills, experience)
+        if original is not None:
+            experience = original["experience"]
+            score = original["score"]
+            recommendations = original["recommendations"]
+            matching_jobs = original["matchingJobs"]
+        else:
+            with stage('experience'):
+                experience = estimate_experience(resume_text)
+            
+            # Calculate match score
+            with stage('scoring'):
+                score = calculate_match_score(skills, experience)
+            
+            # Generate recommendations and suggest matching jobs
+            with stage('recommendations'):
+                recommendations = generate_recommendations(skills, experience, score)
+                matching_jobs = suggest_matching_jobs(skills, experience)
         
-        # Return result
         result = {
-            "candidateId": f"CAND-{random.randint(1000, 9999)}",
+            "candidateId": candidate_id,
             "skills": skills,
             "experience": experience,
             "education": education,
             "score": score,
             "recommendations": recommendations,
-            "matchingJobs": matching_jobs
+            "matchingJobs": matching_jobs,
+            "duplicateOf": duplicate["id"] if duplicate else None,
+            "cached": False
         }
+        if cache:
+            cache.put(content_digest, result)
+        
+        return dict(result, timings=tracker.timings())
+
+def parse_resume(resume_path):
+    """Read a resume file and analyze its contents"""
+    with track('resume_parser') as tracker:
+        with stage('hash'):
+            content_digest = file_digest(resume_path)
+            cache = _resume_cache()
+            cached = cache.get(content_digest) if cache else None
+        if cached is not None:
+            return dict(cached, cached=True, timings=tracker.timings())
+        
+        with stage('extraction'):
+            resume_text = ''.join(iter_text_chunks(resume_path))
+        
+        return analyze_resume(resume_text, content_digest)
+
+def handle_request(payload):
+    """Handle a resume parsing request from the AI worker"""
+    if 'text' in payload:
+        result = analyze_resume(payload['text'])
+    elif payload.get('path'):
+        result = parse_resume(payload['path'])
+    else:
+        raise ValueError("Missing resume file path")
+    
+    # Cached parses are job independent; score against the job afterwards
+    job_requirements = payload.get('jobRequirements')
+    if job_requirements:
+        score = calculate_match_score(result['skills'], result['experience'], job_requirements)
+        result = dict(
+            result,
+            score=score,
+            recommendations=generate_recommendations(result['skills'], result['experience'], score)
+        )
+    if payload.get('openings'):
+        result = dict(result, matchingJobs=suggest_matching_jobs(result['skills'], result['experience'], payload['openings']))
+    
+    return result
+
+def main():
+    """Main function to parse resume"""
+    # JSONL batch mode: one request per line from stdin or a file
+    source = batch_source(sys.argv)
+    if source:
+        run_batch(handle_request, source)
+        return
+    
+    # Bulk import: parse a directory or manifest across a process pool
+    ingest = ingest_arguments(sys.argv)
+    if ingest:
+        try:
+            main_ingest(parse_resume, ingest, RESUME_EXTENSIONS)
+        except Exception as e:
+            print(json.dumps({
+                "success": False,
+                "message": str(e)
+            }))
+            sys.exit(1)
+        return
+    
+    if len(sys.argv) < 2:
+        print(json.dumps({
+            "success": False,
+            "message": "Missing resume file path"
+        }))
+        sys.exit(1)
+    
+    resume_path = sys.argv[1]
+    
+    try:
+        # Return result
+        result = parse_resume(resume_path)
         
         print(json.dumps(result))
         
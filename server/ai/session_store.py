@@ -0,0 +1,242 @@
+"""
+VibhoHCM AI Session Store - Conversation state shared by chatbot workers
+Keeps each conversation's recent turns, resolved entities and user profile
+in a SQLite file keyed by session id, so whichever worker process serves a
+turn sees the earlier ones and a turn only has to send its new message.
+Idle sessions expire and the least recently used are evicted under a
+session count and byte cap; a per-session lock serializes concurrent turns
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+import zlib
+from collections import deque
+from contextlib import contextmanager
+
+from result_cache import private_directory
+
+# Bump when the stored session layout changes so old files are not reused
+STORE_VERSION = 1
+
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_TTL_SECONDS = 30 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Turns of history kept per session
+MAX_TURNS = 20
+
+# Sessions hold employee profile data, so they live in a directory only
+# this user can read, apart from the AI result cache
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), f'vibhohcm-ai-sessions-{os.getuid()}')
+
+# Session ids hash onto this many locks (bytes of the lock file)
+LOCK_STRIPES = 1024
+
+class Session:
+    """One conversation: profile fields, recent turns and resolved entities"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.profile = {}
+        self.turns = deque(maxlen=MAX_TURNS)
+        # Latest value of each entity type mentioned so far
+        self.entities = {}
+        self.turn_count = 0
+        self.size = 0
+
+    def last_intent(self):
+        """Intent of the previous turn, or None"""
+        return self.turns[-1]["intent"] if self.turns else None
+
+    def add_turn(self, message, intent, entities):
+        self.turn_count += 1
+        self.turns.append({"message": message, "intent": intent, "entities": entities})
+        for entity in entities:
+            self.entities[entity["type"]] = entity["entity"]
+
+    def to_dict(self):
+        return {
+            "sessionId": self.session_id,
+            "profile": self.profile,
+            "turns": list(self.turns),
+            "entities": self.entities,
+            "turnCount": self.turn_count
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        session = cls(data["sessionId"])
+        session.profile = data["profile"]
+        session.turns.extend(data["turns"])
+        session.entities = data["entities"]
+        session.turn_count = data["turnCount"]
+        return session
+
+    def dumps(self):
+        """Serialized state; its length is the session's size"""
+        state = json.dumps(self.to_dict(), default=str)
+        self.size = len(state)
+        return state
+
+class SessionStore:
+    """Sessions in a SQLite file shared by every worker process
+
+    A turn holds its session's lock (see lock) from get to update, so two
+    turns of one conversation - on threads of one worker or on different
+    pool processes - apply one after the other instead of overwriting
+    each other.
+    """
+
+    def __init__(self, directory=None, max_sessions=DEFAULT_MAX_SESSIONS, ttl=DEFAULT_TTL_SECONDS,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = private_directory(directory or DEFAULT_DIRECTORY)
+        self.path = os.path.join(self.directory, f'sessions-v{STORE_VERSION}.sqlite')
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # Evictions and expiries made by this process
+        self.evictions = 0
+        self.connection_lock = threading.Lock()
+        self.pid = None
+        self._open()
+
+    def _open(self):
+        # SQLite connections, record locks and held thread locks do not
+        # survive a fork, so a forked worker opens its own
+        import sqlite3
+        self.pid = os.getpid()
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Losing the last turns in a power cut is acceptable for chat state
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sessions_by_last_seen ON sessions (last_seen);
+        """)
+        # POSIX record locks belong to the process, so threads of one
+        # process are kept apart by a thread lock per stripe as well
+        self.lock_file = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        self.stripe_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def _check_process(self):
+        if self.pid != os.getpid():
+            with self.connection_lock:
+                if self.pid != os.getpid():
+                    self._open()
+
+    @contextmanager
+    def lock(self, session_id):
+        """Hold a session exclusively across threads and processes"""
+        import fcntl
+        self._check_process()
+        stripe = zlib.crc32(str(session_id).encode('utf-8')) % LOCK_STRIPES
+        with self.stripe_locks[stripe]:
+            fcntl.lockf(self.lock_file, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self.lock_file, fcntl.LOCK_UN, 1, stripe)
+
+    @contextmanager
+    def _write(self):
+        """Hold this process's connection and a write transaction"""
+        self._check_process()
+        with self.connection_lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def get(self, session_id, create=True):
+        """A copy of the stored session for an id (a new one when missing)
+
+        Changes are saved by update; hold lock(session_id) in between.
+        """
+        now = time.time()
+        with self._write() as connection:
+            self._expire(connection, now)
+            row = connection.execute(
+                "SELECT state FROM sessions WHERE session_id = ?", (str(session_id),)
+            ).fetchone()
+            if row is not None:
+                connection.execute("UPDATE sessions SET last_seen = ? WHERE session_id = ?", (now, str(session_id)))
+        if row is None:
+            return Session(session_id) if create else None
+        session = Session.from_dict(json.loads(row[0]))
+        session.size = len(row[0])
+        return session
+
+    def update(self, session):
+        """Save a session after a turn and evict others to stay within the caps"""
+        state = session.dumps()
+        with self._write() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, state, size, last_seen) VALUES (?, ?, ?, ?)",
+                (str(session.session_id), state, session.size, time.time())
+            )
+            self._evict(connection, keep=str(session.session_id))
+
+    def drop(self, session_id):
+        """Forget a session, e.g. when the user logs out"""
+        with self._write() as connection:
+            return connection.execute("DELETE FROM sessions WHERE session_id = ?", (str(session_id),)).rowcount > 0
+
+    def _expire(self, connection, now):
+        self.evictions += connection.execute("DELETE FROM sessions WHERE last_seen < ?", (now - self.ttl,)).rowcount
+
+    def _evict(self, connection, keep):
+        count, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions").fetchone()
+        while count > self.max_sessions or total > self.max_bytes:
+            # Least recently used first, never the session just saved
+            oldest = connection.execute(
+                "SELECT session_id, size FROM sessions WHERE session_id != ? ORDER BY last_seen LIMIT 1", (keep,)
+            ).fetchone()
+            if oldest is None:
+                break
+            connection.execute("DELETE FROM sessions WHERE session_id = ?", (oldest[0],))
+            count -= 1
+            total -= oldest[1]
+            self.evictions += 1
+
+    def stats(self):
+        with self._write() as connection:
+            count, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions").fetchone()
+        return {
+            "sessions": count,
+            "bytes": total,
+            "evictions": self.evictions,
+            "maxSessions": self.max_sessions,
+            "maxBytes": self.max_bytes,
+            "ttl": self.ttl
+        }
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Process-wide session store, configured from the environment
+
+    CHATBOT_SESSION_DIR overrides the directory, which every worker serving
+    the same users must share; CHATBOT_SESSION_MAX, CHATBOT_SESSION_TTL
+    (seconds) and CHATBOT_SESSION_MAX_BYTES override the caps.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore(
+                os.environ.get('CHATBOT_SESSION_DIR'),
+                int(os.environ.get('CHATBOT_SESSION_MAX', DEFAULT_MAX_SESSIONS)),
+                float(os.environ.get('CHATBOT_SESSION_TTL', DEFAULT_TTL_SECONDS)),
+                int(os.environ.get('CHATBOT_SESSION_MAX_BYTES', DEFAULT_MAX_BYTES))
+            )
+        return _store
@@ -0,0 +1,176 @@
+"""
+VibhoHCM Skill Matcher - Multi-pattern skills taxonomy matching
+Aho-Corasick automaton over word tokens, so a resume is scanned once no
+matter how many skills and synonyms the taxonomy holds
+"""
+
+import os
+import json
+import re
+import tempfile
+
+from result_cache import DEFAULT_DIRECTORY, private_directory, version_digest
+
+# Word runs and single punctuation marks; matching whole tokens gives
+# word-boundary semantics for free ("Go" never matches inside "Google")
+TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+# Bump when the automaton layout changes so stale files are rebuilt
+FORMAT_VERSION = 2
+
+def tokenize(text):
+    """Lowercased tokens used both for patterns and for scanned text"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def normalize_taxonomy(data):
+    """Accept a list of names, a list of {name, synonyms} or {name: synonyms}"""
+    entries = []
+    if isinstance(data, dict):
+        data = [{"name": name, "synonyms": synonyms} for name, synonyms in data.items()]
+
+    for item in data:
+        if isinstance(item, str):
+            entries.append((item, []))
+        elif isinstance(item, dict) and item.get('name'):
+            entries.append((item['name'], list(item.get('synonyms') or [])))
+        else:
+            raise ValueError(f"Invalid taxonomy entry: {item!r}")
+    return entries
+
+class SkillMatcher:
+    """Token-level Aho-Corasick automaton mapping surface forms to skills"""
+
+    def __init__(self, entries):
+        self.skills = [name for name, _ in entries]
+        self.version = version_digest(FORMAT_VERSION, entries)
+        # Node 0 is the root; goto[node] maps token -> child node
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [()]
+        self._build(entries)
+
+    def _add(self, tokens, skill_id):
+        node = 0
+        for token in tokens:
+            child = self.goto[node].get(token)
+            if child is None:
+                child = len(self.goto)
+                self.goto[node][token] = child
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append(())
+            node = child
+        if skill_id not in self.outputs[node]:
+            self.outputs[node] = self.outputs[node] + (skill_id,)
+
+    def _build(self, entries):
+        for skill_id, (name, synonyms) in enumerate(entries):
+            for form in [name] + synonyms:
+                tokens = tokenize(form)
+                if tokens:
+                    self._add(tokens, skill_id)
+
+        # Breadth-first pass to set failure links and merge outputs
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for token, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and token not in self.goto[state]:
+                    state = self.fail[state]
+                target = self.goto[state].get(token, 0)
+                self.fail[child] = target if target != child else 0
+                if self.outputs[self.fail[child]]:
+                    merged = self.outputs[child] + tuple(
+                        skill for skill in self.outputs[self.fail[child]] if skill not in self.outputs[child]
+                    )
+                    self.outputs[child] = merged
+
+    def match_ids(self, text):
+        """Ids of every skill mentioned in text, in one pass"""
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        found = set()
+        node = 0
+        for token in tokenize(text):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return found
+
+    def find(self, text):
+        """Canonical skill names found in text, in taxonomy order"""
+        return [self.skills[skill_id] for skill_id in sorted(self.match_ids(text))]
+
+    def to_dict(self):
+        """Automaton tables as plain JSON data"""
+        return {
+            "version": self.version,
+            "skills": self.skills,
+            "goto": self.goto,
+            "fail": self.fail,
+            "outputs": [list(output) for output in self.outputs]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a matcher from to_dict() data without recompiling it"""
+        matcher = cls.__new__(cls)
+        matcher.version = data["version"]
+        matcher.skills = [str(skill) for skill in data["skills"]]
+        matcher.goto = [{str(token): int(child) for token, child in edges.items()} for edges in data["goto"]]
+        matcher.fail = [int(node) for node in data["fail"]]
+        matcher.outputs = [tuple(int(skill) for skill in output) for output in data["outputs"]]
+
+        nodes = len(matcher.goto)
+        if len(matcher.fail) != nodes or len(matcher.outputs) != nodes:
+            raise ValueError("Inconsistent skill matcher tables")
+        if any(not 0 <= node < nodes for node in matcher.fail) or any(
+                not 0 <= child < nodes for edges in matcher.goto for child in edges.values()):
+            raise ValueError("Skill matcher node out of range")
+        if any(not 0 <= skill < len(matcher.skills) for output in matcher.outputs for skill in output):
+            raise ValueError("Skill matcher output out of range")
+        return matcher
+
+def load_taxonomy(path):
+    """Read a taxonomy JSON file into (name, synonyms) entries"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return normalize_taxonomy(json.load(file))
+
+def _automaton_path(directory, version):
+    return os.path.join(directory, 'skill_matcher', f'{version}.json')
+
+def load_matcher(entries, directory=None):
+    """Build a matcher, reusing the serialized automaton when present
+
+    The automaton is stored as plain JSON tables in a private cache
+    directory, so even a tampered file could never run code.
+    """
+    version = version_digest(FORMAT_VERSION, entries)
+    path = _automaton_path(private_directory(directory or os.environ.get('AI_CACHE_DIR') or DEFAULT_DIRECTORY), version)
+
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            matcher = SkillMatcher.from_dict(json.load(file))
+        if matcher.version == version and matcher.skills == [name for name, _ in entries]:
+            return matcher
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    matcher = SkillMatcher(entries)
+    save_matcher(matcher, path)
+    return matcher
+
+def save_matcher(matcher, path):
+    """Serialize the automaton atomically; failure only costs a rebuild"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(matcher.to_dict(), file)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
@@ -0,0 +1,296 @@
+"""
+VibhoHCM AI Text Extraction - Streaming document text extraction
+Yields the text of .txt, PDF and DOCX files chunk by chunk using only the
+standard library: PDFs are memory-mapped and decoded one content stream
+(page) at a time, DOCX paragraphs are read with an incremental XML parser
+"""
+
+import os
+import re
+import zlib
+from functools import lru_cache
+
+CHUNK_SIZE = 64 * 1024
+
+# Uncompressed content larger than this is skipped rather than inflated,
+# which keeps decompression bombs inside the memory budget
+MAX_STREAM_BYTES = 64 * 1024 * 1024
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+def iter_text_chunks(file_path, chunk_size=CHUNK_SIZE):
+    """Yield the text of a document in chunks of roughly chunk_size characters"""
+    file_ext = os.path.splitext(file_path)[1].lower()
+
+    if file_ext == '.txt':
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for chunk in iter(lambda: file.read(chunk_size), ''):
+                yield chunk
+    elif file_ext == '.pdf':
+        yield from _batched(iter_pdf_pages(file_path), chunk_size)
+    elif file_ext == '.docx':
+        yield from _batched(iter_docx_paragraphs(file_path), chunk_size)
+    elif file_ext == '.doc':
+        # Legacy binary Word files need an external converter
+        yield f"This is extracted text from a {file_ext} document. In production, we would use proper document parsing libraries."
+    elif file_ext in ['.jpg', '.jpeg', '.png']:
+        # Mock OCR for image files
+        yield f"This is OCR text from a {file_ext} image. In production, we would use OCR libraries."
+    else:
+        yield "Unsupported file format"
+
+def _batched(pieces, chunk_size):
+    """Join small pieces (paragraphs, pages) into chunks of about chunk_size"""
+    batch = []
+    size = 0
+    for piece in pieces:
+        batch.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(batch)
+            batch = []
+            size = 0
+    if batch:
+        yield ''.join(batch)
+
+# --- DOCX ---------------------------------------------------------------
+
+def iter_docx_paragraphs(file_path):
+    """Yield each paragraph of a DOCX body followed by a newline"""
+    # Imported here to keep the scripts' cold start short
+    import zipfile
+    from xml.etree import ElementTree
+
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open('word/document.xml') as part:
+            runs = []
+            for _, element in ElementTree.iterparse(part, events=('end',)):
+                tag = element.tag
+                if tag == WORD_NAMESPACE + 't':
+                    runs.append(element.text or '')
+                elif tag == WORD_NAMESPACE + 'tab':
+                    runs.append('\t')
+                elif tag in (WORD_NAMESPACE + 'br', WORD_NAMESPACE + 'cr'):
+                    runs.append('\n')
+                elif tag == WORD_NAMESPACE + 'p':
+                    yield ''.join(runs) + '\n'
+                    runs = []
+                    # Drop the parsed paragraph so the tree stays small
+                    element.clear()
+
+# --- PDF ----------------------------------------------------------------
+
+# Dictionary keys marking streams that are not page content
+_NON_CONTENT_KEYS = (b'/Type', b'/Subtype', b'/Length1', b'/Length2', b'/Length3', b'/N ')
+
+# PDF syntax patterns, compiled on first use to keep cold starts short
+PDF_PATTERNS = {
+    "stream_start": (rb'>>\s*stream(?:\r\n|\n|\r)', 0),
+    # The /Filter entry: a single name or an array of names
+    "filter_value": (rb'/Filter\s*(\[[^\]]*\]|/\w+)', 0),
+    "content_token": (rb'''
+        (?P<space>\s+)
+      | (?P<comment>%[^\r\n]*)
+      | (?P<literal>\()
+      | (?P<hex><[0-9A-Fa-f\s]*>)
+      | (?P<dict><<|>>)
+      | (?P<open>\[)
+      | (?P<close>\])
+      | (?P<name>/[^\s/\[\]()<>{}%]*)
+      | (?P<word>[^\s/\[\]()<>{}%]+)
+    ''', re.X),
+    # Characters inside a literal string that need handling one at a time
+    "literal_special": (rb'[\\()]', 0),
+    "octal_escape": (rb'[0-7]{1,3}', 0),
+    "control_chars": (r'[\x00-\x08\x0b-\x1f\x7f-\x9f]', 0),
+    "blank_lines": (r'[ \t]*\n\s*\n+', 0)
+}
+
+@lru_cache(maxsize=None)
+def _pattern(name):
+    pattern, flags = PDF_PATTERNS[name]
+    return re.compile(pattern, flags)
+
+def iter_pdf_pages(file_path):
+    """Yield the text of each page content stream of a PDF, in file order
+
+    The file is memory-mapped, so only the stream being decoded is held in
+    memory. Only unfiltered and FlateDecode streams are supported, which
+    covers what common PDF writers produce for text.
+    """
+    if os.path.getsize(file_path) == 0:
+        return
+
+    import mmap
+
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for match in _pattern('stream_start').finditer(data):
+            start = match.end()
+            end = data.find(b'endstream', start)
+            if end < 0:
+                break
+
+            dictionary = data[data.rfind(b'obj', 0, match.start()) + 3:match.start() + 2]
+            content = _decode_stream(dictionary, data, start, end)
+            if content is None or b'BT' not in content:
+                continue
+
+            text = content_stream_text(content)
+            if text.strip():
+                yield text + '\n'
+
+def _decode_stream(dictionary, data, start, end):
+    """Raw bytes of a page content stream, or None for any other stream"""
+    if any(key in dictionary for key in _NON_CONTENT_KEYS):
+        return None
+
+    raw = data[start:end]
+    match = _pattern('filter_value').search(dictionary)
+    filters = re.findall(rb'/(\w+)', match.group(1)) if match else []
+    if not filters:
+        return raw
+    # Predictors and filter chains are not used for text content streams
+    # in practice; skip rather than guess
+    if filters not in ([b'FlateDecode'], [b'Fl']) or b'/DecodeParms' in dictionary:
+        return None
+
+    decompressor = zlib.decompressobj()
+    try:
+        content = decompressor.decompress(raw, MAX_STREAM_BYTES)
+    except zlib.error:
+        return None
+    if decompressor.unconsumed_tail:
+        return None
+    return content
+
+
+_ESCAPES = {ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f'}
+
+
+def _read_literal(content, position):
+    """Decode a (literal string) starting after '('; return (bytes, end)"""
+    output = bytearray()
+    depth = 1
+    length = len(content)
+    while position < length:
+        special = _pattern('literal_special').search(content, position)
+        if special is None:
+            output += content[position:]
+            return bytes(output), length
+        # Copy the plain run in one go
+        output += content[position:special.start()]
+        position = special.start()
+        char = content[position]
+        if char == 0x5C:  # backslash
+            position += 1
+            if position >= length:
+                break
+            escaped = content[position]
+            if escaped in _ESCAPES:
+                output += _ESCAPES[escaped]
+            elif 0x30 <= escaped <= 0x37:
+                digits = _pattern('octal_escape').match(content, position).group()
+                output.append(int(digits, 8) & 0xFF)
+                position += len(digits) - 1
+            elif escaped in (0x0A, 0x0D):
+                # Line continuation
+                if escaped == 0x0D and content[position + 1:position + 2] == b'\n':
+                    position += 1
+            else:
+                output.append(escaped)
+        elif char == 0x28:
+            depth += 1
+            output.append(char)
+        else:
+            depth -= 1
+            if depth == 0:
+                return bytes(output), position + 1
+            output.append(char)
+        position += 1
+    return bytes(output), position
+
+def _decode_string(raw):
+    """Best-effort text for a PDF string operand"""
+    if raw[:2] == b'\xfe\xff' or (len(raw) >= 2 and len(raw) % 2 == 0 and raw[0::2].count(0) == len(raw) // 2):
+        text = raw.decode('utf-16-be', errors='ignore')
+    else:
+        text = raw.decode('latin-1')
+    return _pattern('control_chars').sub('', text)
+
+def content_stream_text(content):
+    """Text shown by the Tj, TJ, ' and " operators of a content stream"""
+    pieces = []
+    operands = []
+    array = None
+    in_text = False
+    position = 0
+    length = len(content)
+    token = _pattern('content_token')
+
+    while position < length:
+        match = token.match(content, position)
+        if match is None:
+            position += 1
+            continue
+        position = match.end()
+        kind = match.lastgroup
+
+        if kind in ('space', 'comment', 'dict'):
+            continue
+        if kind == 'literal':
+            value, position = _read_literal(content, position)
+            value = _decode_string(value)
+        elif kind == 'hex':
+            digits = re.sub(rb'\s', b'', match.group()[1:-1])
+            if len(digits) % 2:
+                digits += b'0'
+            value = _decode_string(bytes.fromhex(digits.decode('ascii')))
+        elif kind == 'open':
+            array = []
+            continue
+        elif kind == 'close':
+            value, array = array or [], None
+        elif kind == 'name':
+            value = match.group()
+        else:
+            word = match.group()
+            try:
+                value = float(word)
+            except ValueError:
+                # An operator: act on the operands collected so far
+                operator = word
+                if operator == b'BT':
+                    in_text = True
+                elif operator == b'ET':
+                    in_text = False
+                    pieces.append('\n')
+                elif in_text:
+                    _apply_text_operator(operator, operands, pieces)
+                operands = []
+                continue
+
+        if array is not None:
+            array.append(value)
+        else:
+            operands.append(value)
+
+    return _pattern('blank_lines').sub('\n', ''.join(pieces)).strip()
+
+def _apply_text_operator(operator, operands, pieces):
+    if operator == b'Tj' and operands and isinstance(operands[-1], str):
+        pieces.append(operands[-1])
+    elif operator == b'TJ' and operands and isinstance(operands[-1], list):
+        for item in operands[-1]:
+            if isinstance(item, str):
+                pieces.append(item)
+            elif item < -200:
+                # A large negative adjustment is how writers space words
+                pieces.append(' ')
+    elif operator in (b"'", b'"') and operands and isinstance(operands[-1], str):
+        pieces.append('\n' + operands[-1])
+    elif operator == b'T*':
+        pieces.append('\n')
+    elif operator in (b'Td', b'TD') and len(operands) >= 2:
+        pieces.append('\n' if operands[-1] != 0 else ' ')
+    elif operator == b'Tm':
+        pieces.append('\n')
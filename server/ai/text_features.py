@@ -0,0 +1,65 @@
+"""
+VibhoHCM AI Text Features - Tokenize-once term counts
+Normalizes and tokenizes a document once into lowercased term counts that
+every keyword-based analyzer reads from, so adding keywords or lexicon
+entries costs hash lookups rather than more scans of the text
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Words, optionally followed by a colon so "subject:" style headers are
+# terms of their own
+TOKEN_PATTERN = r'\w+:?'
+
+@lru_cache(maxsize=None)
+def _token_pattern():
+    """Compile the token pattern on first use"""
+    return re.compile(TOKEN_PATTERN)
+
+class TermCounts:
+    """Lowercased term frequencies of a text, built chunk by chunk"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self._partial = ''
+
+    def update(self, chunk):
+        """Add a chunk; a word cut at the chunk end waits for the next one"""
+        text = self._partial + chunk.lower()
+        end = len(text)
+        while end and (text[end - 1].isalnum() or text[end - 1] == '_'):
+            end -= 1
+        self._partial = text[end:]
+        self._count(text[:end])
+        return self
+
+    def close(self):
+        """Finish counting; call before reading the counts"""
+        self._count(self._partial)
+        self._partial = ''
+        # A header term also counts as the plain word; folded over the
+        # distinct terms rather than every token
+        for term in [term for term in self.counts if term[-1] == ':' and len(term) > 1]:
+            self.counts[term[:-1]] += self.counts[term]
+        return self
+
+    def _count(self, text):
+        self.counts.update(_token_pattern().findall(text))
+
+    def __contains__(self, term):
+        return term in self.counts
+
+    def __getitem__(self, term):
+        return self.counts.get(term, 0)
+
+    def present(self, vocabulary):
+        """Terms of vocabulary (a set) that occur, iterating the smaller side"""
+        if len(vocabulary) <= len(self.counts):
+            return {term for term in vocabulary if term in self.counts}
+        return {term for term in self.counts if term in vocabulary}
+
+def count_terms(text):
+    """Term counts of a whole text"""
+    return TermCounts().update(text).close()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+VibhoHCM AI Worker - Long-lived model host
+Loads every AI module once and serves newline-delimited JSON requests
+over stdin/stdout or a Unix socket
+
+Request:  {"id": 1, "model": "chatbot", "payload": {...}, "profile": false, "traceMemory": false}
+Response: {"id": 1, "success": true, "result": {...}, "timings": {...}}
+Streaming: with "stream": true, models that support it first send partial
+          lines {"id": 1, "event": {...}} before the response line
+Commands: {"id": 2, "command": "metrics"} returns Prometheus text
+"""
+
+import sys
+import json
+import os
+import argparse
+import socketserver
+
+import attendance_analytics
+import candidate_index
+import chatbot
+import document_classifier
+import document_processor
+import insights_generator
+import job_matcher
+import payroll_prediction
+import policy_index
+import resume_parser
+from instrumentation import REGISTRY, track
+
+# Model name -> module exposing handle_request(payload)
+MODELS = {
+    "chatbot": chatbot,
+    "resume_parser": resume_parser,
+    "document_processor": document_processor,
+    "attendance_analytics": attendance_analytics,
+    "insights_generator": insights_generator,
+    "payroll_prediction": payroll_prediction,
+    "candidate_index": candidate_index,
+    "job_matcher": job_matcher,
+    "document_classifier": document_classifier,
+    "policy_index": policy_index
+}
+
+def preload():
+    """Import the lazily loaded heavy dependencies up front
+
+    The scripts defer NumPy to keep spawn-per-request cold starts short;
+    a long-lived worker would rather pay that once before serving.
+    """
+    # Compile the chatbot's model.nlp intent index before the first message
+    chatbot.intent_index()
+    # Map the policy index once so every request shares it
+    chatbot.get_policy_index()
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass
+
+def dispatch(model, payload):
+    """Run a single request against a loaded model"""
+    module = MODELS.get(model)
+    if module is None:
+        raise ValueError(f"Unknown model: {model}")
+
+    return module.handle_request(payload or {})
+
+def dispatch_tracked(model, payload, profile=False, trace_memory=False):
+    """Run a request and return (result, timings) for the envelope
+
+    profile/trace_memory switch on cProfile and tracemalloc capture for
+    this request only.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model: {model}")
+
+    with track(model, profile=profile, trace_memory=trace_memory) as tracker:
+        result = dispatch(model, payload)
+    return result, tracker.timings()
+
+def stream_tracked(model, payload, profile=False, trace_memory=False):
+    """Yield a streaming request's partial events, then (result, timings)
+
+    Models stream through stream_request(payload), a generator whose last
+    event is {"type": "done", "result": ...}; others answer in one piece.
+    """
+    module = MODELS.get(model)
+    if module is None:
+        raise ValueError(f"Unknown model: {model}")
+
+    with track(model, profile=profile, trace_memory=trace_memory) as tracker:
+        if not hasattr(module, 'stream_request'):
+            result = module.handle_request(payload or {})
+        else:
+            result = None
+            for event in module.stream_request(payload or {}):
+                if event.get("type") == "done":
+                    result = event.get("result")
+                else:
+                    yield event
+    yield result, tracker.timings()
+
+def run_command(command):
+    """Answer protocol-level commands that do not target a model"""
+    if command == 'metrics':
+        return REGISTRY.export_prometheus()
+    if command == 'models':
+        return sorted(MODELS)
+    raise ValueError(f"Unknown command: {command}")
+
+def handle_line(line):
+    """Decode one request line and build the correlated response"""
+    response = None
+    for response in iter_responses(line):
+        pass
+    return response
+
+def iter_responses(line):
+    """Decode one request line and yield its partial and final responses"""
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+    except ValueError as e:
+        yield {
+            "id": None,
+            "success": False,
+            "message": f"Invalid request: {e}"
+        }
+        return
+
+    request_id = request.get('id')
+
+    try:
+        if request.get('command'):
+            yield {
+                "id": request_id,
+                "success": True,
+                "result": run_command(request['command'])
+            }
+            return
+
+        if request.get('stream'):
+            for item in stream_tracked(
+                request.get('model'),
+                request.get('payload'),
+                profile=request.get('profile', False),
+                trace_memory=request.get('traceMemory', False)
+            ):
+                if isinstance(item, dict):
+                    yield {"id": request_id, "event": item}
+                else:
+                    result, timings = item
+        else:
+            result, timings = dispatch_tracked(
+                request.get('model'),
+                request.get('payload'),
+                profile=request.get('profile', False),
+                trace_memory=request.get('traceMemory', False)
+            )
+        yield {
+            "id": request_id,
+            "success": True,
+            "result": result,
+            "timings": timings
+        }
+    except Exception as e:
+        yield {
+            "id": request_id,
+            "success": False,
+            "message": str(e)
+        }
+
+def serve_stream(reader, writer):
+    """Serve requests line by line until the reader is exhausted"""
+    for line in reader:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Each line is flushed as soon as it is ready so streamed events
+        # reach the client while the rest of the reply is being built
+        for response in iter_responses(line):
+            writer.write(json.dumps(response) + "\n")
+            writer.flush()
+
+class _SocketWriter:
+    """Text adapter over a socket file so serve_stream can share code"""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        self.wfile.write(text.encode('utf-8'))
+
+    def flush(self):
+        self.wfile.flush()
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    """Serve one Unix socket client with the line protocol"""
+
+    def handle(self):
+        reader = (line.decode('utf-8') for line in self.rfile)
+        writer = _SocketWriter(self.wfile)
+        serve_stream(reader, writer)
+
+def serve_socket(socket_path):
+    """Serve requests on a Unix domain socket"""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socketserver.ThreadingUnixStreamServer(socket_path, _ConnectionHandler)
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+def main():
+    """Main function to run the AI worker"""
+    parser = argparse.ArgumentParser(description="VibhoHCM AI worker")
+    parser.add_argument('--socket', help="Serve on this Unix socket path instead of stdin/stdout")
+    args = parser.parse_args()
+
+    preload()
+
+    try:
+        if args.socket:
+            serve_socket(args.socket)
+        else:
+            serve_stream(sys.stdin, sys.stdout)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,25 @@
 const socketIo = require('socket.io');
 const jwt = require('jsonwebtoken');
 const { User } = require('../models/user.model');
+const Employee = require('../models/employee.model').default;
+const { requestAI } = require('../utils/aiWorker');
+
+// Profile of the connected user's own employee record. employeeId is
+// always set (null without a record) so the chatbot never reads HR data
+// for an id the client supplied, nor one left in its session from before
+const employeeContext = async (user) => {
+  const employee = await Employee.findOne({ userId: user.id, tenantId: user.tenantId });
+  if (!employee) {
+    return { employeeId: null };
+  }
+  return {
+    employeeId: employee.employeeId,
+    name: `${employee.personalInfo.firstName} ${employee.personalInfo.lastName}`,
+    department: employee.companyInfo.department,
+    designation: employee.companyInfo.designation,
+    joiningDate: employee.companyInfo.dateOfJoining
+  };
+};
 
 const configureSocket = (server) => {
   const io = socketIo(server, {
@@ -60,6 +79,34 @@ const configureSocket = (server) => {
     // Join role room
     socket.join(`role:${socket.user.role}`);
     
+    // Chatbot messages are answered incrementally: the intent envelope
+    // arrives as 'chatbot:envelope', the answer as 'chatbot:chunk' events,
+    // then 'chatbot:done' with the complete reply
+    socket.on('chatbot:message', async ({ message, context } = {}) => {
+      if (!message) {
+        socket.emit('chatbot:error', { message: 'Please provide a message' });
+        return;
+      }
+
+      try {
+        // Identity fields come from the authenticated user, never the client
+        const clientContext = { ...context };
+        delete clientContext.employeeId;
+        const result = await requestAI('chatbot', {
+          message,
+          // The worker keeps the conversation, so only new context is sent
+          context: { ...clientContext, ...(await employeeContext(socket.user)), userRole: socket.user.role },
+          sessionId: socket.user.id.toString()
+        }, {
+          onEvent: (event) => socket.emit(`chatbot:${event.type}`, event)
+        });
+        socket.emit('chatbot:done', result);
+      } catch (error) {
+        console.error(`Chatbot error for user ${socket.user.id}:`, error);
+        socket.emit('chatbot:error', { message: 'Error processing message' });
+      }
+    });
+
     // Disconnect handler
     socket.on('disconnect', () => {
       console.log(`User disconnected: ${socket.user.id}`);
@@ -73,11 +73,16 @@ exports.processChatbotMessage = async (req, res) => {
     }
     
     // Process message using Python script (open source NLP model)
+    // Context is piped over stdin ('-') so large payloads avoid ARG_MAX
     const pythonProcess = spawn('python3', [
       path.join(__dirname, '../ai/chatbot.py'),
       message,
-      JSON.stringify({ ...context, ...employeeContext, userRole: req.user.role })
+      '-'
     ]);
+    // A client-supplied employeeId would read someone else's HR data
+    const clientContext = { ...context };
+    delete clientContext.employeeId;
+    pythonProcess.stdin.end(JSON.stringify({ ...clientContext, ...employeeContext, userRole: req.user.role }));
     
     let result = '';
     pythonProcess.stdout.on('data', (data) => {
@@ -212,11 +217,13 @@ exports.generateInsights = async (req, res) => {
     }
     
     // Process insights using Python script (open source ML model)
+    // Data is piped over stdin ('-') so large payloads avoid ARG_MAX
     const pythonProcess = spawn('python3', [
       path.join(__dirname, '../ai/insights_generator.py'),
       type,
-      JSON.stringify(data)
+      '-'
     ]);
+    pythonProcess.stdin.end(JSON.stringify(data));
     
     let result = '';
     pythonProcess.stdout.on('data', (data) => {
@@ -299,10 +306,12 @@ exports.analyzeAttendancePatterns = async (req, res) => {
     }
     
     // Process attendance data using Python script (open source ML model)
+    // Records are streamed over stdin ('-') instead of argv
     const pythonProcess = spawn('python3', [
       path.join(__dirname, '../ai/attendance_analytics.py'),
-      JSON.stringify(attendanceRecords)
+      '-'
     ]);
+    pythonProcess.stdin.end(JSON.stringify(attendanceRecords));
     
     let result = '';
     pythonProcess.stdout.on('data', (data) => {
@@ -0,0 +1,104 @@
+const { spawn } = require('child_process');
+const path = require('path');
+const readline = require('readline');
+
+// Long-lived Python AI worker (server/ai/worker.py) speaking newline-delimited
+// JSON over stdin/stdout. Requests are correlated by id, so many can be in
+// flight at once; streamed requests receive partial events before the result.
+
+let worker = null;
+let nextId = 1;
+const pending = new Map();
+
+const failPending = (error) => {
+  for (const { reject } of pending.values()) {
+    reject(error);
+  }
+  pending.clear();
+};
+
+const startWorker = () => {
+  const child = spawn(process.env.AI_PYTHON || 'python3', [
+    path.join(__dirname, '../ai/worker.py')
+  ], {
+    stdio: ['pipe', 'pipe', 'inherit']
+  });
+
+  const lines = readline.createInterface({ input: child.stdout });
+  lines.on('line', (line) => {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch (error) {
+      console.error('AI worker sent an invalid line:', line);
+      return;
+    }
+
+    const request = pending.get(message.id);
+    if (!request) {
+      return;
+    }
+
+    // Partial event of a streamed request
+    if (message.event) {
+      if (request.onEvent) {
+        request.onEvent(message.event);
+      }
+      return;
+    }
+
+    pending.delete(message.id);
+    if (message.success) {
+      request.resolve(message.result);
+    } else {
+      request.reject(new Error(message.message || 'AI worker request failed'));
+    }
+  });
+
+  child.on('error', (error) => {
+    console.error('AI worker error:', error);
+  });
+
+  child.on('exit', (code, signal) => {
+    if (worker === child) {
+      worker = null;
+    }
+    failPending(new Error(`AI worker exited (${signal || code})`));
+  });
+
+  return child;
+};
+
+/**
+ * Send a request to the AI worker, starting it on first use.
+ * With options.onEvent the request is streamed: the callback receives each
+ * partial event (e.g. the chatbot's envelope and answer chunks) as it arrives.
+ * Resolves with the final result.
+ */
+const requestAI = (model, payload, options = {}) => {
+  if (!worker) {
+    worker = startWorker();
+  }
+
+  const id = nextId++;
+  const { onEvent } = options;
+
+  return new Promise((resolve, reject) => {
+    pending.set(id, { resolve, reject, onEvent });
+    worker.stdin.write(JSON.stringify({
+      id,
+      model,
+      payload,
+      stream: Boolean(onEvent)
+    }) + '\n');
+  });
+};
+
+const stopAIWorker = () => {
+  if (worker) {
+    worker.stdin.end();
+    worker = null;
+  }
+};
+
+module.exports = { requestAI, stopAIWorker };